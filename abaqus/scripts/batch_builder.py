@@ -0,0 +1,217 @@
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+
+from inp_writer import ShellExtrudeModel, SECTIONS
+
+"""
+壳体 I 字形截面模型的参数化批量作业。
+设计矩阵（厚度、网格尺寸、荷载、拉伸长度）的每一行生成一个作业目录和 .inp（见 inp_writer.py），
+再按模型规模估计每个作业的 cpus / memory，把作业装箱到可用的核数和内存上，写出调度清单 manifest.json。
+run_manifest 按清单在本地并发执行，solver 可以换成 fake_solver.py 做离线测试。
+
+    python batch_builder.py designs.csv --out runs --cores 8 --memory 32000
+    python batch_builder.py --grid --out runs --run --stub
+"""
+
+# 设计矩阵的列及默认值（与 testPython.py 相同）
+DEFAULTS = {
+    "t_top": 18.0,
+    "t_web": 19.0,
+    "t_bottom": 20.0,
+    "mesh_size": 30.0,
+    "load": -1000.0,
+    "depth": 6000.0,
+}
+
+# abaqus 命令模板；{job} {input} {cpus} {memory} 按作业替换
+ABAQUS_COMMAND = ["abaqus", "job={job}", "input={input}", "cpus={cpus}", "memory={memory} mb", "interactive"]
+STUB_COMMAND = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_solver.py")] + ABAQUS_COMMAND[1:]
+
+# 规模估计：每核负责的自由度数、每个自由度的内存（MB）、求解器的基础内存（MB）
+DOF_PER_CPU = 100000
+MB_PER_DOF = 0.01
+BASE_MEMORY = 512
+
+
+def full_factorial(**levels):
+    """全因子设计：full_factorial(mesh_size=[30, 15], load=[-1000, -2000]) -> 4 行"""
+    keys = list(levels)
+    return [dict(zip(keys, values)) for values in itertools.product(*(levels[k] for k in keys))]
+
+
+def read_designs(path):
+    """从 CSV 读取设计矩阵，缺少的列用 DEFAULTS 补齐"""
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        return [{k: float(v) for k, v in row.items() if v not in (None, "")} for row in csv.DictReader(f)]
+
+
+def system_memory_mb():
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // 2**20
+    except (ValueError, OSError, AttributeError):
+        return 8192
+
+
+def build_model(design):
+    d = dict(DEFAULTS, **design)
+    thickness = {"Section-1": d["t_top"], "Section-2": d["t_web"], "Section-3": d["t_bottom"]}
+    sections = {name: (thickness[name], plates) for name, (_, plates) in SECTIONS.items()}
+    return ShellExtrudeModel(sections=sections, depth=d["depth"], mesh_size=d["mesh_size"], load=d["load"])
+
+
+def resources(n_nodes, cores, memory):
+    """
+    按自由度数估计 (cpus, memory MB, 相对耗时)。
+    小模型多核没有收益，取 1 核；大模型按 DOF_PER_CPU 取 2 的幂次，不超过 cores。
+    """
+    dof = 6 * n_nodes
+    cpus = 1
+    while cpus * 2 <= min(cores, dof / DOF_PER_CPU):
+        cpus *= 2
+    mem = min(memory, math.ceil(BASE_MEMORY + dof * MB_PER_DOF))
+    # 直接法求解器的耗时约随 dof^1.5 增长，多核并行效率按 0.8 次方计
+    cost = (dof / 1e5) ** 1.5 / cpus ** 0.8
+    return cpus, mem, cost
+
+
+def schedule(jobs, cores, memory):
+    """
+    最长作业优先的列表调度：按估计耗时从大到小，每当核数和内存都够时启动下一个作业。
+    给每个作业写入预计的 start / end（与 cost 同单位），返回预计总时长。
+    """
+    running = []    # (end, cpus, mem)
+    t = 0.0
+    free_cpu, free_mem = cores, memory
+    for job in sorted(jobs, key=lambda j: -j["cost"]):
+        while job["cpus"] > free_cpu or job["memory"] > free_mem:
+            running.sort()
+            end, c, m = running.pop(0)
+            t = max(t, end)
+            free_cpu += c
+            free_mem += m
+        job["start"] = t
+        job["end"] = t + job["cost"]
+        running.append((job["end"], job["cpus"], job["memory"]))
+        free_cpu -= job["cpus"]
+        free_mem -= job["memory"]
+    return max((j["end"] for j in jobs), default=0.0)
+
+
+def build(designs, out, cores=None, memory=None, command=None):
+    """
+    为每个设计写 .inp，估计资源并调度，写出 out/manifest.json。
+    Args:
+        designs (list): 设计矩阵，每行是 DEFAULTS 中各列的字典（可只给部分列）
+        out (str): 输出目录，每个作业一个子目录
+        cores, memory: 可用核数与内存（MB），默认取本机
+        command (list): 求解命令模板，默认 ABAQUS_COMMAND
+    Returns:
+        dict: 清单内容
+    """
+    cores = cores or os.cpu_count() or 1
+    memory = memory or int(system_memory_mb() * 0.8)
+    command = command or ABAQUS_COMMAND
+    os.makedirs(out, exist_ok=True)
+    jobs = []
+    width = len(str(len(designs)))
+    for i, design in enumerate(designs, 1):
+        name = f"Job-{i:0{width}d}"
+        folder = os.path.join(out, name)
+        model = build_model(design)
+        n_nodes, n_elements = model.write(os.path.join(folder, f"{name}.inp"))
+        cpus, mem, cost = resources(n_nodes, cores, memory)
+        jobs.append({
+            "name": name,
+            "dir": name,
+            "design": dict(DEFAULTS, **design),
+            "nodes": n_nodes,
+            "elements": n_elements,
+            "cpus": cpus,
+            "memory": mem,
+            "cost": cost,
+            "command": [a.format(job=name, input=f"{name}.inp", cpus=cpus, memory=mem) for a in command],
+        })
+    makespan = schedule(jobs, cores, memory)
+    manifest = {"cores": cores, "memory": memory, "makespan": makespan,
+                "jobs": sorted(jobs, key=lambda j: (j["start"], j["name"]))}
+    with open(os.path.join(out, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def run_manifest(out, poll=0.05):
+    """
+    按清单顺序在本地执行作业，同时运行的作业 cpus、memory 之和不超过清单给出的上限。
+    每个作业在自己的目录中运行，输出写入 <作业名>.log；结果写入 out/status.json 并返回。
+    求解命令无法启动（如 abaqus 不在 PATH 中）的作业记为失败（returncode 为 None，error 为原因），其余作业照常执行。
+    """
+    with open(os.path.join(out, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    pending = list(manifest["jobs"])
+    running = {}
+    status = {}
+    free_cpu, free_mem = manifest["cores"], manifest["memory"]
+    while pending or running:
+        while pending and pending[0]["cpus"] <= free_cpu and pending[0]["memory"] <= free_mem:
+            job = pending.pop(0)
+            folder = os.path.join(out, job["dir"])
+            log = open(os.path.join(folder, f"{job['name']}.log"), "w", encoding="utf-8")
+            try:
+                proc = subprocess.Popen(job["command"], cwd=folder, stdout=log, stderr=subprocess.STDOUT)
+            except OSError as e:
+                log.close()
+                status[job["name"]] = {"returncode": None, "elapsed": 0.0, "error": str(e)}
+                continue
+            running[job["name"]] = (job, proc, log, time.perf_counter())
+            free_cpu -= job["cpus"]
+            free_mem -= job["memory"]
+        for name, (job, proc, log, t0) in list(running.items()):
+            if proc.poll() is None:
+                continue
+            log.close()
+            status[name] = {"returncode": proc.returncode, "elapsed": time.perf_counter() - t0}
+            free_cpu += job["cpus"]
+            free_mem += job["memory"]
+            del running[name]
+        time.sleep(poll)
+    with open(os.path.join(out, "status.json"), "w", encoding="utf-8") as f:
+        json.dump(status, f, indent=2)
+    return status
+
+
+# ------------------ 主程序 ------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="参数化批量生成 Abaqus 作业")
+    parser.add_argument("designs", nargs="?", help="设计矩阵 CSV（列见 DEFAULTS）")
+    parser.add_argument("--grid", action="store_true", help="不给 CSV 时使用内置的示例全因子设计")
+    parser.add_argument("--out", default="runs")
+    parser.add_argument("--cores", type=int)
+    parser.add_argument("--memory", type=int, help="可用内存 MB")
+    parser.add_argument("--stub", action="store_true", help="用 fake_solver.py 代替 abaqus")
+    parser.add_argument("--run", action="store_true", help="生成后立即在本地执行")
+    args = parser.parse_args()
+
+    if args.designs:
+        designs = read_designs(args.designs)
+    elif args.grid:
+        designs = full_factorial(t_web=[17.0, 19.0, 21.0], mesh_size=[60.0, 30.0, 15.0], load=[-1000.0, -2000.0])
+    else:
+        parser.error("需要设计矩阵 CSV 或 --grid")
+
+    manifest = build(designs, args.out, args.cores, args.memory, STUB_COMMAND if args.stub else None)
+    print(f"{len(manifest['jobs'])} 个作业，{manifest['cores']} 核 / {manifest['memory']} MB，"
+          f"预计总时长 {manifest['makespan']:.2f}（相对单位）")
+    print(f"  {'job':<10}{'elements':>10}{'cpus':>6}{'memory':>8}{'start':>9}{'end':>9}")
+    for j in manifest["jobs"]:
+        print(f"  {j['name']:<10}{j['elements']:>10}{j['cpus']:>6}{j['memory']:>8}{j['start']:>9.2f}{j['end']:>9.2f}")
+    if args.run:
+        status = run_manifest(args.out)
+        failed = [name for name, s in status.items() if s["returncode"] != 0]
+        print(f"\n完成 {len(status) - len(failed)} / {len(status)}" + (f"，失败：{', '.join(failed)}" if failed else ""))
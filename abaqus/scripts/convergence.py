@@ -0,0 +1,140 @@
+import argparse
+import json
+import math
+import os
+import subprocess
+
+from batch_builder import ABAQUS_COMMAND, STUB_COMMAND, build_model, resources, system_memory_mb
+from dat_reader import DatReader
+
+"""
+网格收敛性分析：布种尺寸按几何级数加密（size, size·r, size·r², ...），每一级作为一个作业求解，
+读回目标量（默认是 Load-1 节点的 U2），相邻两级的相对变化小于 tol 时停止。
+已经算过的级别记录在 <out>/convergence.json 中，再次运行（例如调小 tol、增加级数）时直接复用。
+建模、求解、读结果三步都可以替换，离线测试时用 fake_solver.py 和模拟的 reader。
+
+    python convergence.py --out conv --start 300 --ratio 0.5 --tol 0.01
+"""
+
+
+def read_node_output(path, node, component="U2"):
+    """
+    从 .dat 的 NODE OUTPUT 表（*Node Print）中读取某节点某分量的值，取文件中最后一次出现的值。
+    找不到时返回 None。表格的定位和解析见 dat_reader.DatReader。
+    """
+    return DatReader(path).last_value(node, component)
+
+
+class ConvergenceStudy:
+    def __init__(self, out, design=None, command=None, reader=None, component="U2"):
+        """
+        Args:
+            out (str): 工作目录，每级一个子目录，结果记录在 convergence.json
+            design (dict): 除网格尺寸外的设计参数（见 batch_builder.DEFAULTS）
+            command (list): 求解命令模板，默认 ABAQUS_COMMAND
+            reader: reader(folder, job, model) -> 目标量；缺省读 .dat 中 Load-1 节点的 component
+        """
+        self.out = out
+        self.design = dict(design or {})
+        self.command = command or ABAQUS_COMMAND
+        self.reader = reader or self._read_dat
+        self.component = component
+        self.record_path = os.path.join(out, "convergence.json")
+        self.records = {}
+        if os.path.exists(self.record_path):
+            with open(self.record_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            # 设计参数改变后旧结果作废
+            if saved.get("design") == self.design:
+                self.records = saved["levels"]
+
+    def _read_dat(self, folder, job, model):
+        node = model.node_id(model.n_z // 2, model._point(model.load_point))
+        return read_node_output(os.path.join(folder, f"{job}.dat"), node, self.component)
+
+    def _save(self):
+        os.makedirs(self.out, exist_ok=True)
+        tmp = f"{self.record_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"design": self.design, "levels": self.records}, f, indent=2)
+        os.replace(tmp, self.record_path)
+
+    def solve(self, size):
+        """求解一级网格并返回目标量；已有记录时直接返回"""
+        key = f"{size:.6g}"
+        if key in self.records:
+            return self.records[key]["value"]
+        job = f"mesh-{key}".replace(".", "p")
+        folder = os.path.join(self.out, job)
+        model = build_model(dict(self.design, mesh_size=size))
+        n_nodes, _ = model.write(os.path.join(folder, f"{job}.inp"))
+        # 各级依次求解，可以用满本机的核数和内存
+        cpus, memory, _ = resources(n_nodes, os.cpu_count() or 1, int(system_memory_mb() * 0.8))
+        cmd = [a.format(job=job, input=f"{job}.inp", cpus=cpus, memory=memory) for a in self.command]
+        with open(os.path.join(folder, f"{job}.log"), "w", encoding="utf-8") as log:
+            code = subprocess.run(cmd, cwd=folder, stdout=log, stderr=subprocess.STDOUT).returncode
+        if code != 0:
+            raise RuntimeError(f"作业 {job} 失败（返回码 {code}），见 {folder}")
+        value = self.reader(folder, job, model)
+        if value is None:
+            raise RuntimeError(f"作业 {job} 的结果中没有找到目标量")
+        self.records[key] = {"size": size, "value": value, "elements": model.n_elements}
+        self._save()
+        return value
+
+    def run(self, start=300.0, ratio=0.5, tol=0.01, min_size=1.0, max_levels=8):
+        """
+        从 start 开始按 ratio 加密，直到相邻两级相对变化 < tol、尺寸小于 min_size 或达到 max_levels。
+        Returns:
+            dict: levels [(size, value, 相对变化)]、converged、solved（本次实际求解的级数），
+                  以及至少三级时的 Richardson 外推值 extrapolated 和表观收敛阶 order
+        """
+        levels, solved = [], 0
+        size = start
+        for _ in range(max_levels):
+            if size < min_size:
+                break
+            cached = f"{size:.6g}" in self.records
+            value = self.solve(size)
+            solved += not cached
+            change = abs(value - levels[-1][1]) / max(abs(value), 1e-300) if levels else None
+            levels.append((size, value, change))
+            if change is not None and change < tol:
+                break
+            size *= ratio
+        result = {"levels": levels, "converged": bool(levels) and levels[-1][2] is not None and levels[-1][2] < tol,
+                  "solved": solved, "extrapolated": None, "order": None}
+        if len(levels) >= 3:
+            (_, q1, _), (_, q2, _), (_, q3, _) = levels[-3:]
+            if (q1 - q2) * (q2 - q3) > 0:
+                p = math.log((q1 - q2) / (q2 - q3)) / math.log(1 / ratio)
+                result["order"] = p
+                result["extrapolated"] = q3 + (q3 - q2) / ((1 / ratio) ** p - 1)
+        return result
+
+
+# ------------------ 主程序 ------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="网格收敛性分析")
+    parser.add_argument("--out", default="convergence")
+    parser.add_argument("--start", type=float, default=300.0)
+    parser.add_argument("--ratio", type=float, default=0.5)
+    parser.add_argument("--tol", type=float, default=0.01)
+    parser.add_argument("--min-size", type=float, default=5.0)
+    parser.add_argument("--abaqus", action="store_true", help="调用真实的 abaqus；默认用 fake_solver 和模拟结果")
+    args = parser.parse_args()
+
+    if args.abaqus:
+        study = ConvergenceStudy(args.out)
+    else:
+        # 模拟的结果：挠度随网格尺寸按 h² 收敛到 -5.0
+        def mock_reader(folder, job, model):
+            return -5.0 * (1 - 0.8 * (model.mesh_size / 300.0) ** 2)
+        study = ConvergenceStudy(args.out, command=STUB_COMMAND, reader=mock_reader)
+
+    result = study.run(args.start, args.ratio, args.tol, args.min_size)
+    print(f"  {'size':>8}{'value':>14}{'change':>10}")
+    for size, value, change in result["levels"]:
+        print(f"  {size:>8.3g}{value:>14.6g}{'' if change is None else f'{change:.2%}':>10}")
+    print(f"{'已收敛' if result['converged'] else '未收敛'}，本次求解 {result['solved']} 级"
+          + (f"，外推值 {result['extrapolated']:.6g}（阶数 {result['order']:.2f}）" if result["extrapolated"] is not None else ""))
@@ -0,0 +1,313 @@
+import argparse
+import json
+import mmap
+import os
+import re
+import time
+
+import numpy as np
+
+"""
+流式读取 Abaqus .dat 中 *Node Print / *El Print 打印的表格（U、RF、S 等），转换为带字段名的 NumPy 结构化数组。
+第一次打开时用 mmap + 正则扫描一遍文件，只记录各表的位置（分析步、增量步、集合、列名、数据的起止字节），
+索引保存在 <文件>.idx.json 中（文件大小或修改时间变化时重建）；之后读某一步、某增量步或某个集合的表时
+直接 seek 到该表按块解析，内存占用只与块大小有关，与文件大小无关。
+
+    reader = DatReader("Job-1.dat")
+    for t in reader.find(kind="node", column="U2", step=1):
+        u = reader.read(t)              # 结构化数组，字段 node、U1、U2、...
+    for chunk in reader.iter_chunks(reader.find(kind="element")[0], rows=100000):
+        ...
+"""
+
+INDEX_VERSION = 1
+
+# 以大写字母开头的行（数据行都以数字开头），只有它们需要进一步分类；
+# 先用这个简单的模式在 mmap 上快速定位，比直接用带分组的 MARKERS 扫描整个文件快数倍
+TEXT_LINE = re.compile(rb"\n *([A-Z][^\r\n]*)")
+
+# 索引时关心的行：分析步、增量步、表格说明、表头、表尾（统计行）
+MARKERS = re.compile(
+    r"(?P<step>S T E P +(?P<step_no>\d+))"
+    r"|(?P<inc>INCREMENT +(?P<inc_no>\d+) +SUMMARY)"
+    r"|(?P<desc>THE FOLLOWING TABLE IS PRINTED.*)"
+    r"|(?P<header>(?P<key>NODE|ELEMENT)\b.*?FOOT-.*)"
+    r"|(?P<end>(?:MAXIMUM|MINIMUM|TOTAL|ALL VALUES|N O D E|E L E M E N T)\b)"
+)
+
+
+def _table_name(desc):
+    """从表格说明行中取出集合名和单元类型"""
+    nset = re.search(r"(?:NODE|ELEMENT) SET (\S+)", desc)
+    etype = re.search(r"ELEMENT TYPE (\S+)", desc)
+    return (nset.group(1) if nset else None), (etype.group(1) if etype else None)
+
+
+def build_index(path):
+    """扫描文件，返回各表的描述列表（不解析数据行）"""
+    tables = []
+    step = increment = 0
+    desc = ""
+    current = None
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return tables
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in TEXT_LINE.finditer(mm):
+                m = MARKERS.match(line.group(1).decode("ascii", "replace"))
+                if m is None:
+                    continue
+                if current is not None and not m.group("header"):
+                    # 任何新标记都结束当前表；数据行本身不会匹配
+                    current["end"] = line.start()
+                    tables.append(current)
+                    current = None
+                if m.group("step"):
+                    step, increment = int(m.group("step_no")), 0
+                elif m.group("inc"):
+                    increment = int(m.group("inc_no"))
+                elif m.group("desc"):
+                    desc = m.group("desc")
+                elif m.group("header"):
+                    if current is not None:
+                        current["end"] = line.start()
+                        tables.append(current)
+                    tokens = m.group("header").split()
+                    cut = tokens.index("FOOT-")
+                    nset, etype = _table_name(desc)
+                    current = {
+                        "kind": m.group("key").lower(),
+                        "step": step,
+                        "increment": increment,
+                        "set": nset,
+                        "element_type": etype,
+                        "keys": [k.lower() for k in tokens[:cut]],
+                        "columns": tokens[cut + 1:],
+                        "start": line.end(),
+                        "end": None,
+                    }
+                    desc = ""
+            if current is not None:
+                current["end"] = len(mm)
+                tables.append(current)
+    # 表头后面第二行（如 "NOTE"、"PT NOTE"）在读取时和空行一起跳过
+    return tables
+
+
+class DatReader:
+    def __init__(self, path, use_index_file=True):
+        """
+        Args:
+            path (str): .dat 文件
+            use_index_file (bool): 是否读写 <path>.idx.json
+        """
+        self.path = path
+        self.index_path = f"{path}.idx.json"
+        st = os.stat(path)
+        stamp = {"version": INDEX_VERSION, "size": st.st_size, "mtime": st.st_mtime}
+        self.tables = None
+        if use_index_file and os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("stamp") == stamp:
+                self.tables = saved["tables"]
+        if self.tables is None:
+            self.tables = build_index(path)
+            if use_index_file:
+                tmp = f"{self.index_path}.{os.getpid()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({"stamp": stamp, "tables": self.tables}, f)
+                os.replace(tmp, self.index_path)
+
+    def find(self, kind=None, step=None, increment=None, set=None, column=None):
+        """按条件筛选表；set 不区分大小写，column 为表中包含的列名（如 "U2"、"S11"）"""
+        out = []
+        for t in self.tables:
+            if kind is not None and t["kind"] != kind:
+                continue
+            if step is not None and t["step"] != step:
+                continue
+            if increment is not None and t["increment"] != increment:
+                continue
+            if set is not None and (t["set"] or "").upper() != set.upper():
+                continue
+            if column is not None and column not in t["columns"]:
+                continue
+            out.append(t)
+        return out
+
+    @staticmethod
+    def dtype(table):
+        return np.dtype([(k, np.int64) for k in table["keys"]] + [(c, np.float64) for c in table["columns"]])
+
+    def _rows(self, table, rows):
+        """把一组数据行（bytes）转换为结构化数组"""
+        dtype = self.dtype(table)
+        width = len(dtype.names)
+        try:
+            data = np.fromstring(b" ".join(rows).decode("ascii"), dtype=np.float64, sep=" ")
+        except ValueError:
+            # 遇到非数字的记号时 NumPy 2 直接报错（旧版本只给警告并截断）
+            data = None
+        if data is None or data.size != len(rows) * width:
+            # 有脚注标记或缺值的行：逐行处理，只取能转换的数字
+            data = np.full((len(rows), width), np.nan)
+            for i, line in enumerate(rows):
+                values = []
+                for token in line.split():
+                    try:
+                        values.append(float(token))
+                    except ValueError:
+                        pass
+                data[i, :min(width, len(values))] = values[:width]
+        data = data.reshape(len(rows), width)
+        out = np.empty(len(rows), dtype=dtype)
+        for j, name in enumerate(dtype.names):
+            out[name] = data[:, j]
+        return out
+
+    def iter_chunks(self, table, rows=65536, block=1 << 22):
+        """按块读取一张表，每次产出不超过 rows 行的结构化数组"""
+        pending = []
+        with open(self.path, "rb") as f:
+            f.seek(table["start"])
+            remaining = table["end"] - table["start"]
+            tail = b""
+            while remaining > 0:
+                data = f.read(min(block, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                lines = (tail + data).split(b"\n")
+                tail = lines.pop() if remaining > 0 else b""
+                for line in lines:
+                    # 数据行以节点号 / 单元号开头；空行、"NOTE" 续行都跳过
+                    s = line.lstrip()
+                    if s[:1].isdigit():
+                        pending.append(s)
+                if len(pending) >= rows:
+                    for i in range(0, len(pending) - rows + 1, rows):
+                        yield self._rows(table, pending[i:i + rows])
+                    pending = pending[len(pending) // rows * rows:]
+        if pending:
+            yield self._rows(table, pending)
+
+    def read(self, table):
+        """读取整张表"""
+        chunks = list(self.iter_chunks(table))
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=self.dtype(table))
+
+    def last_value(self, key, column, kind="node"):
+        """某节点（单元）某列在文件中最后一次打印的值，找不到时返回 None"""
+        for table in reversed(self.find(kind=kind, column=column)):
+            key_name = table["keys"][0]
+            for chunk in self.iter_chunks(table):
+                hit = chunk[column][chunk[key_name] == key]
+                if hit.size:
+                    return float(hit[-1])
+        return None
+
+
+def write_synthetic(path, n_nodes=1000, n_elements=1000, steps=1, increments=3, node_set="ASSEMBLY_LOAD-1",
+                    element_set="ASSEMBLY_PART-1-1", seed=0):
+    """
+    生成格式与 Abaqus/Standard .dat 一致的合成结果文件：每个增量步一张节点表（U1..UR3）、
+    一张节点表（RF1..RF3，带 TOTAL 行）和一张壳单元表（S11、S22、S12，每单元 4 个积分点 × 2 个截面点）。
+    返回 {(step, inc): {"U": ..., "RF": ..., "S": ...}} 中写入的全部数值，用于核对。
+    """
+    rng = np.random.default_rng(seed)
+    written = {}
+    node_ids = np.arange(1, n_nodes + 1)
+    elem_ids = np.repeat(np.arange(1, n_elements + 1), 8)
+    pts = np.tile(np.repeat(np.arange(1, 5), 2), n_elements)
+    secs = np.tile(np.array([1, 5]), 4 * n_elements)
+    with open(path, "w", encoding="ascii", newline="\n") as f:
+        f.write("\n   Abaqus 2023                                  Date 01-Jan-2026   Time 00:00:00\n"
+                "   For use by SYNTHETIC under license\n\n")
+        for step in range(1, steps + 1):
+            f.write(f"\n                              S T E P       {step}     S T A T I C   A N A L Y S I S\n\n")
+            for inc in range(1, increments + 1):
+                frac = inc / increments
+                f.write(f"\n INCREMENT     {inc} SUMMARY\n\n\n TIME INCREMENT COMPLETED  {1 / increments:.3E},"
+                        f"  FRACTION OF STEP COMPLETED  {frac:.3E}\n")
+                u = rng.normal(0, frac, (n_nodes, 6))
+                rf = rng.normal(0, 100 * frac, (n_nodes, 3))
+                s = rng.normal(0, 50 * frac, (elem_ids.size, 3))
+                written[(step, inc)] = {"U": u, "RF": rf, "S": s}
+                f.write("\n                                       N O D E   O U T P U T\n\n\n")
+                f.write(f" THE FOLLOWING TABLE IS PRINTED FOR NODES BELONGING TO NODE SET {node_set}\n\n")
+                f.write("       NODE FOOT-  U1             U2             U3             UR1            UR2            UR3\n"
+                        "            NOTE\n\n")
+                rows = np.column_stack([node_ids, u])
+                np.savetxt(f, rows, fmt=["%10d"] + ["  % .6E"] * 6)
+                f.write(f"\n MAXIMUM        {' '.join(f'{v: .6E}' for v in u.max(axis=0))}\n"
+                        f" AT NODE        {' '.join(f'{i + 1:13d}' for i in u.argmax(axis=0))}\n\n"
+                        f" MINIMUM        {' '.join(f'{v: .6E}' for v in u.min(axis=0))}\n"
+                        f" AT NODE        {' '.join(f'{i + 1:13d}' for i in u.argmin(axis=0))}\n\n")
+                f.write(f" THE FOLLOWING TABLE IS PRINTED FOR NODES BELONGING TO NODE SET {node_set}\n\n")
+                f.write("       NODE FOOT-  RF1            RF2            RF3\n            NOTE\n\n")
+                np.savetxt(f, np.column_stack([node_ids, rf]), fmt=["%10d"] + ["  % .6E"] * 3)
+                f.write(f"\n TOTAL          {' '.join(f'{v: .6E}' for v in rf.sum(axis=0))}\n\n")
+                f.write("\n                                   E L E M E N T   O U T P U T\n\n\n")
+                f.write(" THE FOLLOWING TABLE IS PRINTED AT THE INTEGRATION POINTS FOR ELEMENT TYPE S4R"
+                        f" AND ELEMENT SET {element_set}\n\n")
+                f.write("    ELEMENT  PT SEC FOOT-       S11         S22         S12\n"
+                        "                PT  NOTE\n\n")
+                np.savetxt(f, np.column_stack([elem_ids, pts, secs, s]),
+                           fmt=["%11d", "%4d", "%4d"] + ["  % .6E"] * 3)
+                f.write(f"\n MAXIMUM                    {' '.join(f'{v: .6E}' for v in s.max(axis=0))}\n"
+                        f" MINIMUM                    {' '.join(f'{v: .6E}' for v in s.min(axis=0))}\n\n")
+        f.write("\n          THE ANALYSIS HAS BEEN COMPLETED\n")
+    return written
+
+
+# ------------------ 主程序 ------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="读取 .dat 中打印的节点 / 单元表")
+    parser.add_argument("dat", nargs="?", help=".dat 文件；不给时生成合成文件做演示")
+    parser.add_argument("--nodes", type=int, default=200000)
+    parser.add_argument("--elements", type=int, default=50000)
+    parser.add_argument("--increments", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.dat:
+        reader = DatReader(args.dat)
+        for t in reader.tables:
+            print(f"  step {t['step']} inc {t['increment']:>3} {t['kind']:<8}{t['set'] or '':<24}"
+                  f"{','.join(t['columns']):<30}{t['end'] - t['start']:>12} B")
+    else:
+        import tempfile
+        path = os.path.join(tempfile.mkdtemp(), "synthetic.dat")
+        t0 = time.perf_counter()
+        written = write_synthetic(path, args.nodes, args.elements, steps=2, increments=args.increments)
+        print(f"合成文件 {os.path.getsize(path) / 2**20:.1f} MiB，生成 {time.perf_counter() - t0:.2f} s")
+
+        t0 = time.perf_counter()
+        reader = DatReader(path)
+        print(f"建立索引：{len(reader.tables)} 张表，{time.perf_counter() - t0:.3f} s")
+        t0 = time.perf_counter()
+        reader = DatReader(path)
+        print(f"读取已保存的索引：{time.perf_counter() - t0:.4f} s")
+
+        # 只读第 2 步最后一个增量步的位移
+        t0 = time.perf_counter()
+        (table,) = reader.find(kind="node", column="U2", step=2, increment=args.increments)
+        u = reader.read(table)
+        print(f"第 2 步第 {args.increments} 增量步 U：{u.size} 行，{time.perf_counter() - t0:.3f} s，字段 {u.dtype.names}")
+        assert np.allclose(np.column_stack([u[c] for c in table["columns"]]), written[(2, args.increments)]["U"], rtol=1e-6)
+
+        # 单元应力按块读取，内存只与块大小有关
+        t0 = time.perf_counter()
+        (table,) = reader.find(kind="element", column="S11", step=1, increment=1)
+        n, peak = 0, 0.0
+        for chunk in reader.iter_chunks(table, rows=50000):
+            n += chunk.size
+            peak = max(peak, np.abs(chunk["S11"]).max())
+        assert n == 8 * args.elements and np.isclose(peak, np.abs(written[(1, 1)]["S"][:, 0]).max(), rtol=1e-6)
+        print(f"第 1 步第 1 增量步 S（分块）：{n} 行，|S11|max = {peak:.4g}，{time.perf_counter() - t0:.3f} s")
+
+        rf = reader.read(reader.find(kind="node", column="RF2", step=1, increment=1)[0])
+        assert np.allclose(rf["RF2"], written[(1, 1)]["RF"][:, 1], rtol=1e-6)
+        print(f"节点 {args.nodes // 2} 最后一次打印的 U2 = {reader.last_value(args.nodes // 2, 'U2'):.6E}")
+        os.remove(path)
+        os.remove(reader.index_path)
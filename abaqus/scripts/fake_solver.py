@@ -0,0 +1,91 @@
+import math
+import os
+import sys
+import time
+
+"""
+本地测试用的 Abaqus 替身：接受与 abaqus 命令相同的 job=... input=... cpus=... 参数，
+读取 .inp 中 *Static 的增量步设置，按增量步逐行写 .sta（与 Abaqus/Standard 的格式一致），
+最后写 .dat / .msg / .odb 占位文件，不做任何计算。
+
+    python fake_solver.py job=Job-1 input=Job-1.inp cpus=2 memory="2048 mb" interactive
+
+环境变量：
+    FAKE_SOLVER_SECONDS  整个分析的耗时（秒），默认 0.2
+    FAKE_SOLVER_FAIL     以逗号分隔的作业名，这些作业中途以非零码退出并在 .sta 中写入失败信息
+"""
+
+STA_HEADER = """\
+ Abaqus/Standard (fake solver)                  DATE {date} TIME {time}
+ SUMMARY OF JOB INFORMATION:
+ STEP  INC ATT SEVERE EQUIL TOTAL  TOTAL      STEP       INC OF       DOF    IF
+               DISCON ITERS ITERS  TIME/    TIME/LPF    TIME/LPF    MONITOR RIKS
+               ITERS               FREQ
+"""
+
+
+def parse_args(argv):
+    """abaqus 风格的 key=value 参数，单独的词（如 interactive）值为 True"""
+    opts = {}
+    for arg in argv:
+        key, sep, value = arg.partition("=")
+        opts[key.lower()] = value.strip('"') if sep else True
+    return opts
+
+
+def static_increment(inp):
+    """*Static 数据行的 (初始增量, 总时间)，找不到时为 (0.1, 1.0)"""
+    with open(inp, "r", encoding="ascii", errors="replace") as f:
+        lines = iter(f)
+        for line in lines:
+            if line.lower().startswith("*static"):
+                values = [float(v) for v in next(lines).split(",") if v.strip()]
+                return values[0], values[1] if len(values) > 1 else 1.0
+    return 0.1, 1.0
+
+
+def main(argv=None):
+    opts = parse_args(sys.argv[1:] if argv is None else argv)
+    job = opts.get("job")
+    if not job:
+        print("fake_solver: 缺少 job=", file=sys.stderr)
+        return 2
+    inp = opts.get("input", job)
+    if not inp.endswith(".inp"):
+        inp += ".inp"
+    if not os.path.exists(inp):
+        print(f"fake_solver: 找不到输入文件 {inp}", file=sys.stderr)
+        return 2
+
+    seconds = float(os.environ.get("FAKE_SOLVER_SECONDS", "0.2"))
+    fail = job in os.environ.get("FAKE_SOLVER_FAIL", "").split(",")
+    inc, total = static_increment(inp)
+    n_inc = max(1, math.ceil(total / inc))
+    stop = n_inc // 2 if fail else n_inc
+
+    with open(f"{job}.sta", "w", encoding="ascii") as sta:
+        sta.write(STA_HEADER.format(date=time.strftime("%d-%b-%Y"), time=time.strftime("%H:%M:%S")))
+        sta.flush()
+        for i in range(1, stop + 1):
+            time.sleep(seconds / n_inc)
+            t = min(i * inc, total)
+            sta.write(f"  1 {i:5d}   1     0     2     2  {t:.4e} {t:.4e} {inc:.4e}\n")
+            sta.flush()
+        if fail:
+            sta.write(" THE ANALYSIS HAS NOT BEEN COMPLETED\n")
+        else:
+            sta.write(" THE ANALYSIS HAS COMPLETED SUCCESSFULLY\n")
+
+    with open(f"{job}.msg", "w", encoding="ascii") as msg:
+        msg.write(f" fake solver: {stop} increments, cpus={opts.get('cpus', 1)}, memory={opts.get('memory', '')}\n")
+    if fail:
+        return 1
+    with open(f"{job}.dat", "w", encoding="ascii") as dat:
+        dat.write(f" ANALYSIS COMPLETE\n JOB TIME SUMMARY\n   WALLCLOCK TIME (SEC) = {seconds:.3f}\n")
+    open(f"{job}.odb", "wb").close()
+    return 0
+
+
+# ------------------ 主程序 ------------------
+if __name__ == "__main__":
+    sys.exit(main())
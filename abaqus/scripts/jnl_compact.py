@@ -0,0 +1,392 @@
+"""
+Abaqus 日志（.jnl / 录制的 .py）精简：用 ast 解析记录下来的 mdb 调用，删掉回放时不再需要的操作，
+输出最小的回放脚本，并统计删掉的调用数和估计省下的网格划分工作量。
+
+删除规则（反复应用直到不再变化）：
+  - 作业监控回显 mdb.jobs[...]._Message(...)，重复的 from xxx import *；
+  - 日志中标记为失败（紧跟 "#* ..." 注释）的语句，回放时只会再失败一次；
+  - 先创建、后 del 的对象：连同只作用于该对象的调用一起删除；期间有其他语句引用它（路径或名称）时保留；
+    零件特征（Partition cell-1 等）只在本日志包含零件创建、能推出特征名时处理，且期间该零件上不能有其他操作；
+  - generateMesh 之后又 deleteMesh 的同一区域网格；
+  - 被后面同一区域的布种覆盖、且中间没有生效的 generateMesh 的布种；
+  - 草图中对本来就水平 / 竖直 / 平行的直线加的约束。
+
+网格工作量按壳体拉伸面积 / 网格尺寸² 估计单元数，只统计能从日志中推出几何的情况。
+
+    python jnl_compact.py ../models/first/testPython.jnl -o replay.py
+"""
+
+import argparse
+import ast
+import math
+import os
+from collections import Counter
+
+# 创建对象的方法 -> 所在的仓库名
+CREATES = {
+    "ConstrainedSketch": "sketches",
+    "Part": "parts",
+    "Material": "materials",
+    "HomogeneousShellSection": "sections",
+    "HomogeneousSolidSection": "sections",
+    "BeamSection": "sections",
+    "StaticStep": "steps",
+    "StaticRiksStep": "steps",
+    "FrequencyStep": "steps",
+    "ImplicitDynamicsStep": "steps",
+    "ConcentratedForce": "loads",
+    "Pressure": "loads",
+    "Moment": "loads",
+    "DisplacementBC": "boundaryConditions",
+    "EncastreBC": "boundaryConditions",
+    "Instance": "instances",
+    "Set": "sets",
+    "Surface": "surfaces",
+    "Job": "jobs",
+}
+
+# 零件特征方法前缀 -> Abaqus 自动命名的前缀
+FEATURES = {
+    "PartitionCell": "Partition cell",
+    "PartitionFace": "Partition face",
+    "PartitionEdge": "Partition edge",
+    "DatumPlane": "Datum plane",
+    "DatumAxis": "Datum axis",
+    "DatumPoint": "Datum pt",
+    "DatumCsys": "Datum csys",
+}
+
+SKETCH_CONSTRAINTS = ("HorizontalConstraint", "VerticalConstraint", "ParallelConstraint", "PerpendicularConstraint")
+
+
+def _path(node):
+    """mdb.models['Model-1'].parts['Part-1'] -> ('mdb', 'models', 'Model-1', 'parts', 'Part-1')；含非常量下标时为 None"""
+    parts = []
+    while True:
+        if isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        elif isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Constant):
+            parts.append(node.slice.value)
+            node = node.value
+        elif isinstance(node, ast.Name):
+            parts.append(node.id)
+            return tuple(reversed(parts))
+        else:
+            return None
+
+
+def _const(node):
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError):
+        return None
+
+
+class Statement:
+    def __init__(self, index, node, text):
+        self.index = index
+        self.node = node
+        self.text = text
+        self.alive = True
+        self.reason = None
+        self.failed = False
+        self.receiver = None
+        self.method = None
+        self.kwargs = {}
+        self.creates = None
+        self.deletes = None
+        call = node.value if isinstance(node, ast.Expr) else None
+        if isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute):
+            self.receiver = _path(call.func.value)
+            self.method = call.func.attr
+            self.kwargs = {kw.arg: kw.value for kw in call.keywords if kw.arg}
+            repo = CREATES.get(self.method)
+            name = _const(self.kwargs["name"]) if "name" in self.kwargs else None
+            if repo and self.receiver and isinstance(name, str):
+                self.creates = self.receiver + (repo, name)
+        if isinstance(node, ast.Delete) and len(node.targets) == 1:
+            self.deletes = _path(node.targets[0])
+        # 参数中引用到的对象路径和字符串（用于判断依赖）
+        self.refs = set()
+        self.strings = set()
+        if call is not None and isinstance(call, ast.Call):
+            for arg in list(call.args) + [kw.value for kw in call.keywords]:
+                for sub in ast.walk(arg):
+                    if isinstance(sub, (ast.Attribute, ast.Subscript)):
+                        p = _path(sub)
+                        if p:
+                            self.refs.add(p)
+                    elif isinstance(sub, ast.Constant) and isinstance(sub.value, str):
+                        self.strings.add(sub.value)
+
+    @property
+    def is_import(self):
+        return isinstance(self.node, ast.ImportFrom)
+
+    def under(self, path):
+        return self.receiver is not None and self.receiver[:len(path)] == path
+
+    def references(self, path):
+        return any(r[:len(path)] == path for r in self.refs) or path[-1] in self.strings
+
+    def kw_dump(self, name):
+        node = self.kwargs.get(name)
+        return ast.dump(node) if node is not None else None
+
+    def kill(self, reason):
+        self.alive = False
+        self.reason = reason
+
+
+class JournalCompactor:
+    def __init__(self, source):
+        """source 为日志文本（按 latin-1 读入，保证原样写回）"""
+        self.source = source
+        self.lines = source.splitlines()
+        tree = ast.parse(source)
+        self.statements = []
+        for i, node in enumerate(tree.body):
+            text = "\n".join(self.lines[node.lineno - 1:node.end_lineno])
+            self.statements.append(Statement(i, node, text))
+        self._mark_failed()
+        self._name_features()
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "r", encoding="latin-1") as f:
+            return cls(f.read())
+
+    def _mark_failed(self):
+        """日志把失败信息写成紧跟在失败语句之后的 "#* ..." 注释"""
+        ends = [(s.node.end_lineno, s) for s in self.statements]
+        for lineno, line in enumerate(self.lines, 1):
+            if line.startswith("#*"):
+                before = [s for end, s in ends if end < lineno]
+                if before:
+                    before[-1].failed = True
+
+    def _name_features(self):
+        """零件在本日志中创建时，按 Abaqus 的自动命名规则推出各特征的名称"""
+        counters = {}
+        for s in self.statements:
+            if s.creates and s.method == "Part":
+                counters[s.creates] = Counter()
+            if s.failed or s.receiver not in counters:
+                continue
+            for prefix, label in FEATURES.items():
+                if s.method.startswith(prefix):
+                    counters[s.receiver][label] += 1
+                    s.creates = s.receiver + ("features", f"{label}-{counters[s.receiver][label]}")
+                    break
+
+    def _alive(self):
+        return [s for s in self.statements if s.alive]
+
+    # ------------------ 规则 ------------------
+    def _drop_noise(self):
+        seen = set()
+        for s in self._alive():
+            if s.is_import:
+                key = ast.dump(s.node)
+                if key in seen:
+                    s.kill("duplicate import")
+                seen.add(key)
+            elif s.method == "_Message":
+                s.kill("job message")
+            elif s.failed:
+                s.kill("failed")
+
+    def _drop_deleted(self):
+        changed = False
+        alive = self._alive()
+        for k, d in enumerate(alive):
+            if d.deletes is None or not d.alive:
+                continue
+            path = d.deletes
+            create = None
+            for j in range(k - 1, -1, -1):
+                if alive[j].alive and alive[j].creates == path:
+                    create = j
+                    break
+            if create is None:
+                continue
+            between = [s for s in alive[create + 1:k] if s.alive]
+            feature = len(path) >= 2 and path[-2] == "features"
+            children, blocked = [], False
+            for s in between:
+                if s.under(path):
+                    children.append(s)
+                elif (feature and s.under(path[:-2])) or s.references(path):
+                    blocked = True
+                    break
+            if blocked:
+                continue
+            for s in [alive[create], d] + children:
+                s.kill("deleted object")
+            changed = True
+        return changed
+
+    def _drop_meshes(self):
+        changed = False
+        alive = self._alive()
+        for k, g in enumerate(alive):
+            if g.method != "generateMesh" or not g.alive:
+                continue
+            for s in alive[k + 1:]:
+                if not s.alive or s.receiver != g.receiver:
+                    continue
+                if s.method == "deleteMesh" and s.kw_dump("regions") == g.kw_dump("regions"):
+                    g.kill("deleted mesh")
+                    s.kill("deleted mesh")
+                    changed = True
+                    break
+                if not s.method.startswith("seed"):
+                    break
+        return changed
+
+    def _drop_seeds(self):
+        changed = False
+        alive = self._alive()
+        for k, seed in enumerate(alive):
+            if not (seed.alive and seed.method and seed.method.startswith("seed")):
+                continue
+            key = (seed.method, seed.kw_dump("regions"), seed.kw_dump("edges"))
+            for s in alive[k + 1:]:
+                if not s.alive or s.receiver != seed.receiver:
+                    continue
+                if s.method == "generateMesh":
+                    break
+                if s.method == seed.method and (s.method, s.kw_dump("regions"), s.kw_dump("edges")) == key:
+                    seed.kill("superseded seed")
+                    changed = True
+                    break
+        return changed
+
+    def _drop_constraints(self):
+        """草图约束：被约束的直线本来就满足约束时是多余的（草图几何从 geometry[2] 开始编号）"""
+        sketches = {}
+        for s in self._alive():
+            if s.creates and s.method == "ConstrainedSketch":
+                sketches[s.creates] = []
+            if s.receiver not in sketches:
+                continue
+            geometry = sketches[s.receiver]
+            if s.method == "Line":
+                p1, p2 = _const(s.kwargs.get("point1")), _const(s.kwargs.get("point2"))
+                geometry.append((p1, p2) if p1 and p2 else None)
+            elif s.method in SKETCH_CONSTRAINTS:
+                def line(key):
+                    p = _path(s.kwargs[key]) if key in s.kwargs else None
+                    i = p[-1] - 2 if p and isinstance(p[-1], int) else -1
+                    return geometry[i] if 0 <= i < len(geometry) else None
+                if s.method == "HorizontalConstraint":
+                    g = line("entity")
+                    redundant = g is not None and g[0][1] == g[1][1]
+                elif s.method == "VerticalConstraint":
+                    g = line("entity")
+                    redundant = g is not None and g[0][0] == g[1][0]
+                else:
+                    g1, g2 = line("entity1"), line("entity2")
+                    redundant = False
+                    if g1 is not None and g2 is not None:
+                        d1 = (g1[1][0] - g1[0][0], g1[1][1] - g1[0][1])
+                        d2 = (g2[1][0] - g2[0][0], g2[1][1] - g2[0][1])
+                        cross = d1[0] * d2[1] - d1[1] * d2[0]
+                        dot = d1[0] * d2[0] + d1[1] * d2[1]
+                        redundant = (cross if s.method == "ParallelConstraint" else dot) == 0
+                if redundant:
+                    s.kill("redundant constraint")
+            elif s.method[:1].isupper() and not s.method.endswith(("Constraint", "Dimension")):
+                # 其他几何（圆、弧等）也占一个编号，但形状未知
+                geometry.append(None)
+
+    # ------------------ 网格工作量 ------------------
+    def _mesh_work(self):
+        """按执行顺序估计每个 generateMesh 的单元数，返回 {语句序号: 单元数或 None}"""
+        sketch_len, area, instance_part, seed, work = {}, {}, {}, {}, {}
+        for s in self.statements:
+            if s.failed or s.method is None:
+                continue
+            if s.receiver and len(s.receiver) >= 2 and s.receiver[-2] == "sketches" and s.method == "Line":
+                p1, p2 = _const(s.kwargs.get("point1")), _const(s.kwargs.get("point2"))
+                if p1 and p2:
+                    sketch_len[s.receiver] = sketch_len.get(s.receiver, 0.0) + math.dist(p1, p2)
+            elif s.method == "BaseShellExtrude":
+                sk = _path(s.kwargs["sketch"]) if "sketch" in s.kwargs else None
+                depth = _const(s.kwargs.get("depth"))
+                if sk in sketch_len and depth:
+                    area[s.receiver] = sketch_len[sk] * depth
+            elif s.method == "Instance" and s.creates:
+                instance_part[s.creates] = _path(s.kwargs["part"]) if "part" in s.kwargs else None
+            elif s.method in ("seedPartInstance", "seedPart"):
+                size = _const(s.kwargs.get("size"))
+                for target in self._regions(s):
+                    seed[target] = size
+            elif s.method == "generateMesh":
+                total = 0.0
+                for target in self._regions(s):
+                    part = instance_part.get(target, target)
+                    if area.get(part) is None or not seed.get(target):
+                        total = None
+                        break
+                    total += area[part] / seed[target] ** 2
+                work[s.index] = total
+        return work
+
+    @staticmethod
+    def _regions(s):
+        """区域参数中的实例路径；零件级方法（无 regions）作用于接收者本身"""
+        node = s.kwargs.get("regions")
+        if node is None:
+            return [s.receiver]
+        items = node.elts if isinstance(node, (ast.Tuple, ast.List)) else [node]
+        return [p for p in (_path(e) for e in items) if p]
+
+    # ------------------ 入口 ------------------
+    def compact(self):
+        """应用所有规则，返回统计报告"""
+        work = self._mesh_work()
+        self._drop_noise()
+        self._drop_constraints()
+        while self._drop_deleted() | self._drop_meshes() | self._drop_seeds():
+            pass
+        removed = [s for s in self.statements if not s.alive]
+        mesh_removed = [work.get(s.index) for s in removed if s.method == "generateMesh"]
+        mesh_kept = [work.get(s.index) for s in self._alive() if s.method == "generateMesh"]
+        return {
+            "statements_before": len(self.statements),
+            "statements_after": len(self.statements) - len(removed),
+            "removed": dict(Counter(s.reason for s in removed)),
+            "mesh_removed": sum(w for w in mesh_removed if w),
+            "mesh_kept": sum(w for w in mesh_kept if w),
+            "mesh_unknown": sum(w is None for w in mesh_removed + mesh_kept),
+        }
+
+    def script(self):
+        """精简后的回放脚本文本"""
+        out = ["# -*- coding: mbcs -*-"]
+        out += [s.text for s in self.statements if s.alive]
+        return "\n".join(out) + "\n"
+
+    def write(self, path):
+        with open(path, "w", encoding="latin-1") as f:
+            f.write(self.script())
+
+
+# ------------------ 主程序 ------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="精简 Abaqus 日志，生成最小回放脚本")
+    parser.add_argument("journal")
+    parser.add_argument("-o", "--out", help="输出脚本路径，缺省为 <日志名>_replay.py")
+    args = parser.parse_args()
+
+    compactor = JournalCompactor.from_file(args.journal)
+    report = compactor.compact()
+    out = args.out or os.path.splitext(args.journal)[0] + "_replay.py"
+    compactor.write(out)
+    print(f"{args.journal}: {report['statements_before']} -> {report['statements_after']} 条语句，已写入 {out}")
+    for reason, count in sorted(report["removed"].items(), key=lambda kv: -kv[1]):
+        print(f"  {reason:<22}{count:>6}")
+    print(f"估计省下的网格单元数: {report['mesh_removed']:.0f}（保留 {report['mesh_kept']:.0f}）"
+          + (f"，{report['mesh_unknown']} 次划分无法估计" if report["mesh_unknown"] else ""))
@@ -0,0 +1,271 @@
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import time
+
+from fake_solver import static_increment
+
+"""
+异步执行 batch_builder.py 生成的作业并监视进度。
+同时运行的作业受核数和许可证 token 两个上限约束（Abaqus 每个作业占用 int(5 * cpus^0.422) 个 token）；
+每个作业运行时增量读取 .sta（只读新增的部分），解析出当前分析步、增量步、步时间和回退（cutback）次数，
+超过 timeout 时先 terminate 再 kill；作业结束后调用后处理回调（普通函数在线程中执行，协程直接 await）。
+结果写入 <out>/status.json，格式兼容 run_manifest（returncode、elapsed，无法启动时有 error），并多出 state、进度等字段。
+作业协程被取消时会先结束对应的求解器进程再向上抛出。
+
+    python job_runner.py runs --cores 8 --tokens 30 --timeout 3600
+    python job_runner.py --demo
+"""
+
+STA_DONE = "THE ANALYSIS HAS COMPLETED SUCCESSFULLY"
+STA_FAILED = "THE ANALYSIS HAS NOT BEEN COMPLETED"
+
+
+def licence_tokens(cpus):
+    """Abaqus/Standard 的 token 数"""
+    return int(5 * cpus ** 0.422)
+
+
+class StaTail:
+    def __init__(self, path):
+        """增量读取 .sta：记住读到的位置，每次 poll 只解析新增的完整行"""
+        self.path = path
+        self.offset = 0
+        self.partial = ""
+        self.step = self.increment = 0
+        self.step_time = self.total_time = 0.0
+        self.cutbacks = 0
+        self.outcome = None     # None / "completed" / "failed"
+
+    def poll(self):
+        """返回本次新解析的增量步数；文件还不存在时返回 0"""
+        try:
+            with open(self.path, "r", encoding="ascii", errors="replace") as f:
+                f.seek(self.offset)
+                text = f.read()
+                self.offset = f.tell()
+        except FileNotFoundError:
+            return 0
+        lines = (self.partial + text).split("\n")
+        # 最后一段可能还没写完，留到下次
+        self.partial = lines.pop()
+        new = 0
+        for line in lines:
+            if STA_DONE in line:
+                self.outcome = "completed"
+                continue
+            if STA_FAILED in line:
+                self.outcome = "failed"
+                continue
+            tokens = line.split()
+            # STEP INC ATT SEVERE EQUIL TOTAL TOTAL-TIME STEP-TIME INC-SIZE ...；ATT 带 U 表示该次尝试未收敛
+            if len(tokens) < 9 or not tokens[0].isdigit() or not tokens[1].isdigit():
+                continue
+            if tokens[2].endswith("U"):
+                self.cutbacks += 1
+                continue
+            try:
+                self.step, self.increment = int(tokens[0]), int(tokens[1])
+                self.total_time, self.step_time = float(tokens[6]), float(tokens[7])
+            except ValueError:
+                continue
+            new += 1
+        return new
+
+    def state(self):
+        return {"step": self.step, "increment": self.increment, "step_time": self.step_time,
+                "total_time": self.total_time, "cutbacks": self.cutbacks, "outcome": self.outcome}
+
+
+class JobRunner:
+    def __init__(self, cores=None, tokens=None, timeout=None, poll=0.5, on_progress=None, on_finish=None):
+        """
+        Args:
+            cores (int): 可用核数，默认本机核数
+            tokens (int): 可用许可证 token 数，None 表示不限
+            timeout (float): 每个作业的超时（秒），作业字典中的 "timeout" 优先
+            poll (float): 读取 .sta 的间隔（秒）
+            on_progress: on_progress(job, state)，增量步有变化时调用
+            on_finish: on_finish(job, result) 后处理回调，可以是普通函数或协程函数
+        """
+        self.cores = cores or os.cpu_count() or 1
+        self.tokens = tokens
+        self.timeout = timeout
+        self.poll = poll
+        self.on_progress = on_progress
+        self.on_finish = on_finish
+        self.free_cpu = self.cores
+        self.free_tokens = tokens
+        self._cond = None
+
+    def _need(self, job):
+        # 单个作业超过总量时按总量占用，否则永远排不上
+        cpus = min(job.get("cpus", 1), self.cores)
+        tokens = None if self.tokens is None else min(licence_tokens(job.get("cpus", 1)), self.tokens)
+        return cpus, tokens
+
+    async def _acquire(self, job):
+        cpus, tokens = self._need(job)
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.free_cpu >= cpus and (tokens is None or self.free_tokens >= tokens))
+            self.free_cpu -= cpus
+            if tokens is not None:
+                self.free_tokens -= tokens
+
+    async def _release(self, job):
+        cpus, tokens = self._need(job)
+        async with self._cond:
+            self.free_cpu += cpus
+            if tokens is not None:
+                self.free_tokens += tokens
+            self._cond.notify_all()
+
+    async def _stop(self, proc, grace=5.0):
+        proc.terminate()
+        try:
+            await asyncio.wait_for(proc.wait(), grace)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+
+    async def run_job(self, job, folder):
+        """运行一个作业直到结束，返回结果字典（也会交给 on_finish）"""
+        await self._acquire(job)
+        name = job["name"]
+        tail = StaTail(os.path.join(folder, f"{name}.sta"))
+        inp = os.path.join(folder, f"{name}.inp")
+        period = static_increment(inp)[1] if os.path.exists(inp) else None
+        timeout = job.get("timeout", self.timeout)
+        state = "failed"
+        proc = error = None
+        t0 = time.perf_counter()
+        try:
+            with open(os.path.join(folder, f"{name}.log"), "w", encoding="utf-8") as log:
+                proc = await asyncio.create_subprocess_exec(
+                    *job["command"], cwd=folder, stdout=log, stderr=asyncio.subprocess.STDOUT, env=job.get("env"))
+                while True:
+                    try:
+                        await asyncio.wait_for(proc.wait(), self.poll)
+                    except asyncio.TimeoutError:
+                        pass
+                    if tail.poll() and self.on_progress:
+                        self.on_progress(job, dict(tail.state(), progress=tail.total_time / period if period else None))
+                    if proc.returncode is not None:
+                        break
+                    if timeout is not None and time.perf_counter() - t0 > timeout:
+                        await self._stop(proc)
+                        state = "timeout"
+                        break
+            tail.poll()
+            if state != "timeout":
+                state = "completed" if proc.returncode == 0 and tail.outcome != "failed" else "failed"
+        except OSError as e:
+            # 求解器命令本身无法启动，原因写进结果（最终进入 status.json）
+            proc = None
+            error = f"无法启动：{e}"
+        except asyncio.CancelledError:
+            # 被取消（如 Ctrl+C、外层 wait_for 超时）时先结束子进程，不留下还在跑的求解器
+            if proc is not None and proc.returncode is None:
+                await self._stop(proc)
+            raise
+        finally:
+            await self._release(job)
+        result = dict(tail.state(), state=state, folder=folder, returncode=None if proc is None else proc.returncode,
+                      elapsed=time.perf_counter() - t0)
+        if error is not None:
+            result["error"] = error
+        if self.on_finish:
+            try:
+                if inspect.iscoroutinefunction(self.on_finish):
+                    post = await self.on_finish(job, result)
+                else:
+                    post = await asyncio.to_thread(self.on_finish, job, result)
+                if post is not None:
+                    result["post"] = post
+            except Exception as e:
+                result["post_error"] = repr(e)
+        return result
+
+    async def run(self, jobs, out):
+        """并发运行 jobs（manifest 中的作业字典，dir 相对 out），返回 {作业名: 结果}"""
+        self._cond = asyncio.Condition()
+        self.free_cpu, self.free_tokens = self.cores, self.tokens
+        results = await asyncio.gather(*(self.run_job(job, os.path.join(out, job["dir"])) for job in jobs))
+        return {job["name"]: r for job, r in zip(jobs, results)}
+
+
+def run_manifest_async(out, **kwargs):
+    """读取 <out>/manifest.json 执行全部作业，结果写入 <out>/status.json；kwargs 传给 JobRunner"""
+    with open(os.path.join(out, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    kwargs.setdefault("cores", manifest["cores"])
+    status = asyncio.run(JobRunner(**kwargs).run(manifest["jobs"], out))
+    with open(os.path.join(out, "status.json"), "w", encoding="utf-8") as f:
+        json.dump(status, f, indent=2)
+    return status
+
+
+def print_progress(job, state):
+    progress = f"{state['progress']:6.1%}" if state["progress"] is not None else "     -"
+    print(f"  {job['name']:<10} step {state['step']} inc {state['increment']:>4}  {progress}"
+          + (f"  cutbacks {state['cutbacks']}" if state["cutbacks"] else ""))
+
+
+def read_wallclock(job, result):
+    """示例后处理：从 .dat 读出求解器报告的墙钟时间"""
+    if result["state"] != "completed":
+        return None
+    path = os.path.join(result["folder"], f"{job['name']}.dat")
+    with open(path, "r", encoding="ascii", errors="replace") as f:
+        for line in f:
+            if "WALLCLOCK TIME" in line:
+                return {"wallclock": float(line.split("=")[1])}
+    return None
+
+
+# ------------------ 主程序 ------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="异步执行并监视 Abaqus 作业")
+    parser.add_argument("out", nargs="?", help="batch_builder.py 的输出目录（含 manifest.json）")
+    parser.add_argument("--cores", type=int)
+    parser.add_argument("--tokens", type=int, help="可用许可证 token 数")
+    parser.add_argument("--timeout", type=float, help="单个作业的超时（秒）")
+    parser.add_argument("--poll", type=float, default=0.5)
+    parser.add_argument("--demo", action="store_true", help="在临时目录中用 fake_solver 生成并运行一批作业")
+    args = parser.parse_args()
+
+    if args.demo:
+        import shutil
+        import tempfile
+        from batch_builder import STUB_COMMAND, build, full_factorial
+
+        out = tempfile.mkdtemp(prefix="jobs_")
+        manifest = build(full_factorial(mesh_size=[120.0, 60.0], load=[-1000.0, -2000.0, -3000.0]), out,
+                         cores=4, memory=8000, command=STUB_COMMAND)
+        jobs = manifest["jobs"]
+        env = dict(os.environ, FAKE_SOLVER_SECONDS="1.0", FAKE_SOLVER_FAIL=jobs[1]["name"])
+        for job in jobs:
+            job["env"] = env
+        # 最后一个作业给一个很短的超时
+        jobs[-1]["timeout"] = 0.4
+        runner = JobRunner(cores=4, tokens=10, poll=0.1, on_progress=print_progress, on_finish=read_wallclock)
+        t0 = time.perf_counter()
+        status = asyncio.run(runner.run(jobs, out))
+        print(f"\n{len(jobs)} 个作业，总用时 {time.perf_counter() - t0:.2f} s")
+        for name, r in status.items():
+            print(f"  {name:<10}{r['state']:<10}returncode={r['returncode']}  inc={r['increment']}  "
+                  f"{r['elapsed']:.2f} s  {r.get('post', '')}")
+        assert status[jobs[1]["name"]]["state"] == "failed"
+        assert status[jobs[-1]["name"]]["state"] == "timeout"
+        assert sum(r["state"] == "completed" for r in status.values()) == len(jobs) - 2
+        shutil.rmtree(out)
+    elif args.out:
+        status = run_manifest_async(args.out, tokens=args.tokens, timeout=args.timeout, poll=args.poll,
+                                    on_progress=print_progress,
+                                    **({"cores": args.cores} if args.cores else {}))
+        failed = [name for name, r in status.items() if r["state"] != "completed"]
+        print(f"\n完成 {len(status) - len(failed)} / {len(status)}" + (f"，未完成：{', '.join(failed)}" if failed else ""))
+    else:
+        parser.error("需要作业目录或 --demo")
@@ -0,0 +1,371 @@
+import math
+import time
+
+import numpy as np
+
+"""
+按坐标 / 包围盒选择面、边、点，代替 getSequenceFromMask 中写死的掩码（拓扑一变掩码就失效）。
+RegionResolver 为零件或实例的 faces / edges / vertices 各建一个均匀网格空间索引（包围盒由实体的顶点坐标
+和 pointOn 得到），框选和点选只检查查询范围覆盖的网格，几万个实体时也是微秒级；
+查询结果按 (实体类型, 查询) 缓存，参数扫描的多次迭代之间复用；每次查询先比较一个廉价的签名
+（各类实体数 + 均匀抽取的 FINGERPRINT_SAMPLES 个顶点坐标），拓扑或尺寸改变时自动重建，也可以调用 refresh()。
+
+结果以掩码形式交给 repository.getSequenceFromMask，所以在 Abaqus 中得到的就是普通的 GeomSequence：
+
+    r = RegionResolver(mdb.models['Model-1'].parts['Part-1'])
+    faces = r.faces(box=((-100, -1, -1), (100, 1, 6001)))
+    edges = r.edges(at=(0.0, 209.0, 3000.0))
+    r.region(faces=faces)                     # regionToolset.Region
+
+LocalPart 是不依赖 Abaqus 的替身几何（拉伸壳体），实现了上面用到的同名接口，用于离线测试。
+"""
+
+KINDS = ("faces", "edges", "vertices")
+# 几何签名中抽取的顶点数；只改动个别未被抽到的顶点时签名不变，需要手动 refresh()
+FINGERPRINT_SAMPLES = 16
+
+
+# ------------------ 掩码 ------------------
+def indices_to_mask(indices):
+    """实体序号 -> Abaqus 掩码字符串，如 [0, 4] -> '[#11 ]'；连续相同的 32 位字写成 '#ffffffff:3'"""
+    indices = sorted(set(int(i) for i in indices))
+    if not indices:
+        return "[ ]"
+    words = [0] * (indices[-1] // 32 + 1)
+    for i in indices:
+        words[i // 32] |= 1 << (i % 32)
+    parts = []
+    k = 0
+    while k < len(words):
+        n = 1
+        while k + n < len(words) and words[k + n] == words[k]:
+            n += 1
+        parts.append(f"#{words[k]:x}" + (f":{n}" if n > 1 else ""))
+        k += n
+    return "[" + " ".join(parts) + " ]"
+
+
+def mask_to_indices(mask):
+    """Abaqus 掩码字符串 -> 实体序号列表"""
+    indices = []
+    word = 0
+    for token in mask.strip("[] ").split():
+        value, _, repeat = token.lstrip("#").partition(":")
+        for _ in range(int(repeat) if repeat else 1):
+            bits = int(value, 16)
+            indices.extend(word * 32 + b for b in range(32) if bits >> b & 1)
+            word += 1
+    return indices
+
+
+# ------------------ 空间索引 ------------------
+class SpatialIndex:
+    def __init__(self, boxes, cell=None):
+        """
+        boxes: (n, 6) 数组，每行 (xmin, ymin, zmin, xmax, ymax, zmax)
+        cell: 网格尺寸，缺省按总包围盒体积 / 实体数估计，使每格平均约一个实体
+        """
+        self.boxes = np.asarray(boxes, dtype=float).reshape(-1, 6)
+        n = len(self.boxes)
+        lo = self.boxes[:, :3].min(axis=0) if n else np.zeros(3)
+        hi = self.boxes[:, 3:].max(axis=0) if n else np.ones(3)
+        extent = np.maximum(hi - lo, 1e-9)
+        if cell is None:
+            # 按非退化方向的尺寸估计（平面模型在某个方向上厚度为零）
+            dims = extent[extent > 1e-6 * extent.max()]
+            cell = (np.prod(dims) / max(n, 1)) ** (1 / max(len(dims), 1))
+        self.cell = float(cell)
+        self.origin = lo
+        self.grid = {}
+        self.large = []
+        first = self._cell(self.boxes[:, :3])
+        last = self._cell(self.boxes[:, 3:])
+        for i in range(n):
+            (i0, j0, k0), (i1, j1, k1) = first[i], last[i]
+            # 跨太多格的大实体单独放，查询时总是检查
+            if (i1 - i0 + 1) * (j1 - j0 + 1) * (k1 - k0 + 1) > 64:
+                self.large.append(i)
+                continue
+            for a in range(i0, i1 + 1):
+                for b in range(j0, j1 + 1):
+                    for c in range(k0, k1 + 1):
+                        self.grid.setdefault((a, b, c), []).append(i)
+
+    def _cell(self, points):
+        return np.floor((np.asarray(points, dtype=float) - self.origin) / self.cell).astype(int).tolist()
+
+    def _candidates(self, lo, hi):
+        (i0, j0, k0), (i1, j1, k1) = self._cell([lo, hi])
+        cells = (i1 - i0 + 1) * (j1 - j0 + 1) * (k1 - k0 + 1)
+        if cells > len(self.grid):
+            # 查询范围比索引还大，直接全部检查
+            return np.arange(len(self.boxes))
+        found = set(self.large)
+        grid = self.grid
+        for a in range(i0, i1 + 1):
+            for b in range(j0, j1 + 1):
+                for c in range(k0, k1 + 1):
+                    found.update(grid.get((a, b, c), ()))
+        return np.fromiter(found, dtype=int, count=len(found))
+
+    def within(self, lo, hi, tol=0.0):
+        """包围盒完全落在 [lo, hi] 内的实体（与 getByBoundingBox 相同的语义）"""
+        lo = np.asarray(lo, dtype=float) - tol
+        hi = np.asarray(hi, dtype=float) + tol
+        idx = self._candidates(lo, hi)
+        b = self.boxes[idx]
+        keep = np.all(b[:, :3] >= lo, axis=1) & np.all(b[:, 3:] <= hi, axis=1)
+        return np.sort(idx[keep])
+
+    def containing(self, point, tol):
+        """包围盒（放大 tol）包含 point 的实体"""
+        p = np.asarray(point, dtype=float)
+        idx = self._candidates(p - tol, p + tol)
+        b = self.boxes[idx]
+        keep = np.all(b[:, :3] - tol <= p, axis=1) & np.all(b[:, 3:] + tol >= p, axis=1)
+        return np.sort(idx[keep])
+
+
+# ------------------ 选择层 ------------------
+class RegionResolver:
+    def __init__(self, target, tol=1e-6):
+        """
+        target: Abaqus 零件或实例（有 faces / edges / vertices 仓库），或 LocalPart
+        tol: 点选与框选的容差
+        """
+        self.target = target
+        self.tol = tol
+        self.hits = 0
+        self.misses = 0
+        self.refresh()
+
+    def refresh(self):
+        """重建空间索引并清空缓存（签名变化时会自动调用）"""
+        self._indexes = {}
+        self._cache = {}
+        self._signature = self._fingerprint()
+
+    def _fingerprint(self):
+        """各类实体数 + 均匀抽取的顶点坐标：拓扑不变、只改尺寸的参数扫描也能发现"""
+        sizes = tuple(len(getattr(self.target, kind)) for kind in KINDS)
+        n = sizes[KINDS.index("vertices")]
+        if n == 0:
+            return sizes
+        vertices = self.target.vertices
+        picks = sorted({i * (n - 1) // (FINGERPRINT_SAMPLES - 1) for i in range(FINGERPRINT_SAMPLES)})
+        return sizes + tuple(tuple(vertices[i].pointOn[0]) for i in picks)
+
+    def _vertex_coords(self):
+        return np.array([v.pointOn[0] for v in self.target.vertices], dtype=float).reshape(-1, 3)
+
+    def _index(self, kind):
+        if self._fingerprint() != self._signature:
+            self.refresh()
+        if kind not in self._indexes:
+            coords = self._vertex_coords()
+            entities = getattr(self.target, kind)
+            on = np.array([e.pointOn[0] for e in entities], dtype=float).reshape(-1, 3)
+            lo, hi = on, on
+            if kind != "vertices" and len(entities):
+                # 各实体的顶点序号拼成一维，用 reduceat 一次求出每个实体的最小 / 最大坐标
+                ids = [tuple(e.getVertices()) for e in entities]
+                counts = np.array([len(v) for v in ids])
+                has = counts > 0
+                flat = np.fromiter((i for v in ids for i in v), dtype=int, count=int(counts.sum()))
+                if flat.size:
+                    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[has]
+                    pts = coords[flat]
+                    lo, hi = on.copy(), on.copy()
+                    lo[has] = np.minimum(on[has], np.minimum.reduceat(pts, starts, axis=0))
+                    hi[has] = np.maximum(on[has], np.maximum.reduceat(pts, starts, axis=0))
+            self._indexes[kind] = (SpatialIndex(np.hstack([lo, hi])), coords)
+        return self._indexes[kind]
+
+    def _on_entity(self, kind, i, point, coords):
+        """点是否落在实体上：边按直线段、面按顶点所在平面判断（曲边 / 曲面只用包围盒）"""
+        if kind == "vertices":
+            return True
+        entity = getattr(self.target, kind)[i]
+        pts = coords[list(entity.getVertices())]
+        p = np.asarray(point, dtype=float)
+        if kind == "edges":
+            if len(pts) < 2:
+                return True
+            a, b = pts[0], pts[1]
+            t = np.clip(np.dot(p - a, b - a) / max(np.dot(b - a, b - a), 1e-300), 0.0, 1.0)
+            return np.linalg.norm(a + t * (b - a) - p) <= self.tol
+        if len(pts) < 3:
+            return True
+        normal = np.cross(pts[1] - pts[0], pts[2] - pts[0])
+        norm = np.linalg.norm(normal)
+        return norm == 0 or abs(np.dot(p - pts[0], normal)) / norm <= self.tol
+
+    def indices(self, kind, box=None, at=None):
+        """
+        按包围盒 box=((xmin, ymin, zmin), (xmax, ymax, zmax)) 或点 at=(x, y, z)（也可以是点的列表）
+        选择实体，返回排好序的序号元组；结果按查询缓存。
+        """
+        if kind not in KINDS:
+            raise ValueError(f"未知实体类型 {kind!r}，可选 {KINDS}")
+        if (box is None) == (at is None):
+            raise ValueError("box 与 at 需要且只能给出一个")
+        index, coords = self._index(kind)
+        key = (kind, "box", tuple(map(tuple, box))) if box is not None else (kind, "at", self._points_key(at))
+        if key in self._cache:
+            self.hits += 1
+            return self._cache[key]
+        self.misses += 1
+        if box is not None:
+            found = index.within(box[0], box[1], self.tol).tolist()
+        else:
+            found = set()
+            for p in key[2]:
+                found.update(i for i in index.containing(p, self.tol).tolist()
+                             if self._on_entity(kind, i, p, coords))
+            found = sorted(found)
+        result = tuple(int(i) for i in found)
+        self._cache[key] = result
+        return result
+
+    @staticmethod
+    def _points_key(at):
+        at = tuple(at)
+        if at and not isinstance(at[0], (tuple, list)):
+            at = (at,)
+        return tuple(tuple(float(v) for v in p) for p in at)
+
+    def mask(self, kind, box=None, at=None):
+        return indices_to_mask(self.indices(kind, box=box, at=at))
+
+    def _sequence(self, kind, box, at):
+        ids = self.indices(kind, box=box, at=at)
+        if not ids:
+            raise LookupError(f"没有找到满足条件的 {kind}：box={box}, at={at}")
+        return getattr(self.target, kind).getSequenceFromMask(mask=(indices_to_mask(ids),))
+
+    def faces(self, box=None, at=None):
+        return self._sequence("faces", box, at)
+
+    def edges(self, box=None, at=None):
+        return self._sequence("edges", box, at)
+
+    def vertices(self, box=None, at=None):
+        return self._sequence("vertices", box, at)
+
+    def region(self, **sequences):
+        """由序列构造 regionToolset.Region；在 Abaqus 外返回关键字字典"""
+        try:
+            from regionToolset import Region
+        except ImportError:
+            return dict(sequences)
+        return Region(**sequences)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "cached": len(self._cache)}
+
+
+# ------------------ 替身几何 ------------------
+class LocalEntity:
+    def __init__(self, index, point, vertices=()):
+        self.index = index
+        self.pointOn = (tuple(point),)
+        self._vertices = tuple(vertices)
+
+    def getVertices(self):
+        return self._vertices
+
+
+class LocalRepository(list):
+    """模拟 Abaqus 的实体仓库：按序号存放，支持 getSequenceFromMask 和暴力实现的 getByBoundingBox / findAt"""
+
+    def getSequenceFromMask(self, mask):
+        return LocalRepository(self[i] for i in mask_to_indices(mask[0]))
+
+    def getByBoundingBox(self, xMin=-math.inf, yMin=-math.inf, zMin=-math.inf,
+                         xMax=math.inf, yMax=math.inf, zMax=math.inf, vertices=None):
+        out = LocalRepository()
+        for e in self:
+            pts = [e.pointOn[0]] + [vertices[i].pointOn[0] for i in e.getVertices()] if vertices else [e.pointOn[0]]
+            if all(xMin <= x <= xMax and yMin <= y <= yMax and zMin <= z <= zMax for x, y, z in pts):
+                out.append(e)
+        return out
+
+
+class LocalPart:
+    def __init__(self, profile, depth, n_z=1):
+        """
+        拉伸壳体：profile 为截面线段 [(起点, 终点), ...]，沿 z 拉伸 depth，并在 z 向等分成 n_z 段
+        （相当于沿长度方向分区，用来构造大量实体）。序号规则只保证自洽，与 Abaqus 的编号无关。
+        """
+        points = []
+        for p0, p1 in profile:
+            for p in (tuple(p0), tuple(p1)):
+                if p not in points:
+                    points.append(p)
+        zs = [depth * k / n_z for k in range(n_z + 1)]
+        n_p = len(points)
+        self.vertices = LocalRepository(
+            LocalEntity(k * n_p + j, (x, y, z)) for k, z in enumerate(zs) for j, (x, y) in enumerate(points)
+        )
+        vid = lambda k, j: k * n_p + j
+        self.edges = LocalRepository()
+        self.faces = LocalRepository()
+        lines = [(points.index(tuple(p0)), points.index(tuple(p1))) for p0, p1 in profile]
+        for k, z in enumerate(zs):
+            # 截面线在每个 z 位置上的横向边
+            for a, b in lines:
+                mid = ((points[a][0] + points[b][0]) / 2, (points[a][1] + points[b][1]) / 2, z)
+                self.edges.append(LocalEntity(len(self.edges), mid, (vid(k, a), vid(k, b))))
+            if k == n_z:
+                break
+            zm = (z + zs[k + 1]) / 2
+            # 截面点之间的纵向边
+            for j, (x, y) in enumerate(points):
+                self.edges.append(LocalEntity(len(self.edges), (x, y, zm), (vid(k, j), vid(k + 1, j))))
+            for a, b in lines:
+                mid = ((points[a][0] + points[b][0]) / 2, (points[a][1] + points[b][1]) / 2, zm)
+                self.faces.append(LocalEntity(len(self.faces), mid, (vid(k, a), vid(k, b), vid(k + 1, b), vid(k + 1, a))))
+
+
+# ------------------ 主程序 ------------------
+if __name__ == "__main__":
+    # testPython.py 中的 I 字形截面
+    profile = [((0, 0), (100, 0)), ((0, 0), (-100, 0)), ((0, 0), (0, 209)),
+               ((90, 209), (0, 209)), ((0, 209), (-90, 209))]
+    part = LocalPart(profile, 6000.0, n_z=4000)
+    print(f"替身几何: {len(part.faces)} 面, {len(part.edges)} 边, {len(part.vertices)} 点")
+
+    t0 = time.perf_counter()
+    r = RegionResolver(part)
+    r.indices("faces", at=(0.0, 100.0, 10.0))
+    r.indices("edges", at=(0.0, 209.0, 3000.0))
+    r.indices("vertices", at=(0.0, 0.0, 0.0))
+    print(f"建立索引: {(time.perf_counter() - t0) * 1e3:.1f} ms")
+
+    queries = [
+        ("faces", {"box": ((-100, -1, 1000), (100, 1, 2000))}),          # 下翼缘一段
+        ("faces", {"box": ((-1, -1, -1), (1, 210, 6001))}),              # 整个腹板
+        ("edges", {"box": ((-101, -1, -1), (101, 1, 1))}),               # z=0 端下翼缘的边
+        ("edges", {"at": (0.0, 209.0, 3000.0)}),                         # 腹板与上翼缘交线跨中
+        ("vertices", {"at": [(0.0, 209.0, 3000.0), (100.0, 0.0, 6000.0)]}),
+    ]
+    for kind, q in queries:
+        t0 = time.perf_counter()
+        ids = r.indices(kind, **q)
+        first = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        r.indices(kind, **q)
+        cached = time.perf_counter() - t0
+        line = f"  {kind:<9}{len(ids):>6} 个  首次 {first * 1e6:>9.1f} us  缓存 {cached * 1e6:>6.1f} us"
+        if "box" in q:
+            (x0, y0, z0), (x1, y1, z1) = q["box"]
+            t0 = time.perf_counter()
+            brute = getattr(part, kind).getByBoundingBox(x0, y0, z0, x1, y1, z1, vertices=part.vertices)
+            slow = time.perf_counter() - t0
+            assert [e.index for e in brute] == list(ids)
+            line += f"  暴力 {slow * 1e3:>7.1f} ms"
+        print(line)
+    print(f"掩码示例: {r.mask('edges', at=(0.0, 209.0, 3000.0))}")
+    assert mask_to_indices(indices_to_mask([0, 4, 70, 71] + list(range(96, 200)))) == [0, 4, 70, 71] + list(range(96, 200))
+    assert indices_to_mask([0, 4]) == "[#11 ]"
+    print(r.stats())
@@ -0,0 +1,68 @@
+import json
+import os
+
+import pytest
+
+from batch_builder import STUB_COMMAND, build, full_factorial, resources, run_manifest, schedule
+
+"""
+batch_builder：设计矩阵、资源估计、调度，以及用 fake_solver.py 离线执行清单
+"""
+
+
+def test_full_factorial():
+    rows = full_factorial(mesh_size=[30.0, 15.0], load=[-1000.0, -2000.0, -3000.0])
+    assert len(rows) == 6
+    assert rows[0] == {"mesh_size": 30.0, "load": -1000.0}
+
+
+def test_resources_scale_with_model():
+    small = resources(1000, cores=8, memory=32000)
+    large = resources(400000, cores=8, memory=32000)
+    assert small[0] == 1
+    assert large[0] > small[0] and large[0] & (large[0] - 1) == 0
+    assert large[1] > small[1]
+    assert resources(10**7, cores=8, memory=4000)[1] == 4000
+
+
+def test_schedule_respects_limits():
+    jobs = [{"name": f"J{i}", "cpus": c, "memory": 1000, "cost": cost}
+            for i, (c, cost) in enumerate([(4, 3.0), (2, 2.0), (2, 2.0), (1, 1.0), (4, 1.0)])]
+    makespan = schedule(jobs, cores=4, memory=8000)
+    assert makespan == max(j["end"] for j in jobs)
+    # 任意时刻正在运行的作业 cpus 之和不超过 4
+    for t in sorted({j["start"] for j in jobs}):
+        assert sum(j["cpus"] for j in jobs if j["start"] <= t < j["end"]) <= 4
+
+
+@pytest.fixture
+def manifest(tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_SOLVER_SECONDS", "0.05")
+    designs = full_factorial(mesh_size=[120.0], load=[-1000.0, -2000.0, -3000.0])
+    return build(designs, str(tmp_path), cores=2, memory=4000, command=STUB_COMMAND)
+
+
+def test_run_manifest_with_stub(tmp_path, manifest, monkeypatch):
+    monkeypatch.setenv("FAKE_SOLVER_FAIL", manifest["jobs"][1]["name"])
+    status = run_manifest(str(tmp_path), poll=0.01)
+    assert set(status) == {j["name"] for j in manifest["jobs"]}
+    codes = {name: s["returncode"] for name, s in status.items()}
+    assert codes.pop(manifest["jobs"][1]["name"]) == 1
+    assert set(codes.values()) == {0}
+    with open(tmp_path / "status.json", encoding="utf-8") as f:
+        assert json.load(f) == status
+    job = manifest["jobs"][0]
+    assert os.path.exists(tmp_path / job["dir"] / f"{job['name']}.odb")
+
+
+def test_run_manifest_missing_solver(tmp_path, manifest):
+    # 第一个作业的命令不存在：记为失败，其余作业照常完成，status.json 照常写出
+    path = tmp_path / "manifest.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["jobs"][0]["command"] = ["no-such-solver-executable", "job=x"]
+    path.write_text(json.dumps(data), encoding="utf-8")
+    status = run_manifest(str(tmp_path), poll=0.01)
+    first = status[data["jobs"][0]["name"]]
+    assert first["returncode"] is None and first["error"]
+    assert all(s["returncode"] == 0 for name, s in status.items() if name != data["jobs"][0]["name"])
+    assert json.loads((tmp_path / "status.json").read_text(encoding="utf-8")) == status
@@ -0,0 +1,71 @@
+import json
+
+import numpy as np
+import pytest
+
+from batch_builder import STUB_COMMAND
+from convergence import ConvergenceStudy, read_node_output
+from dat_reader import write_synthetic
+
+"""
+convergence：用 fake_solver.py 和模拟的 reader 离线跑网格收敛流程
+"""
+
+
+def mock_reader(folder, job, model):
+    # 挠度随网格尺寸按 h² 收敛到 -5.0
+    return -5.0 * (1 - 0.8 * (model.mesh_size / 300.0) ** 2)
+
+
+@pytest.fixture(autouse=True)
+def fast_solver(monkeypatch):
+    monkeypatch.setenv("FAKE_SOLVER_SECONDS", "0.01")
+    monkeypatch.delenv("FAKE_SOLVER_FAIL", raising=False)
+
+
+def study(out, **kwargs):
+    return ConvergenceStudy(str(out), design={"depth": 1200.0}, command=STUB_COMMAND, reader=mock_reader, **kwargs)
+
+
+def test_converges_and_extrapolates(tmp_path):
+    result = study(tmp_path).run(start=300.0, ratio=0.5, tol=0.01)
+    sizes = [size for size, _, _ in result["levels"]]
+    assert sizes == [300.0, 150.0, 75.0, 37.5, 18.75]
+    assert result["converged"] and result["solved"] == 5
+    assert result["levels"][-1][2] < 0.01 <= result["levels"][-2][2]
+    assert result["order"] == pytest.approx(2.0)
+    assert result["extrapolated"] == pytest.approx(-5.0)
+
+
+def test_records_reused(tmp_path):
+    first = study(tmp_path).run(start=300.0, ratio=0.5, tol=0.1)
+    assert len(first["levels"]) == 4
+    # 调小 tol 再跑：已算过的级别直接复用，只求解新增的级别
+    result = study(tmp_path).run(start=300.0, ratio=0.5, tol=0.01)
+    assert result["solved"] == 1
+    saved = json.loads((tmp_path / "convergence.json").read_text(encoding="utf-8"))
+    assert len(saved["levels"]) == 5
+    # 设计参数变化后旧记录作废
+    other = ConvergenceStudy(str(tmp_path), design={"depth": 600.0}, command=STUB_COMMAND, reader=mock_reader)
+    assert other.records == {}
+
+
+def test_max_levels_and_min_size(tmp_path):
+    result = study(tmp_path).run(start=300.0, ratio=0.5, tol=1e-9, min_size=100.0)
+    assert [size for size, _, _ in result["levels"]] == [300.0, 150.0]
+    assert not result["converged"]
+
+
+def test_failed_job_raises(tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_SOLVER_FAIL", "mesh-300")
+    with pytest.raises(RuntimeError, match="mesh-300"):
+        study(tmp_path).run(start=300.0)
+
+
+def test_read_node_output(tmp_path):
+    path = tmp_path / "Job-1.dat"
+    written = write_synthetic(str(path), n_nodes=50, n_elements=10, steps=2, increments=2)
+    assert read_node_output(str(path), 7, "U2") == pytest.approx(written[(2, 2)]["U"][6, 1], rel=1e-6)
+    assert read_node_output(str(path), 7, "RF1") == pytest.approx(written[(2, 2)]["RF"][6, 0], rel=1e-6)
+    assert read_node_output(str(path), 999, "U2") is None
+    assert np.isfinite(read_node_output(str(path), 50, "UR3"))
@@ -0,0 +1,118 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from dat_reader import DatReader, build_index, write_synthetic
+
+"""
+dat_reader：合成 .dat 的读回、索引文件的复用与重建、分块读取、带脚注标记的数据行
+"""
+
+FOOTNOTES = """
+                              S T E P       1     S T A T I C   A N A L Y S I S
+
+ INCREMENT     1 SUMMARY
+
+ THE FOLLOWING TABLE IS PRINTED FOR NODES BELONGING TO NODE SET LOAD
+
+       NODE FOOT-  U1             U2
+            NOTE
+
+         1       1.000000E+00   2.000000E+00
+         2  a    3.000000E+00   4.000000E+00
+         3       5.000000E+00   6.000000E+00
+         4  b    7.000000E+00
+
+ MAXIMUM         7.000000E+00   6.000000E+00
+"""
+
+
+@pytest.fixture
+def synthetic(tmp_path):
+    path = tmp_path / "Job-1.dat"
+    written = write_synthetic(str(path), n_nodes=300, n_elements=40, steps=2, increments=2)
+    return str(path), written
+
+
+def test_index(synthetic):
+    path, _ = synthetic
+    reader = DatReader(path)
+    # 每个增量步：U 表、RF 表、S 表
+    assert len(reader.tables) == 2 * 2 * 3
+    assert [t["kind"] for t in reader.tables[:3]] == ["node", "node", "element"]
+    s = reader.find(kind="element", step=2, increment=1)[0]
+    assert (s["set"], s["element_type"]) == ("ASSEMBLY_PART-1-1", "S4R")
+    assert s["keys"] == ["element", "pt", "sec"] and s["columns"] == ["S11", "S22", "S12"]
+    assert len(reader.find(column="RF2")) == 4
+    assert len(reader.find(set="assembly_load-1", step=1)) == 4
+
+
+def test_read_matches_written(synthetic):
+    path, written = synthetic
+    reader = DatReader(path)
+    (table,) = reader.find(column="U2", step=2, increment=2)
+    u = reader.read(table)
+    assert np.array_equal(u["node"], np.arange(1, 301))
+    np.testing.assert_allclose(np.column_stack([u[c] for c in table["columns"]]), written[(2, 2)]["U"], rtol=1e-6)
+    (table,) = reader.find(column="RF1", step=1, increment=1)
+    np.testing.assert_allclose(reader.read(table)["RF1"], written[(1, 1)]["RF"][:, 0], rtol=1e-6)
+
+
+def test_iter_chunks(synthetic):
+    path, written = synthetic
+    reader = DatReader(path)
+    (table,) = reader.find(kind="element", step=1, increment=2)
+    # 小块读取：块边界落在行中间时不丢行
+    chunks = list(reader.iter_chunks(table, rows=100, block=1000))
+    assert [c.size for c in chunks] == [100, 100, 100, 20]
+    s = np.concatenate(chunks)
+    np.testing.assert_allclose(s["S12"], written[(1, 2)]["S"][:, 2], rtol=1e-6)
+    assert np.array_equal(s[:8]["pt"], [1, 1, 2, 2, 3, 3, 4, 4])
+
+
+def test_last_value(synthetic):
+    path, written = synthetic
+    reader = DatReader(path)
+    assert reader.last_value(150, "U2") == pytest.approx(written[(2, 2)]["U"][149, 1], rel=1e-6)
+    assert reader.last_value(3, "S11", kind="element") == pytest.approx(written[(2, 2)]["S"][23, 0], rel=1e-6)
+    assert reader.last_value(999, "U2") is None
+
+
+def test_index_file_reused_and_rebuilt(synthetic):
+    path, _ = synthetic
+    tables = DatReader(path).tables
+    with open(f"{path}.idx.json", encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved["tables"] == tables
+    # 索引文件与文件戳一致时直接使用：改掉索引内容可以看出没有重新扫描
+    saved["tables"] = tables[:1]
+    with open(f"{path}.idx.json", "w", encoding="utf-8") as f:
+        json.dump(saved, f)
+    assert len(DatReader(path).tables) == 1
+    # 文件变化后重建
+    write_synthetic(path, n_nodes=10, n_elements=2, steps=1, increments=1)
+    assert len(DatReader(path).tables) == 3
+    assert DatReader(path, use_index_file=False).tables == build_index(path)
+
+
+def test_footnote_rows(tmp_path):
+    path = tmp_path / "notes.dat"
+    path.write_text(FOOTNOTES, encoding="ascii")
+    reader = DatReader(str(path), use_index_file=False)
+    (table,) = reader.find(kind="node", set="LOAD")
+    u = reader.read(table)
+    # 脚注标记被跳过；缺值为 NaN
+    assert np.array_equal(u["node"], [1, 2, 3, 4])
+    np.testing.assert_array_equal(u["U1"], [1.0, 3.0, 5.0, 7.0])
+    np.testing.assert_array_equal(u["U2"][:3], [2.0, 4.0, 6.0])
+    assert np.isnan(u["U2"][3])
+    assert reader.last_value(2, "U2") == 4.0
+    assert not os.path.exists(f"{path}.idx.json")
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.dat"
+    path.write_bytes(b"")
+    assert DatReader(str(path), use_index_file=False).tables == []
@@ -0,0 +1,65 @@
+import math
+
+import numpy as np
+import pytest
+
+from inp_writer import CHUNK, PLATES, SECTIONS, ShellExtrudeModel, check, iter_keywords, read_inp
+
+"""
+inp_writer：写出的 .inp 读回后与模型一致（运行：python -m pytest abaqus/scripts）
+"""
+
+
+@pytest.fixture
+def small(tmp_path):
+    model = ShellExtrudeModel(depth=600.0, mesh_size=30.0)
+    path = tmp_path / "Job-1.inp"
+    n_nodes, n_elements = model.write(str(path))
+    return model, path, n_nodes, n_elements
+
+
+def test_counts_and_check(small):
+    model, path, n_nodes, n_elements = small
+    assert (n_nodes, n_elements) == (model.n_nodes, model.n_elements)
+    data = read_inp(str(path))
+    assert check(model, data) == []
+    assert data["step"].get("nlgeom", "").upper() == "YES"
+
+
+def test_element_area_matches_geometry(small):
+    model, path, _, _ = small
+    data = read_inp(str(path))
+    elems = data["elements"]["S4R"]
+    xyz = data["coords"][elems[:, 1:] - 1]
+    # 每个单元都是落在某块板件平面内的矩形，边长不超过网格尺寸
+    edges = np.linalg.norm(np.diff(xyz[:, [0, 1, 2, 3, 0]], axis=1), axis=2)
+    assert edges.max() <= model.mesh_size + 1e-9
+    area = 0.5 * np.linalg.norm(np.cross(xyz[:, 2] - xyz[:, 0], xyz[:, 3] - xyz[:, 1]), axis=1).sum()
+    expected = sum(math.dist(p0, p1) for p0, p1 in PLATES.values()) * model.depth
+    assert math.isclose(area, expected, rel_tol=1e-12)
+
+
+def test_sections_and_loads(tmp_path):
+    sections = {name: (t + 1.0, plates) for name, (t, plates) in SECTIONS.items()}
+    model = ShellExtrudeModel(sections=sections, depth=300.0, mesh_size=50.0, load=-2500.0)
+    path = tmp_path / "Job-2.inp"
+    model.write(str(path))
+    data = read_inp(str(path))
+    assert sorted(t for _, _, t in data["sections"]) == sorted(t for t, _ in sections.values())
+    assert any(float(row[-1]) == -2500.0 for row in data["cload"])
+    # 截面 elset 由板件 elset 组成，合起来覆盖全部单元且互不重叠
+    elsets = data["elsets"]
+    ids = np.concatenate([np.asarray(elsets[plate], dtype=int)
+                          for elset, _, _ in data["sections"] for plate in elsets[elset]])
+    assert np.array_equal(np.sort(ids), np.arange(1, model.n_elements + 1))
+
+
+def test_streamed_in_chunks(tmp_path):
+    # 节点数超过 CHUNK 时分块写盘，读回的编号仍然连续
+    model = ShellExtrudeModel(depth=6000.0, mesh_size=2.0)
+    assert model.n_nodes > CHUNK
+    path = tmp_path / "big.inp"
+    model.write(str(path))
+    ids = np.concatenate([np.loadtxt(lines, delimiter=",", usecols=0, dtype=np.int64, ndmin=1)
+                          for keyword, _, lines in iter_keywords(str(path)) if keyword == "node"])
+    assert np.array_equal(ids, np.arange(1, model.n_nodes + 1))
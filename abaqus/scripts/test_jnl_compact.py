@@ -0,0 +1,162 @@
+import os
+
+import pytest
+
+from jnl_compact import JournalCompactor
+
+"""
+jnl_compact：示例日志的精简结果，以及用小段合成日志逐条检查删除规则
+"""
+
+JOURNAL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "models", "first", "testPython.jnl")
+
+MODEL = "mdb.models['Model-1']"
+SKETCH = f"{MODEL}.sketches['__profile__']"
+PART = f"{MODEL}.parts['Part-1']"
+INSTANCE = f"{MODEL}.rootAssembly.instances['Part-1-1']"
+
+HEADER = f"""\
+from part import *
+{MODEL}.ConstrainedSketch(name='__profile__', sheetSize=200.0)
+{SKETCH}.Line(point1=(0.0, 0.0), point2=(100.0, 0.0))
+{SKETCH}.Line(point1=(0.0, 0.0), point2=(0.0, 50.0))
+{MODEL}.Part(dimensionality=THREE_D, name='Part-1', type=DEFORMABLE_BODY)
+{PART}.BaseShellExtrude(depth=500.0, sketch={SKETCH})
+"""
+
+
+def compact(text):
+    compactor = JournalCompactor(text)
+    report = compactor.compact()
+    return compactor, report
+
+
+def alive(compactor):
+    return [s.text for s in compactor.statements if s.alive]
+
+
+def test_sample_journal():
+    compactor, report = compact(JournalCompactor.from_file(JOURNAL).source)
+    assert (report["statements_before"], report["statements_after"]) == (281, 43)
+    assert report["removed"] == {"job message": 212, "duplicate import": 13, "redundant constraint": 6,
+                                 "deleted object": 4, "deleted mesh": 2, "superseded seed": 1}
+    script = compactor.script()
+    # 第一次定义的 Material-1 被删掉后重建：只留重建的那一次
+    assert script.count("Material(name='Material-1')") == 1
+    assert "size=300.0" not in script and "size=30.0" in script
+    # 截面周长 589 × 拉伸 6000，网格尺寸 300 与 30
+    assert report["mesh_removed"] == pytest.approx(589 * 6000 / 300**2)
+    assert report["mesh_kept"] == pytest.approx(589 * 6000 / 30**2)
+    assert report["mesh_unknown"] == 0
+    compile(script, JOURNAL, "exec")
+
+
+def test_deleted_object_with_children():
+    compactor, report = compact(HEADER + f"""\
+{MODEL}.Material(name='Steel')
+{MODEL}.materials['Steel'].Elastic(table=((210000.0, 0.3), ))
+del {MODEL}.materials['Steel']
+""")
+    assert report["removed"] == {"deleted object": 3}
+    assert not any("Steel" in t for t in alive(compactor))
+
+
+def test_delete_blocked_by_reference():
+    # 删除之前有截面按名称引用了该材料：三条语句都要保留
+    compactor, report = compact(HEADER + f"""\
+{MODEL}.Material(name='Steel')
+{MODEL}.HomogeneousShellSection(material='Steel', name='Section-1', thickness=8.0)
+del {MODEL}.materials['Steel']
+""")
+    assert "deleted object" not in report["removed"]
+    assert sum("Steel" in t for t in alive(compactor)) == 3
+
+
+def test_feature_naming():
+    # 第二个基准面自动命名为 Datum plane-2，创建后被删掉
+    compactor, report = compact(HEADER + f"""\
+{PART}.DatumPlaneByPrincipalPlane(offset=100.0, principalPlane=XYPLANE)
+{PART}.DatumPlaneByPrincipalPlane(offset=200.0, principalPlane=XYPLANE)
+del {PART}.features['Datum plane-2']
+""")
+    assert report["removed"] == {"deleted object": 2}
+    texts = alive(compactor)
+    assert any("offset=100.0" in t for t in texts) and not any("offset=200.0" in t for t in texts)
+
+
+def test_feature_blocked_by_later_part_operation():
+    # 期间零件上有其他操作（分区可能依赖该基准面）：不删
+    compactor, report = compact(HEADER + f"""\
+{PART}.DatumPlaneByPrincipalPlane(offset=100.0, principalPlane=XYPLANE)
+{PART}.PartitionFaceByDatumPlane(datumPlane={PART}.datums[2], faces={PART}.faces)
+del {PART}.features['Datum plane-1']
+""")
+    assert "deleted object" not in report["removed"]
+    # 分区是 Partition face-1，不是 Datum plane-1
+    assert compactor.statements[-2].creates[-1] == "Partition face-1"
+
+
+def test_failed_statement_skipped_in_feature_count():
+    compactor, report = compact(HEADER + f"""\
+{PART}.DatumPlaneByPrincipalPlane(offset=-100.0, principalPlane=XYPLANE)
+#* Feature creation failed.
+{PART}.DatumPlaneByPrincipalPlane(offset=100.0, principalPlane=XYPLANE)
+del {PART}.features['Datum plane-1']
+""")
+    assert report["removed"] == {"failed": 1, "deleted object": 2}
+    assert not any("DatumPlane" in t for t in alive(compactor))
+
+
+def test_meshes_and_seeds():
+    compactor, report = compact(HEADER + f"""\
+{MODEL}.rootAssembly.Instance(dependent=OFF, name='Part-1-1', part={PART})
+{MODEL}.rootAssembly.seedPartInstance(regions=({INSTANCE}, ), size=50.0)
+{MODEL}.rootAssembly.seedPartInstance(regions=({INSTANCE}, ), size=25.0)
+{MODEL}.rootAssembly.generateMesh(regions=({INSTANCE}, ))
+{MODEL}.rootAssembly.deleteMesh(regions=({INSTANCE}, ))
+{MODEL}.rootAssembly.seedPartInstance(regions=({INSTANCE}, ), size=10.0)
+{MODEL}.rootAssembly.generateMesh(regions=({INSTANCE}, ))
+""")
+    assert report["removed"] == {"deleted mesh": 2, "superseded seed": 2}
+    texts = alive(compactor)
+    assert [t for t in texts if "seed" in t] == [f"{MODEL}.rootAssembly.seedPartInstance(regions=({INSTANCE}, ), size=10.0)"]
+    # 面积 (100 + 50) × 500：删掉的划分按 25，保留的按 10
+    assert report["mesh_removed"] == pytest.approx(150 * 500 / 25**2)
+    assert report["mesh_kept"] == pytest.approx(150 * 500 / 10**2)
+
+
+def test_mesh_unknown_without_geometry():
+    compactor, report = compact(f"""\
+{MODEL}.rootAssembly.seedPartInstance(regions=({INSTANCE}, ), size=10.0)
+{MODEL}.rootAssembly.generateMesh(regions=({INSTANCE}, ))
+""")
+    assert report["mesh_unknown"] == 1 and report["mesh_kept"] == 0
+
+
+def test_redundant_constraints():
+    compactor, report = compact(f"""\
+{MODEL}.ConstrainedSketch(name='__profile__', sheetSize=200.0)
+{SKETCH}.Line(point1=(0.0, 0.0), point2=(100.0, 0.0))
+{SKETCH}.HorizontalConstraint(addUndoState=False, entity={SKETCH}.geometry[2])
+{SKETCH}.Line(point1=(0.0, 0.0), point2=(30.0, 40.0))
+{SKETCH}.HorizontalConstraint(addUndoState=False, entity={SKETCH}.geometry[3])
+{SKETCH}.CircleByCenterPerimeter(center=(0.0, 0.0), point1=(5.0, 0.0))
+{SKETCH}.Line(point1=(0.0, 10.0), point2=(50.0, 10.0))
+{SKETCH}.ParallelConstraint(entity1={SKETCH}.geometry[2], entity2={SKETCH}.geometry[5])
+{SKETCH}.Line(point1=(0.0, 0.0), point2=(0.0, 10.0))
+{SKETCH}.PerpendicularConstraint(entity1={SKETCH}.geometry[2], entity2={SKETCH}.geometry[6])
+{SKETCH}.VerticalConstraint(entity={SKETCH}.geometry[3])
+""")
+    assert report["removed"] == {"redundant constraint": 3}
+    kept = [t for t in alive(compactor) if "Constraint(" in t]
+    # 斜线上的水平 / 竖直约束会改变几何，要保留
+    assert len(kept) == 2 and all("geometry[3]" in t for t in kept)
+
+
+def test_write_round_trip(tmp_path):
+    compactor = JournalCompactor.from_file(JOURNAL)
+    compactor.compact()
+    out = tmp_path / "replay.py"
+    compactor.write(str(out))
+    again = JournalCompactor.from_file(str(out))
+    assert again.compact()["statements_after"] == len(again.statements) == 43
@@ -0,0 +1,115 @@
+import asyncio
+import json
+
+import pytest
+
+import job_runner
+from batch_builder import STUB_COMMAND, build, full_factorial
+from job_runner import JobRunner, StaTail, read_wallclock, run_manifest_async
+
+"""
+job_runner：.sta 增量解析，以及用 fake_solver.py 离线跑完成 / 失败 / 超时 / 取消 / 无法启动
+"""
+
+ROW = "  1 {:5d}   1     0     2     2  {:.4e} {:.4e} 1.0000e-01\n"
+
+
+@pytest.fixture
+def manifest(tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_SOLVER_SECONDS", "0.2")
+    monkeypatch.delenv("FAKE_SOLVER_FAIL", raising=False)
+    designs = full_factorial(mesh_size=[120.0], load=[-1000.0, -2000.0, -3000.0])
+    return build(designs, str(tmp_path), cores=2, memory=4000, command=STUB_COMMAND)
+
+
+def test_sta_tail_partial_lines(tmp_path):
+    path = tmp_path / "Job-1.sta"
+    tail = StaTail(str(path))
+    assert tail.poll() == 0
+    row = ROW.format(1, 0.1, 0.1)
+    # 半行不解析，补齐后才计入
+    path.write_text(" STEP  INC ATT\n" + row[:20], encoding="ascii")
+    assert tail.poll() == 0
+    with open(path, "a", encoding="ascii") as f:
+        f.write(row[20:] + "  1     2   1U    0     2     2  1.0000e-01 1.0000e-01 1.0000e-01\n"
+                + ROW.format(2, 0.15, 0.15))
+    assert tail.poll() == 2
+    assert (tail.increment, tail.total_time, tail.cutbacks) == (2, 0.15, 1)
+    with open(path, "a", encoding="ascii") as f:
+        f.write(f" {job_runner.STA_DONE}\n")
+    assert tail.poll() == 0 and tail.state()["outcome"] == "completed"
+
+
+def test_run_manifest_async(tmp_path, manifest, monkeypatch):
+    jobs = manifest["jobs"]
+    monkeypatch.setenv("FAKE_SOLVER_FAIL", jobs[1]["name"])
+    progress = []
+    status = run_manifest_async(str(tmp_path), poll=0.02, on_finish=read_wallclock,
+                                on_progress=lambda job, state: progress.append((job["name"], state["progress"])))
+    assert json.loads((tmp_path / "status.json").read_text(encoding="utf-8")) == status
+    failed = status.pop(jobs[1]["name"])
+    assert failed["state"] == "failed" and failed["returncode"] == 1 and failed["outcome"] == "failed"
+    for r in status.values():
+        assert r["state"] == "completed" and r["returncode"] == 0
+        assert r["post"] == {"wallclock": pytest.approx(0.2)}
+    assert max(p for _, p in progress) == pytest.approx(1.0)
+
+
+def test_timeout(tmp_path, manifest, monkeypatch):
+    monkeypatch.setenv("FAKE_SOLVER_SECONDS", "30")
+    job = dict(manifest["jobs"][0], timeout=0.3)
+    result = asyncio.run(JobRunner(cores=2, poll=0.02).run([job], str(tmp_path)))[job["name"]]
+    assert result["state"] == "timeout"
+    assert result["returncode"] is not None and result["returncode"] != 0
+
+
+def test_capacity_limit(tmp_path, manifest):
+    # 每个作业占满两个核：同一时刻只能有一个在跑，进度回调不会交错
+    jobs = [dict(job, cpus=2) for job in manifest["jobs"]]
+    order = []
+    runner = JobRunner(cores=2, poll=0.02, on_progress=lambda job, state: order.append(job["name"]))
+    status = asyncio.run(runner.run(jobs, str(tmp_path)))
+    assert all(r["state"] == "completed" for r in status.values())
+    runs = [name for i, name in enumerate(order) if i == 0 or order[i - 1] != name]
+    assert sorted(runs) == sorted(job["name"] for job in jobs)
+
+
+def test_cancel_stops_solver(tmp_path, manifest, monkeypatch):
+    monkeypatch.setenv("FAKE_SOLVER_SECONDS", "30")
+    spawn = asyncio.create_subprocess_exec
+    procs = []
+
+    async def recording(*args, **kwargs):
+        procs.append(await spawn(*args, **kwargs))
+        return procs[-1]
+
+    monkeypatch.setattr(job_runner.asyncio, "create_subprocess_exec", recording)
+    job = manifest["jobs"][0]
+    runner = JobRunner(cores=2, poll=0.02)
+
+    async def main():
+        runner._cond = asyncio.Condition()
+        task = asyncio.create_task(runner.run_job(job, str(tmp_path / job["dir"])))
+        while not procs:
+            await asyncio.sleep(0.02)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert procs[0].returncode is not None
+    assert runner.free_cpu == 2
+
+
+def test_spawn_error_in_status(tmp_path, manifest):
+    path = tmp_path / "manifest.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["jobs"][0]["command"] = ["no-such-solver-executable", "job=x"]
+    path.write_text(json.dumps(data), encoding="utf-8")
+    status = run_manifest_async(str(tmp_path), poll=0.02)
+    first = status[data["jobs"][0]["name"]]
+    assert first["state"] == "failed" and first["returncode"] is None
+    assert "no-such-solver-executable" in first["error"]
+    saved = json.loads((tmp_path / "status.json").read_text(encoding="utf-8"))
+    assert saved[data["jobs"][0]["name"]]["error"] == first["error"]
+    assert all(r["state"] == "completed" for name, r in status.items() if name != data["jobs"][0]["name"])
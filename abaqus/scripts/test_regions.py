@@ -0,0 +1,85 @@
+import pytest
+
+from regions import LocalPart, RegionResolver, indices_to_mask, mask_to_indices
+
+"""
+regions：掩码编解码、框选 / 点选与暴力实现一致、缓存与失效
+"""
+
+PROFILE = [((0, 0), (100, 0)), ((0, 0), (-100, 0)), ((0, 0), (0, 209)),
+           ((90, 209), (0, 209)), ((0, 209), (-90, 209))]
+
+
+@pytest.fixture
+def part():
+    return LocalPart(PROFILE, 6000.0, n_z=200)
+
+
+def brute(part, kind, box):
+    (x0, y0, z0), (x1, y1, z1) = box
+    return tuple(e.index for e in getattr(part, kind).getByBoundingBox(x0, y0, z0, x1, y1, z1,
+                                                                        vertices=part.vertices))
+
+
+def test_mask_round_trip():
+    ids = [0, 4, 70, 71] + list(range(96, 200))
+    assert mask_to_indices(indices_to_mask(ids)) == ids
+    assert indices_to_mask([0, 4]) == "[#11 ]"
+    assert indices_to_mask([]) == "[ ]"
+    assert indices_to_mask(range(64)) == "[#ffffffff:2 ]"
+
+
+@pytest.mark.parametrize("kind, box", [
+    ("faces", ((-100, -1, 1000), (100, 1, 2000))),
+    ("faces", ((-1, -1, -1), (1, 210, 6001))),
+    ("edges", ((-101, -1, -1), (101, 1, 1))),
+    ("vertices", ((-200, -10, 2990), (200, 300, 3010))),
+])
+def test_box_matches_brute_force(part, kind, box):
+    r = RegionResolver(part)
+    assert r.indices(kind, box=box) == brute(part, kind, box)
+
+
+def test_point_selection(part):
+    r = RegionResolver(part)
+    # 腹板与上翼缘交线上的点：只落在纵向边上，不落在横向边上
+    edges = r.indices("edges", at=(0.0, 209.0, 3000.0 + 15.0))
+    assert len(edges) == 1
+    assert part.edges[edges[0]].pointOn[0][:2] == (0, 209)
+    faces = r.indices("faces", at=(0.0, 100.0, 10.0))
+    assert len(faces) == 1 and part.faces[faces[0]].pointOn[0][0] == 0.0
+    assert r.indices("vertices", at=[(0.0, 0.0, 0.0), (100.0, 0.0, 6000.0)]) == (0, len(part.vertices) - 5)
+
+
+def test_cache_and_sequences(part):
+    r = RegionResolver(part)
+    box = ((-100, -1, 1000), (100, 1, 2000))
+    first = r.indices("faces", box=box)
+    assert r.indices("faces", box=box) == first
+    assert r.stats() == {"hits": 1, "misses": 1, "cached": 1}
+    seq = r.faces(box=box)
+    assert [e.index for e in seq] == list(first)
+    with pytest.raises(LookupError):
+        r.faces(box=((1e5, 1e5, 1e5), (2e5, 2e5, 2e5)))
+    with pytest.raises(ValueError):
+        r.indices("faces")
+
+
+def test_topology_change_rebuilds(part):
+    r = RegionResolver(part)
+    box = ((-1, -1, -1), (1, 210, 6001))
+    assert len(r.indices("faces", box=box)) == 200
+    finer = LocalPart(PROFILE, 6000.0, n_z=400)
+    part.vertices, part.edges, part.faces = finer.vertices, finer.edges, finer.faces
+    assert len(r.indices("faces", box=box)) == 400
+
+
+def test_dimension_change_rebuilds(part):
+    # 拓扑不变、只改拉伸长度：实体数相同，但坐标变了，旧的缓存和索引不能再用
+    r = RegionResolver(part)
+    box = ((-1, -1, -1), (1, 210, 3001))
+    assert len(r.indices("faces", box=box)) == 100
+    shorter = LocalPart(PROFILE, 3000.0, n_z=200)
+    part.vertices, part.edges, part.faces = shorter.vertices, shorter.edges, shorter.faces
+    assert r.indices("faces", box=box) == brute(part, "faces", box)
+    assert len(r.indices("faces", box=box)) == 200
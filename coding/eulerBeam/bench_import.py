@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+
+"""
+冷启动耗时：在新进程中 import solve 并求前 3 阶特征根，分别走缓存的数值核和符号推导（磁盘缓存已预热），
+另给出单独 import sympy 的耗时作为参照，并检查数值核路径是否导入了 SymPy。
+"""
+
+SCRIPTS = {
+    "kernel": (
+        "import solve, sys\n"
+        "solve.BeamModel(PARAMS).find_roots(n=3)\n"
+    ),
+    "symbolic (warm cache)": (
+        "import solve, sys\n"
+        "solve.BeamModel(PARAMS, kernel=None).find_roots(n=3)\n"
+    ),
+    "import sympy": "import sympy, sys\n",
+}
+
+PARAMS = {"E": 2.06e11, "D": 0.114, "d": 0.109, "L": 3.3, "M": 15.4, "rho": 7850}
+
+TEMPLATE = (
+    "import time\n"
+    "t0 = time.perf_counter()\n"
+    "PARAMS = {params!r}\n"
+    "{body}"
+    "print(time.perf_counter() - t0, 'sympy' in sys.modules)\n"
+)
+
+
+def run(body, repeat):
+    here = os.path.dirname(os.path.abspath(__file__))
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", TEMPLATE.format(params=PARAMS, body=body)],
+            cwd=here, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        times.append(float(out[0]))
+    return min(times), out[1] == "True"
+
+
+# ------------------ 主程序 ------------------
+if __name__ == "__main__":
+    # 先各跑一次，生成数值核并预热推导缓存
+    for body in SCRIPTS.values():
+        run(body, 1)
+    print(f"  {'path':<24}{'min (ms)':>12}{'sympy':>8}")
+    for name, body in SCRIPTS.items():
+        t, loaded = run(body, 5)
+        print(f"  {name:<24}{t * 1e3:>12.1f}{str(loaded):>8}")
@@ -0,0 +1,64 @@
+import time
+import numpy as np
+from mpmath import mp, findroot
+from sympy import lambdify
+from solve import BeamModel
+
+"""
+求根后端对比：原始逐区间二分 (scalar) 与 roots.refine 的向量化后端。
+精度以 mpmath 50 位精度的 findroot 结果为参考。
+"""
+
+
+def reference_roots(model, guesses):
+    """用高精度 findroot 计算参考根"""
+    mp.dps = 50
+    f = lambdify(model.beam.a, model.det_expr, "mpmath")
+    return [float(findroot(f, mp.mpf(float(g)))) for g in guesses]
+
+
+def bench(model, n, method, repeat=5, **kwargs):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        roots = model.find_roots(n=n, method=method, **kwargs)
+        best = min(best, time.perf_counter() - t0)
+    return best, np.array(roots)
+
+
+if __name__ == "__main__":
+    params = {
+        "E": 2.06e11,
+        "D": 0.114,
+        "d": 0.109,
+        "L": 3.3,
+        "M": 15.4,
+        "rho": 7850,
+    }
+    # 参考解需要符号表达式，这里走符号推导路径
+    model = BeamModel(params, kernel=None)
+    for n in (3, 10):
+        _, guess = bench(model, n, "illinois", repeat=1)
+        ref = np.array(reference_roots(model, guess))
+        print(f"\n前 {n} 个根:")
+        print(f"  {'method':<10}{'time (ms)':>12}{'max |err|':>14}")
+        for method in ("scalar", "bisect", "illinois", "newton"):
+            t, roots = bench(model, n, method)
+            err = np.max(np.abs(roots - ref))
+            print(f"  {method:<10}{t * 1e3:>12.3f}{err:>14.3e}")
+
+    # 多阶数：均匀网格扫描需要覆盖到第 n 阶根，adaptive 的代价只随阶数增长
+    print("\n扫描方式对比（illinois 加密）:")
+    print(f"  {'n':<6}{'grid (ms)':>12}{'adaptive (ms)':>16}{'max |diff|':>14}")
+    for n in (10, 50, 100):
+        x_max = (n + 1) * np.pi
+        t_grid, r_grid = bench(model, n, "illinois", x_max=x_max)
+        t_adapt, r_adapt = bench(model, n, "illinois", x_max=None, scan="adaptive")
+        diff = np.max(np.abs(r_grid - r_adapt))
+        print(f"  {n:<6}{t_grid * 1e3:>12.3f}{t_adapt * 1e3:>16.3f}{diff:>14.3e}")
+
+    # 指数缩放前后的根应一致
+    plain = BeamModel(params, kernel=None, scaled=False)
+    r_plain = np.array(plain.find_roots(n=5, method="scalar"))
+    r_scaled = np.array(model.find_roots(n=5, method="scalar"))
+    print(f"\ndet_scaled 与 det_simple 前5阶根最大差值: {np.max(np.abs(r_plain - r_scaled)):.3e}")
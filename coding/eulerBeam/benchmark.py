@@ -0,0 +1,251 @@
+import argparse
+import csv
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import sympy
+from sympy import lambdify
+from sympy.core.cache import clear_cache
+
+from formula import EulerBeam
+from solve import BeamModel
+from sweep import BeamSweep
+from transfer import TransferBeam
+from continuation import ContinuationSweep
+from roots import sign_changes, refine
+
+"""
+eulerBeam 流程分阶段基准测试：符号推导各步骤（_Qx ~ _scale，full / fast 两种化简）、lambdify、
+find_roots 的网格扫描、二分/向量化加密、批量扫描、沿参数网格的根延拓，以及多段梁传递矩阵求根。
+每个阶段分别记录耗时（多次取最小值和中位数）与 tracemalloc 峰值内存，结果写成 JSON / CSV，
+可用 --compare 与另一次提交的结果对比。只使用 solve.py 中的示例参数和合成的参数扫描，可离线运行。
+
+用法：
+    python benchmark.py --out bench/result.json
+    python benchmark.py --quick --compare bench/old.json
+"""
+
+# 与 solve.py 主程序中的示例参数相同
+BASE_PARAMS = {
+    "E": 2.06e11,
+    "D": 0.114,
+    "d": 0.109,
+    "L": 3.3,
+    "M": 15.4,
+    "rho": 7850,
+}
+
+DERIVE_STAGES = ["_Qx", "_boundary_conditions", "_solve", "_c_matrix", "_replace", "_simplify", "_scale"]
+
+
+def measure(func, repeat, setup=None):
+    """返回 (最小耗时, 中位耗时, 峰值内存 KiB)；计时与内存分开跑，避免 tracemalloc 影响计时"""
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    if setup:
+        setup()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), statistics.median(times), peak / 1024
+
+
+def bench_derivation(repeat):
+    """符号推导各步骤；每次计时前清空 SymPy 内部缓存，得到冷启动耗时"""
+    rows = []
+    for mode in ("full", "fast"):
+        beam = EulerBeam(simplify_mode=mode)
+        # 先完整推导一次，保证各步骤单独重跑时依赖的属性都已存在
+        beam.det_scaled
+        beam.det
+        for stage in DERIVE_STAGES:
+            t_min, t_med, peak = measure(getattr(beam, stage), repeat, setup=clear_cache)
+            rows.append({
+                "stage": f"derive{stage}", "case": f"default_bc_{mode}",
+                "time_min": t_min, "time_median": t_med, "peak_kib": peak,
+            })
+    b = beam
+    t_min, t_med, peak = measure(lambda: lambdify((b.a, b.m, b.M, b.L), b.det_scaled, "numpy"), repeat)
+    rows.append({"stage": "lambdify", "case": "det_scaled", "time_min": t_min, "time_median": t_med, "peak_kib": peak})
+    return rows
+
+
+def bench_roots(repeat, modes, masses):
+    """网格扫描与加密：对每组参数和阶数分别计时"""
+    rows = []
+    for M in masses:
+        model = BeamModel(dict(BASE_PARAMS, M=M))
+        for n in modes:
+            case = f"M={M:g}"
+            x_max = (n + 1) * np.pi
+            xs = np.arange(1e-6, x_max, 1e-3)
+            vals = model.f(xs)
+            idx = sign_changes(vals)[0][:n]
+            lo, hi = xs[idx], xs[idx + 1]
+            stages = {
+                "scan_grid": lambda: model.f(xs),
+                "refine_scalar_bisection": lambda: [model.bisection(model.f, a, b) for a, b in zip(lo, hi)],
+                "refine_illinois": lambda: refine(model.f, lo, hi, method="illinois"),
+                "find_roots_grid": lambda: model.find_roots(n=n, x_max=x_max),
+                "find_roots_adaptive": lambda: model.find_roots(n=n, x_max=None, scan="adaptive"),
+            }
+            for stage, func in stages.items():
+                t_min, t_med, peak = measure(func, repeat)
+                rows.append({
+                    "stage": stage, "case": case, "n_modes": n, "grid_points": xs.size,
+                    "time_min": t_min, "time_median": t_med, "peak_kib": peak,
+                })
+    return rows
+
+
+def bench_sweep(repeat, sizes, n=3):
+    """合成参数扫描：管径与顶端质量随机组合"""
+    rows = []
+    sweep = BeamSweep()
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        D = rng.uniform(0.089, 0.168, size)
+        params = dict(
+            BASE_PARAMS, D=D, d=D - 0.005,
+            M=rng.uniform(0.0, 30.0, size), L=rng.uniform(2.5, 4.5, size),
+        )
+        t_min, t_med, peak = measure(lambda: sweep.run(params, n=n), repeat)
+        rows.append({
+            "stage": "sweep_run", "case": f"designs={size}", "n_modes": n, "n_designs": size,
+            "time_min": t_min, "time_median": t_med, "peak_kib": peak,
+        })
+    return rows
+
+
+def bench_transfer(repeat, sizes, n=5):
+    """多段梁传递矩阵：等长、逐段变细的桅杆"""
+    rows = []
+    for size in sizes:
+        segments = []
+        for k in range(size):
+            D = 0.168 - 0.06 * k / size
+            segments.append({"L": BASE_PARAMS["L"] / size, "D": D, "d": D - 0.006})
+        model = TransferBeam(BASE_PARAMS, segments)
+        for scan in ("grid", "adaptive"):
+            t_min, t_med, peak = measure(lambda: model.find_roots(n=n, scan=scan), repeat)
+            rows.append({
+                "stage": "transfer_find_roots", "case": f"segments={size},scan={scan}", "n_modes": n,
+                "time_min": t_min, "time_median": t_med, "peak_kib": peak,
+            })
+    return rows
+
+
+def bench_continuation(repeat, sizes, n=5):
+    """顶端质量 × 长度 的方形网格，沿长度方向延拓"""
+    rows = []
+    sweep = ContinuationSweep()
+    for size in sizes:
+        side = int(round(size ** 0.5))
+        params = dict(
+            BASE_PARAMS, M=np.linspace(0.0, 60.0, side)[:, None], L=np.linspace(2.0, 6.0, side)[None, :],
+        )
+        t_min, t_med, peak = measure(lambda: sweep.run(params, n=n), repeat)
+        rows.append({
+            "stage": "continuation_run", "case": f"designs={side * side}", "n_modes": n, "n_designs": side * side,
+            "time_min": t_min, "time_median": t_med, "peak_kib": peak,
+        })
+    return rows
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sympy": sympy.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def write_results(rows, meta, json_path, csv_path):
+    folder = os.path.dirname(json_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": rows}, f, indent=2)
+    fields = ["stage", "case", "n_modes", "n_designs", "grid_points", "time_min", "time_median", "peak_kib"]
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: row.get(k, "") for k in fields})
+
+
+def compare(rows, old_path):
+    """与旧结果按 (stage, case, n_modes) 对齐，打印耗时比值（>1 表示变慢）"""
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    key = lambda r: (r["stage"], r["case"], r.get("n_modes"))
+    old_rows = {key(r): r for r in old["results"]}
+    print(f"\n与 {old_path}（commit {old['meta'].get('commit')}）对比：")
+    print(f"  {'stage':<28}{'case':<16}{'n':>5}{'old (ms)':>12}{'new (ms)':>12}{'ratio':>8}")
+    for r in rows:
+        o = old_rows.get(key(r))
+        if o is None:
+            continue
+        ratio = r["time_min"] / o["time_min"] if o["time_min"] else float("nan")
+        print(f"  {r['stage']:<28}{r['case']:<16}{str(r.get('n_modes', '')):>5}"
+              f"{o['time_min'] * 1e3:>12.3f}{r['time_min'] * 1e3:>12.3f}{ratio:>8.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="eulerBeam 分阶段基准测试")
+    parser.add_argument("--out", default="bench/eulerbeam.json", help="JSON 输出路径（CSV 同名）")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="减少阶数与扫描规模")
+    parser.add_argument("--compare", help="与之前的 JSON 结果对比")
+    args = parser.parse_args(argv)
+
+    modes = [3, 10] if args.quick else [3, 10, 50]
+    masses = [15.4] if args.quick else [0.0, 15.4, 100.0]
+    sizes = [100] if args.quick else [100, 1000, 10000]
+    segments = [20] if args.quick else [5, 20, 50]
+    repeat = 1 if args.quick else args.repeat
+
+    rows = []
+    rows += bench_derivation(max(1, repeat // 2))
+    rows += bench_roots(repeat, modes, masses)
+    rows += bench_sweep(repeat, sizes)
+    rows += bench_continuation(repeat, sizes)
+    rows += bench_transfer(repeat, segments)
+
+    csv_path = os.path.splitext(args.out)[0] + ".csv"
+    write_results(rows, environment(), args.out, csv_path)
+    print(f"  {'stage':<28}{'case':<16}{'n':>5}{'min (ms)':>12}{'peak (KiB)':>12}")
+    for r in rows:
+        print(f"  {r['stage']:<28}{r['case']:<16}{str(r.get('n_modes', '')):>5}"
+              f"{r['time_min'] * 1e3:>12.3f}{r['peak_kib']:>12.1f}")
+    print(f"\n结果已写入：{args.out}, {csv_path}")
+    if args.compare:
+        compare(rows, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+from sympy import Eq
+
+"""
+常用边界条件函数，供 EulerBeam(bc_fixed_func=..., bc_free_func=...) 使用。
+定义为模块级函数，便于 parallel.derive_many 在多进程间传递。
+固定端函数返回 (bc1, bc2)（x=0 处），自由端函数返回 (bc3, bc4)（x=L 处）。
+固定端条件默认用来消去 A、B；消不掉时（如铰支只能确定 B = D = 0）用函数属性 solve_for 指定要消去的两个系数。
+"""
+
+
+# ------------------ x=0 端 ------------------
+def clamped_base(beam):
+    """固支：位移、转角为零（与 EulerBeam 默认相同）"""
+    return Eq(beam.Q.subs(beam.x, 0), 0), Eq(beam.Q1.subs(beam.x, 0), 0)
+
+
+def pinned_base(beam):
+    """铰支：位移、弯矩为零"""
+    return Eq(beam.Q.subs(beam.x, 0), 0), Eq(beam.Q2.subs(beam.x, 0), 0)
+
+
+pinned_base.solve_for = ("B", "D")
+
+
+def sliding_base(beam):
+    """滑动支座：转角、剪力为零"""
+    return Eq(beam.Q1.subs(beam.x, 0), 0), Eq(beam.Q3.subs(beam.x, 0), 0)
+
+
+sliding_base.solve_for = ("A", "C")
+
+
+# ------------------ x=L 端 ------------------
+def free_tip(beam):
+    """自由端：弯矩、剪力为零"""
+    L = beam.L
+    return Eq(beam.Q2.subs(beam.x, L), 0), Eq(beam.Q3.subs(beam.x, L), 0)
+
+
+def tip_mass(beam):
+    """顶端集中质量 M（与 EulerBeam 默认相同）"""
+    L, EI = beam.L, beam.E * beam.I
+    bc3 = Eq(EI * beam.Q3.subs(beam.x, L), -beam.w**2 * beam.Q.subs(beam.x, L) * beam.M)
+    bc4 = Eq(EI * beam.Q2.subs(beam.x, L), 0)
+    return bc3, bc4
+
+
+def tip_mass_inertia(beam):
+    """顶端集中质量 M + 转动惯量 J"""
+    L, EI = beam.L, beam.E * beam.I
+    bc3 = Eq(EI * beam.Q3.subs(beam.x, L), -beam.w**2 * beam.Q.subs(beam.x, L) * beam.M)
+    bc4 = Eq(EI * beam.Q2.subs(beam.x, L), beam.w**2 * beam.Q1.subs(beam.x, L) * beam.J)
+    return bc3, bc4
+
+
+def pinned_tip(beam):
+    """顶端铰支：位移、弯矩为零"""
+    L = beam.L
+    return Eq(beam.Q.subs(beam.x, L), 0), Eq(beam.Q2.subs(beam.x, L), 0)
+
+
+def sliding_tip(beam):
+    """顶端滑动支座：转角、剪力为零"""
+    L = beam.L
+    return Eq(beam.Q1.subs(beam.x, L), 0), Eq(beam.Q3.subs(beam.x, L), 0)
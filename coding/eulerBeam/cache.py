@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+import sympy
+from sympy import srepr, sympify
+from kernels import DEFAULT_CACHE_DIR
+
+"""
+EulerBeam 符号推导结果的磁盘缓存。
+以边界条件函数源码 + SymPy 版本为键（内容寻址），保存 sol、M_c、det、det_simple、det_scaled 的 srepr 文本，
+热启动时直接反序列化，跳过 _solve / _c_matrix / _replace 中的全部符号运算。
+"""
+
+# 推导流程本身改动时递增，使旧缓存全部失效
+CACHE_VERSION = 2
+
+class DerivationCache:
+    def __init__(self, cache_dir=None):
+        self.cache_dir = os.path.abspath(cache_dir or DEFAULT_CACHE_DIR)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # 命中/未命中计数
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(*sources):
+        """由源码文本、SymPy 版本和缓存版本生成内容寻址键"""
+        h = hashlib.sha256()
+        h.update(f"v{CACHE_VERSION}|sympy-{sympy.__version__}".encode("utf-8"))
+        for src in sources:
+            h.update(b"\0")
+            h.update(src.encode("utf-8"))
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """读取缓存，返回 {名称: 表达式} 字典；不存在或损坏时返回 None"""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            data = {name: sympify(text) for name, text in raw["exprs"].items()}
+            data["sol"] = {sympify(k): sympify(v) for k, v in raw["sol"]}
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (ValueError, KeyError, TypeError, SyntaxError):
+            # 缓存文件损坏，删掉后按未命中处理
+            self.invalidate(key)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key, sol, **exprs):
+        """写入缓存（先写临时文件再替换，避免中断时留下半个文件）"""
+        raw = {
+            "sympy": sympy.__version__,
+            "version": CACHE_VERSION,
+            "sol": [[srepr(k), srepr(v)] for k, v in sol.items()],
+            "exprs": {name: srepr(expr) for name, expr in exprs.items()},
+        }
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(raw, f)
+        os.replace(tmp, path)
+
+    def invalidate(self, key=None):
+        """删除指定键的缓存；key 为 None 时清空整个缓存目录"""
+        if key is not None:
+            keys = [key]
+        else:
+            keys = [name[:-5] for name in os.listdir(self.cache_dir) if name.endswith(".json")]
+        for k in keys:
+            try:
+                os.remove(self._path(k))
+            except FileNotFoundError:
+                pass
+        return len(keys)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "dir": self.cache_dir}
@@ -0,0 +1,104 @@
+import os
+import sys
+from sympy import cse, diff
+from sympy.printing.numpy import NumPyPrinter
+
+"""
+把特征方程导出为独立的数值核模块（只依赖 NumPy）。
+先用 sympy.cse 提取公共子表达式（sin/cos/sinh/cosh 只算一次），再打印成 Python 源码；
+compiled=True 时另外用 sympy.utilities.autowrap.ufuncify 在本地编译 C 扩展，
+生成的模块优先加载编译版本，加载失败时退回 NumPy 实现。
+"""
+
+HEADER = '''\
+# 由 EulerBeam.export_kernel 自动生成，请勿手工修改
+# 表达式: {name}
+import numpy
+
+ARGS = {args!r}
+NAME = {name!r}
+'''
+
+COMPILED_LOADER = '''
+
+# 本地编译的 C 版本（ufuncify），加载失败时使用上面的 NumPy 实现
+_COMPILED = {compiled!r}
+
+
+def _load_compiled(module_name, filename, func_name):
+    import importlib.machinery
+    import importlib.util
+    import os
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    loader = importlib.machinery.ExtensionFileLoader(module_name, path)
+    spec = importlib.util.spec_from_file_location(module_name, path, loader=loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    func = getattr(module, func_name)
+
+    # 编译版本只接受同形的一维 float 数组，这里补上广播
+    def wrapper(*args):
+        arrays = numpy.broadcast_arrays(*(numpy.asarray(x, dtype=float) for x in args))
+        out = func(*(numpy.ascontiguousarray(x).ravel() for x in arrays))
+        return out.reshape(arrays[0].shape)[()]
+    return wrapper
+
+
+for _name, (_module_name, _filename, _func_name) in _COMPILED.items():
+    try:
+        globals()[_name] = _load_compiled(_module_name, _filename, _func_name)
+    except (ImportError, OSError):
+        pass
+'''
+
+
+def _function_source(func_name, args, expr):
+    """cse 后打印成一个函数定义"""
+    printer = NumPyPrinter()
+    replacements, (reduced,) = cse(expr)
+    lines = [f"def {func_name}({', '.join(str(s) for s in args)}):"]
+    for sym, sub in replacements:
+        lines.append(f"    {sym} = {printer.doprint(sub)}")
+    lines.append(f"    return {printer.doprint(reduced)}")
+    return "\n".join(lines)
+
+
+def _compile(func_name, args, expr, build_dir):
+    """ufuncify 编译，返回 (扩展模块名, 相对 build_dir 上级目录的文件名, 函数名)"""
+    from sympy.utilities.autowrap import ufuncify
+    func = ufuncify(args, expr, backend="cython", tempdir=build_dir)
+    module = sys.modules[func.__module__]
+    filename = os.path.relpath(module.__file__, os.path.dirname(build_dir))
+    return module.__name__, filename, func.__name__
+
+
+def export_kernel(expr, args, path, name="det_simple", compiled=False):
+    """
+    生成数值核模块，模块中包含 f(*args) 及其对 args[0] 的导数 df(*args)。
+    Args:
+        expr: SymPy 表达式
+        args: 参数符号序列，第一个为求根变量
+        path (str): 输出 .py 文件路径
+        name (str): 表达式名称，写入模块的 NAME
+        compiled (bool): 是否同时编译 C 扩展（需要 Cython 和 C 编译器）
+    Returns:
+        str: 生成文件的绝对路径
+    """
+    path = os.path.abspath(path)
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)
+    args = tuple(args)
+    funcs = {"f": expr, "df": diff(expr, args[0])}
+    parts = [HEADER.format(name=name, args=tuple(str(s) for s in args))]
+    for func_name, e in funcs.items():
+        parts.append("\n" + _function_source(func_name, args, e) + "\n")
+    if compiled:
+        build_dir = os.path.splitext(path)[0] + "_build"
+        info = {func_name: _compile(func_name, args, e, build_dir) for func_name, e in funcs.items()}
+        parts.append(COMPILED_LOADER.format(compiled=info))
+    # 先写临时文件再替换，批处理脚本并发加载时不会读到半个文件
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("\n".join(parts))
+    os.replace(tmp, path)
+    return path
@@ -0,0 +1,198 @@
+import numpy as np
+from roots import refine, adaptive_brackets
+from sweep import BeamSweep
+
+"""
+沿参数路径做根的延拓：相邻设计只差一点 M 或 L 时，各阶根只移动一点，
+用上一（两）个设计的根线性外推出预测值，在预测值两侧开很窄的区间，确认变号后用带区间保护的牛顿法加密，
+通常两三次迭代就收敛，每个设计每阶只需十次左右的函数求值（整段网格扫描要数万次）。
+以下情况判为失败，对该设计退回完整的 adaptive_brackets 扫描，并从新结果重新开始外推：
+  - 窄区间逐级放宽后仍没有变号（根移动太快，或丢了根）；
+  - 加密后各阶根不再严格递增（两阶根收敛到同一个根，即模态交叉 / 跟错了阶）；
+  - 相邻根中点处的函数符号没有交替（两根之间多出或少了奇数个根）。
+网格按最后一维作为路径：第一列先沿其余维度的蛇形顺序逐个延拓，然后各行同时沿最后一维推进（对行向量化）。
+"""
+
+
+def serpentine_order(shape):
+    """多维网格的蛇形遍历顺序（相邻两项只有一个下标相差 1），返回扁平下标数组"""
+    if not shape:
+        return np.zeros(1, dtype=np.int64)
+    # 最外层每前进一格，整个内层的蛇形顺序反向一次，块与块首尾相接
+    inner = serpentine_order(shape[1:])
+    return np.concatenate([i * inner.size + (inner if i % 2 == 0 else inner[::-1]) for i in range(shape[0])])
+
+
+class ContinuationSweep(BeamSweep):
+    def __init__(self, beam=None, cache=None, kernel="auto", scaled=True, rel_width=1e-3, expand=3, newton_iter=20):
+        """
+        Args:
+            rel_width (float): 预测区间的最小半宽（相对根的大小）
+            expand (int): 区间内没有变号时放宽（每次 ×4）的次数
+            newton_iter (int): 加密时的最大迭代次数
+        其余参数同 BeamSweep
+        """
+        super().__init__(beam, cache, kernel, scaled)
+        self.rel_width = rel_width
+        self.expand = expand
+        self.newton_iter = newton_iter
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.stats = {"designs": 0, "tracked": 0, "full_scans": 0, "lost": 0, "crossings": 0, "parity": 0}
+
+    def full_scan(self, m, M, L, n):
+        """单个设计的完整求根（与 BeamModel.find_roots(scan="adaptive") 相同）"""
+        lo, hi = adaptive_brackets(self.f, n, args=(m, M, L))
+        roots = np.full(n, np.nan)
+        roots[:lo.size] = refine(self.f, lo, hi, (m, M, L), method="illinois")
+        self.stats["full_scans"] += 1
+        return roots
+
+    def step(self, prev, prev2, m, M, L):
+        """
+        由前一个（两个）设计的根推出当前一批设计的根。
+        Args:
+            prev, prev2: (行数 × 阶数) 上一步、上上步的根；prev2 为 None 或与 prev 相同时不外推
+            m, M, L: (行数,) 当前设计的参数
+        Returns:
+            (roots, ok)：ok 为 False 的行需要完整扫描
+        """
+        f, df = self.f, self._derivative("newton")
+        args = (m[:, None], M[:, None], L[:, None])
+        pred = prev if prev2 is None else 2 * prev - prev2
+        # 外推后顺序乱了就不外推
+        bad_pred = np.any(np.diff(pred, axis=1) <= 0, axis=1) | np.any(pred <= 0, axis=1)
+        pred = np.where(bad_pred[:, None], prev, pred)
+        # 区间半宽不超过与相邻预测根间距的 0.45 倍，保证各阶区间互不重叠
+        gaps = np.diff(pred, axis=1)
+        left = np.concatenate([pred[:, :1], gaps], axis=1)
+        right = np.concatenate([gaps, np.full_like(pred[:, :1], np.inf)], axis=1)
+        cap = 0.45 * np.minimum(left, right)
+        w = np.minimum(np.maximum(2 * np.abs(pred - prev), self.rel_width * pred), cap)
+        bracketed = np.zeros(pred.shape, dtype=bool)
+        lo, hi = pred - w, pred + w
+        for _ in range(self.expand + 1):
+            flo, fhi = f(lo, *args), f(hi, *args)
+            bracketed = np.signbit(flo) != np.signbit(fhi)
+            if bracketed.all():
+                break
+            w = np.where(bracketed, w, np.minimum(4 * w, cap))
+            lo, hi = pred - w, pred + w
+        lost = ~bracketed.all(axis=1)
+        roots = np.full(pred.shape, np.nan)
+        rows, cols = np.nonzero(bracketed & ~lost[:, None])
+        if rows.size:
+            sub = tuple(a[rows, 0] for a in args)
+            roots[rows, cols] = refine(f, lo[rows, cols], hi[rows, cols], sub, method="newton", df=df,
+                                       max_iter=self.newton_iter)
+        crossing = ~lost & np.any(np.diff(roots, axis=1) <= 0, axis=1)
+        # 奇偶校验：相邻根的中点处符号应交替，否则中间多出或少了根
+        parity = np.zeros_like(lost)
+        check = ~lost & ~crossing
+        if roots.shape[1] > 1 and check.any():
+            mids = (roots[check, 1:] + roots[check, :-1]) / 2
+            s = np.signbit(f(mids, *(a[check] for a in args)))
+            parity[check] = np.any(s[:, 1:] == s[:, :-1], axis=1)
+        self.stats["lost"] += int(lost.sum())
+        self.stats["crossings"] += int(crossing.sum())
+        self.stats["parity"] += int(parity.sum())
+        return roots, ~(lost | crossing | parity)
+
+    def _march(self, prev, prev2, m, M, L, n):
+        """推进一步，失败的行做完整扫描；返回新的 (prev, prev2)"""
+        roots, ok = self.step(prev, prev2, m, M, L)
+        self.stats["tracked"] += int(ok.sum())
+        for i in np.flatnonzero(~ok):
+            roots[i] = self.full_scan(m[i], M[i], L[i], n)
+        # 完整扫描过的行下一步不外推
+        new_prev2 = prev.copy()
+        new_prev2[~ok] = roots[~ok]
+        return roots, new_prev2
+
+    def track(self, m, M, L, n=3):
+        """
+        m, M, L 同形的参数网格，沿最后一维延拓（一维时即为一条路径），返回 网格形状 + (n,) 的根。
+        """
+        m, M, L = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (m, M, L)))
+        shape = m.shape if m.ndim else (1,)
+        m, M, L = (a.reshape(-1, shape[-1]) for a in (m, M, L))
+        R, K = m.shape
+        self._reset_stats()
+        self.stats["designs"] = R * K
+        roots = np.full((R, K, n), np.nan)
+        # 第一列：沿其余维度的蛇形顺序逐个延拓
+        order = serpentine_order(shape[:-1]) if len(shape) > 1 else np.arange(1)
+        r0 = order[0]
+        prev = self.full_scan(m[r0, 0], M[r0, 0], L[r0, 0], n)[None, :]
+        prev2 = prev
+        roots[r0, 0] = prev[0]
+        for r in order[1:]:
+            if np.isnan(prev).any():
+                prev = self.full_scan(m[r, 0], M[r, 0], L[r, 0], n)[None, :]
+                prev2 = prev
+            else:
+                prev, prev2 = self._march(prev, prev2, m[r:r + 1, 0], M[r:r + 1, 0], L[r:r + 1, 0], n)
+            roots[r, 0] = prev[0]
+        # 各行同时沿最后一维推进
+        prev, prev2 = roots[:, 0], roots[:, 0]
+        for k in range(1, K):
+            missing = np.isnan(prev).any(axis=1)
+            prev, prev2 = prev.copy(), prev2.copy()
+            for i in np.flatnonzero(missing):
+                # 上一步没能找全 n 个根（如到了搜索上限），这一步直接完整扫描
+                prev[i] = prev2[i] = self.full_scan(m[i, k], M[i, k], L[i, k], n)
+            live = ~missing
+            if live.any():
+                new, new2 = self._march(prev[live], prev2[live], m[live, k], M[live, k], L[live, k], n)
+                prev[live], prev2[live] = new, new2
+            roots[:, k] = prev
+        return roots.reshape(shape + (n,))
+
+    def run(self, params: dict, n=3, return_roots=False):
+        """
+        同 BeamSweep.run，但 params 广播后的形状即为网格，沿最后一维延拓；返回 网格形状 + (n,) 的频率。
+        """
+        keys = ("E", "D", "d", "L", "M", "rho")
+        shape = np.broadcast_shapes(*(np.shape(params[k]) for k in keys)) or (1,)
+        p = self.derived_params(params)
+        roots = self.track(*(p[k].reshape(shape) for k in ("m", "M", "L")), n=n)
+        freqs = self.natural_frequency(p, roots.reshape(-1, n)).reshape(roots.shape)
+        if return_roots:
+            return freqs, roots
+        return freqs
+
+
+# ------------------ 主程序 ------------------
+if __name__ == "__main__":
+    import time
+
+    sweep = ContinuationSweep()
+    # 顶端质量 × 长度 的密集网格，沿长度方向延拓
+    M = np.linspace(0.0, 60.0, 200)[:, None]
+    L = np.linspace(2.0, 6.0, 500)[None, :]
+    params = {"E": 2.06e11, "D": 0.114, "d": 0.109, "L": L, "M": M, "rho": 7850}
+    n = 5
+    t0 = time.perf_counter()
+    freqs, roots = sweep.run(params, n=n, return_roots=True)
+    t_cont = time.perf_counter() - t0
+    N = roots.shape[0] * roots.shape[1]
+    print(f"延拓：{N} 个设计 × {n} 阶，{t_cont:.2f} s（每个设计 {t_cont / N * 1e6:.1f} µs），{sweep.stats}")
+
+    # 抽样与逐个完整扫描对比
+    p = sweep.derived_params(params)
+    MM, LL = np.broadcast_arrays(M, L)
+    sample = np.random.default_rng(0).choice(N, 300, replace=False)
+    t0 = time.perf_counter()
+    ref = np.array([sweep.full_scan(p["m"][0], MM.flat[i], LL.flat[i], n) for i in sample])
+    t_full = (time.perf_counter() - t0) / sample.size
+    err = np.max(np.abs(roots.reshape(-1, n)[sample] - ref) / ref)
+    print(f"逐个 adaptive 扫描：每个设计 {t_full * 1e6:.1f} µs，加速 {t_full / (t_cont / N):.0f}x，最大相对误差 {err:.1e}")
+
+    # 默认的整段网格扫描（step=1e-3），只取前几行计时
+    rows = dict(params, M=MM[:4], L=LL[:4])
+    t0 = time.perf_counter()
+    grid = BeamSweep(kernel=sweep.kernel).run(rows, n=n, x_max=20)
+    t_grid = (time.perf_counter() - t0) / grid.shape[0]
+    err = np.nanmax(np.abs(grid - freqs[:4].reshape(-1, n)) / grid)
+    print(f"BeamSweep 网格扫描：每个设计 {t_grid * 1e6:.1f} µs，加速 {t_grid / (t_cont / N):.0f}x，最大相对误差 {err:.1e}")
@@ -1,28 +1,124 @@
 from sympy import Matrix,det,symbols,sin,cos,sinh,cosh,diff,Eq,solve,simplify,expand,pprint
 from sympy import latex,lambdify,factor,symbols,sstr
+from sympy import Add,tanh,sech,exp,cancel
+import inspect
 import os
+from codegen import export_kernel
+from profiling import stage, timed
+
+
+class lazy:
+    """
+    惰性求值并记忆的派生量：首次访问时先尝试读缓存，再依次求出依赖的派生量 deps，
+    然后调用 method 计算并赋值该属性；结果存进实例 __dict__，之后的访问就是普通属性读取。
+    """
+    def __init__(self, method, *deps):
+        self.method = method
+        self.deps = deps
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        if not obj._cache_loaded:
+            obj._load_cache()
+        if self.name not in obj.__dict__:
+            obj._depth += 1
+            try:
+                for dep in self.deps:
+                    getattr(obj, dep)
+                getattr(obj, self.method)()
+            finally:
+                obj._depth -= 1
+            # 只在最外层求值结束后写一次缓存
+            if obj._depth == 0:
+                obj._save_cache()
+        return obj.__dict__[self.name]
+
 
 class EulerBeam:
-    def __init__(self, bc_fixed_func=None, bc_free_func=None):
+    # 派生量按需计算：属性名 = lazy(计算方法, 依赖...)
+    sol = lazy("_solve")
+    M_c = lazy("_c_matrix", "sol")
+    det = lazy("_replace", "M_c")
+    det_simple = lazy("_simplify", "M_c")
+    det_scaled = lazy("_scale", "det_simple")
+    DERIVED = ("sol", "M_c", "det", "det_simple", "det_scaled")
+
+    def __init__(self, bc_fixed_func=None, bc_free_func=None, cache=None, simplify_mode="full"):
         # 定义符号  M 顶端点质量，m 分布质量，最后的nonzero=True是定义的是所有符号都不为零
         self.a, self.x, self.L, self.E, self.I, self.w, self.M, self.J, self.m = symbols('a x L E I w M J m', nonzero=True)
         self.A, self.B, self.C, self.D = symbols('A B C D')
         # 边界类型
         self.bc_fixed_func = bc_fixed_func
         self.bc_free_func = bc_free_func
+        # x=0 端条件消去的两个系数（固定端函数可用 solve_for 属性指定，如铰支消去 B、D），剩下两个组成 M_c 的列
+        names = getattr(bc_fixed_func, "solve_for", ("A", "B"))
+        coeffs = {"A": self.A, "B": self.B, "C": self.C, "D": self.D}
+        self.solve_for = tuple(coeffs[k] for k in names)
+        self.unknowns = tuple(v for k, v in coeffs.items() if k not in names)
+        # 推导结果缓存（DerivationCache），None 表示不使用缓存
+        self.cache = cache
+        self._cache_loaded = False
+        self._depth = 0
+        # "full" 用 factor + simplify 得到最简形式（可能很慢）；
+        # "fast" 只做展开、sin²/sinh² 消去和约分，数值上等价，适合只做数值计算的场合
+        if simplify_mode not in ("full", "fast"):
+            raise ValueError(f"未知化简方式 {simplify_mode!r}，可选 'full' / 'fast'")
+        self.simplify_mode = simplify_mode
         # 调用初始化函数
         self._initialize()
 
+    @stage()
     def _initialize(self):
         self._Qx()
         self._default_fixed_bc()
         self._default_free_bc()
         self._boundary_conditions()
-        self._solve()
-        self._c_matrix()
-        self._replace()
+        # sol、M_c、det 等派生量在首次访问时才计算（见 lazy）
+
+    def _cache_key(self):
+        # 边界条件函数源码（未给出时用默认边界条件方法的源码）+ 推导步骤源码
+        funcs = [
+            self.bc_fixed_func or EulerBeam._default_fixed_bc,
+            self.bc_free_func or EulerBeam._default_free_bc,
+            EulerBeam._Qx, EulerBeam._solve, EulerBeam._c_matrix, EulerBeam._raw_det,
+            EulerBeam._replace, EulerBeam._simplify, EulerBeam._canonical, EulerBeam._scale,
+        ]
+        sources = [self.simplify_mode, str(self.solve_for)]
+        for func in funcs:
+            try:
+                sources.append(inspect.getsource(func))
+            except (OSError, TypeError):
+                # 交互式环境里定义的函数拿不到源码，退而使用字节码
+                code = func.__code__
+                sources.append(repr((code.co_code, code.co_consts, code.co_names)))
+        return self.cache.make_key(*sources)
+
+    @stage()
+    def _load_cache(self):
+        # 每个实例只读一次；缓存里可能只有部分派生量
+        self._cache_loaded = True
+        if self.cache is None:
+            return False
+        data = self.cache.get(self._cache_key())
+        if data is None:
+            return False
+        for name, value in data.items():
+            setattr(self, name, value)
+        return True
+
+    @stage()
+    def _save_cache(self):
+        if self.cache is None or "sol" not in self.__dict__:
+            return
+        exprs = {name: self.__dict__[name] for name in self.DERIVED[1:] if name in self.__dict__}
+        self.cache.put(self._cache_key(), self.sol, **exprs)
 
     # _ 表示这是一个内部方法（internal method），不建议外部直接调用。
+    @stage()
     def _Qx(self):
         """
         定义Q(x) 及其导数
@@ -44,6 +140,7 @@ class EulerBeam:
         bc4 = Eq(self.E*self.I*self.Q2.subs(self.x,self.L), 0)
         return bc3, bc4
 
+    @stage()
     def _boundary_conditions(self):
         # 边界条件选择
         if self.bc_fixed_func:
@@ -55,29 +152,97 @@ class EulerBeam:
         else:
             self.bc3, self.bc4 = self._default_free_bc()
 
+    @stage('sol')
     def _solve(self):
-        self.sol = solve([self.bc1,self.bc2],(self.A,self.B))
+        self.sol = solve([self.bc1,self.bc2],self.solve_for)
         if not self.sol:
-            raise ValueError("无法求解 A, B —— 检查边界条件定义。")
+            names = ", ".join(str(c) for c in self.solve_for)
+            raise ValueError(f"无法求解 {names} —— 检查边界条件定义（或固定端函数的 solve_for）。")
 
+    @stage('M_c')
     def _c_matrix(self):
         bc3 = self.bc3.subs(self.sol)
         bc4 = self.bc4.subs(self.sol)
         f1 = expand(bc3.lhs - bc3.rhs)
         f2 = expand(bc4.lhs - bc4.rhs)
+        u, v = self.unknowns
         self.M_c = Matrix([
-            [f1.coeff(self.C),f1.coeff(self.D)],
-            [f2.coeff(self.C),f2.coeff(self.D)],
+            [f1.coeff(u),f1.coeff(v)],
+            [f2.coeff(u),f2.coeff(v)],
         ])
 
-    def _replace(self):
+    def _raw_det(self):
         det = self.M_c.det()
         # w替换掉
-        det = det.subs(self.w**2,self.E*self.I*self.a**4/self.m)
-        det = factor(det)
-        self.det = simplify(det)
-        self.det_simple = simplify(self.det/(2*self.E**2 * self.I**2 * self.a**5))
-        self.det_simple = self.det_simple.subs(self.a,self.a/self.L)
+        return det.subs(self.w**2,self.E*self.I*self.a**4/self.m)
+
+    @staticmethod
+    def _canonical(expr):
+        """
+        廉价的规范化：展开后把 sin^n、sinh^n（n≥2）用 1-cos^2、cosh^2-1 降次，反复直到不再变化，最后约分。
+        """
+        def match(e):
+            return e.is_Pow and e.base.func in (sin, sinh) and e.exp.is_Integer and e.exp >= 2
+        def rule(e):
+            u = e.base.args[0]
+            rest = e.base**(e.exp - 2)
+            return rest*(1 - cos(u)**2) if e.base.func == sin else rest*(cosh(u)**2 - 1)
+        expr = expand(expr)
+        while True:
+            new = expand(expr.replace(match, rule))
+            if new == expr:
+                return cancel(expr)
+            expr = new
+
+    @stage('det')
+    def _replace(self):
+        with timed("EulerBeam._replace.det"):
+            det = self._raw_det()
+        if self.simplify_mode == "fast":
+            self.det = self._canonical(det)
+            return
+        with timed("EulerBeam._replace.factor"):
+            det = factor(det)
+        with timed("EulerBeam._replace.simplify"):
+            self.det = simplify(det)
+
+    @stage('det_simple')
+    def _simplify(self):
+        scale = 2*self.E**2 * self.I**2 * self.a**5
+        if self.simplify_mode == "fast":
+            det_simple = self._canonical(self._raw_det()/scale)
+        else:
+            with timed("EulerBeam._simplify.simplify"):
+                det_simple = simplify(self.det/scale)
+        self.det_simple = det_simple.subs(self.a,self.a/self.L)
+
+    @stage('det_scaled')
+    def _scale(self):
+        """
+        指数缩放：det_simple 各项最多含 p 次 sinh(a)/cosh(a)，整体除以 cosh(a)**p（恒正，不改变根和符号），
+        sinh/cosh 化为 tanh，剩余的 1/cosh 写成 2exp(-a)/(1+exp(-2a))，大 a 时只会下溢到 0 而不会溢出。
+        """
+        a = self.a
+        expr = expand(self.det_simple)
+        def degree(term):
+            powers = term.as_powers_dict()
+            return powers.get(sinh(a), 0) + powers.get(cosh(a), 0)
+        p = max(degree(term) for term in Add.make_args(expr))
+        expr = expand(expr.subs(sinh(a), tanh(a)*cosh(a)) / cosh(a)**p)
+        expr = expr.subs(cosh(a), 1/sech(a))
+        self.det_scaled = expr.replace(sech, lambda x: 2*exp(-x)/(1 + exp(-2*x)))
+
+    def export_kernel(self, path: str, expr_name="det_scaled", compiled=False):
+        """
+        把特征方程导出为只依赖 NumPy 的数值核模块（cse 后生成 f(a, m, M, L) 及导数 df），
+        BeamModel(kernel=path) 可直接加载，运行时无需导入 SymPy。
+        Args:
+            path (str): 输出 .py 文件路径
+            expr_name (str): 导出的属性名，默认 det_scaled
+            compiled (bool): 同时用 ufuncify 编译 C 扩展
+        """
+        expr = getattr(self, expr_name)
+        return export_kernel(expr, (self.a, self.m, self.M, self.L), path, name=expr_name, compiled=compiled)
 
     def write_latex(self, filename: str, expressions: list, title=None):
         """
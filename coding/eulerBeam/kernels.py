@@ -0,0 +1,111 @@
+import glob
+import hashlib
+import importlib.util
+import os
+import sys
+
+"""
+数值核的加载与缓存（只依赖 NumPy，不导入 SymPy）。
+数值核由 EulerBeam.export_kernel 生成；get_kernel 先在缓存目录中找已生成的模块，
+找不到时才导入 SymPy 推导并导出一次，之后的进程直接加载生成的代码。
+文件名带推导指纹（推导相关源码 + SymPy 版本），公式、CACHE_VERSION 或 SymPy 升级后自动重新生成，不会沿用旧的特征方程。
+"""
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "EULERBEAM_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"),
+)
+DEFAULT_KERNEL_DIR = os.path.join(DEFAULT_CACHE_DIR, "kernels")
+# 决定特征方程的源码：推导步骤、导出代码、缓存版本（cache.CACHE_VERSION）、边界条件
+KEY_SOURCES = ("formula.py", "codegen.py", "cache.py", "boundary.py", "parallel.py")
+
+
+def load_kernel(kernel):
+    """kernel 可以是已导入的模块，或生成的 .py 文件路径"""
+    if not isinstance(kernel, (str, os.PathLike)):
+        return kernel
+    path = os.path.abspath(kernel)
+    name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None:
+        raise ImportError(f"无法加载数值核：{path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def kernel_key(variant="default"):
+    """
+    推导指纹：KEY_SOURCES 的文件内容 + sympy/release.py（即 SymPy 版本）+ 变体名。
+    只读文件不导入 SymPy，热启动时也能廉价地算出来；比 DerivationCache 的键粗一些（任何改动都会失效）。
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    files = [os.path.join(here, name) for name in KEY_SOURCES]
+    spec = importlib.util.find_spec("sympy")
+    if spec is not None and spec.origin:
+        files.append(os.path.join(os.path.dirname(spec.origin), "release.py"))
+    h = hashlib.sha256(variant.encode("utf-8"))
+    for path in files:
+        h.update(b"\0")
+        try:
+            with open(path, "rb") as f:
+                h.update(f.read())
+        except FileNotFoundError:
+            pass
+    return h.hexdigest()[:16]
+
+
+def kernel_path(variant="default", kernel_dir=None):
+    return os.path.join(kernel_dir or DEFAULT_KERNEL_DIR, f"{variant}_{kernel_key(variant)}.py")
+
+
+def build_kernel(variant="default", kernel_dir=None, compiled=False):
+    """
+    推导并导出数值核（需要 SymPy）。
+    variant 为 "default"（EulerBeam 默认边界条件）或 parallel.VARIANTS 中的名称。
+    """
+    from formula import EulerBeam
+    from cache import DerivationCache
+    if variant == "default":
+        bcs = (None, None)
+    else:
+        from parallel import VARIANTS
+        bcs = VARIANTS[variant]
+    beam = EulerBeam(*bcs, cache=DerivationCache(), simplify_mode="fast")
+    return beam.export_kernel(kernel_path(variant, kernel_dir), compiled=compiled)
+
+
+def get_kernel(variant="default", kernel_dir=None):
+    """优先加载与当前推导指纹一致的数值核，没有时才推导（此时会导入 SymPy）"""
+    path = kernel_path(variant, kernel_dir)
+    if not os.path.exists(path):
+        if importlib.util.find_spec("sympy") is None:
+            # 没有 SymPy 无法重新推导，只能用已有的（如随程序分发的）数值核
+            existing = sorted(glob.glob(os.path.join(kernel_dir or DEFAULT_KERNEL_DIR, f"{variant}_*.py")),
+                              key=os.path.getmtime)
+            if not existing:
+                raise ImportError(f"没有可用的数值核 {variant!r}，且未安装 SymPy 无法生成")
+            print(f"未安装 SymPy，使用可能过期的数值核 {existing[-1]}", file=sys.stderr)
+            return load_kernel(existing[-1])
+        build_kernel(variant, kernel_dir)
+    return load_kernel(path)
+
+
+def clear_kernels(kernel_dir=None):
+    """删除已生成的数值核（含各个旧指纹的文件）"""
+    folder = kernel_dir or DEFAULT_KERNEL_DIR
+    if not os.path.isdir(folder):
+        return 0
+    removed = 0
+    for name in os.listdir(folder):
+        if name.endswith(".py"):
+            os.remove(os.path.join(folder, name))
+            removed += 1
+    return removed
+
+
+# ------------------ 主程序 ------------------
+if __name__ == "__main__":
+    # 重新生成默认数值核
+    clear_kernels()
+    print(f"数值核已生成：{build_kernel()}")
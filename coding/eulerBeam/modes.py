@@ -0,0 +1,97 @@
+import numpy as np
+from sympy import Matrix, cosh, exp, expand, lambdify, sinh, symbols
+
+"""
+振型与模态质量：由 EulerBeam 的四个边界条件在每个特征根处求出振型系数，
+在用户给出的 x 网格上一次性计算所有阶振型 φ_k(x)，结果为 (阶数 × 点数) 数组。
+双曲部分改用指数缩放的基：C·sinh(ax) + D·cosh(ax) = P·e^{a(x-L)} + N·e^{-ax}（同 det_scaled 的思路），
+两个指数在 [0, L] 上都不超过 1，系数矩阵各元素有界，高阶时既不溢出也没有 C ≈ -D 的抵消误差。
+模态质量、参与系数用 Gauss-Legendre 积分，另含顶端质量 M 的贡献；边界条件含转动惯量 J 时模态质量再加 J·φ'(L)²。
+"""
+
+
+class ModeShapes:
+    def __init__(self, beam):
+        b = beam
+        self.beam = b
+        self.args = (b.a, b.L, b.E, b.I, b.M, b.J, b.m)
+        P, N = symbols("P N")
+        self.coeffs = (b.A, b.B, P, N)
+        # C、D 换成 P、N；sinh、cosh 写成指数后展开，e^{aL}·e^{-aL} 在符号层面就约掉了
+        basis = {b.C: P*exp(-b.a*b.L) - N, b.D: P*exp(-b.a*b.L) + N}
+        rows = []
+        for bc in (b.bc1, b.bc2, b.bc3, b.bc4):
+            f = (bc.lhs - bc.rhs).subs(b.w**2, b.E*b.I*b.a**4/b.m).subs(basis)
+            f = f.replace(sinh, lambda u: (exp(u) - exp(-u))/2).replace(cosh, lambda u: (exp(u) + exp(-u))/2)
+            f = expand(f)
+            rows.append([f.coeff(c) for c in self.coeffs])
+        self.matrix = Matrix(rows)
+        self.bc = [[lambdify(self.args, self.matrix[i, j], "numpy") for j in range(4)] for i in range(4)]
+        # 顶端转动惯量只在边界条件里出现时才计入模态质量
+        self.has_J = any(bc.has(b.J) for bc in (b.bc1, b.bc2, b.bc3, b.bc4))
+
+    def _values(self, beta, p):
+        return (beta, p["L"], p["E"], p["I"], p["M"], p.get("J", 0.0), p["m"])
+
+    def coefficients(self, roots, p: dict):
+        """每阶的 [A, B, P, N]：4×4 边界条件矩阵（各行按最大元素归一）的最小奇异值对应的右奇异向量"""
+        beta = np.asarray(roots, dtype=float) / p["L"]
+        vals = self._values(beta, p)
+        K = np.array([[np.broadcast_to(self.bc[i][j](*vals), beta.shape) for j in range(4)] for i in range(4)])
+        K = np.moveaxis(K, -1, 0)
+        K = K / np.max(np.abs(K), axis=2, keepdims=True)
+        return np.linalg.svd(K)[2][:, -1, :]
+
+    def evaluate(self, roots, x, p: dict, derivative=False):
+        """未归一化的振型（derivative 为 True 时为 dφ/dx），形状 (阶数 × 点数)"""
+        L = p["L"]
+        beta = (np.asarray(roots, dtype=float) / L)[:, None]
+        A, B, P, N = (c[:, None] for c in self.coefficients(roots, p).T)
+        x = np.asarray(x, dtype=float)[None, :]
+        ax = beta * x
+        up, down = np.exp(beta * (x - L)), np.exp(-ax)
+        if derivative:
+            return beta * (A * np.cos(ax) - B * np.sin(ax) + P * up - N * down)
+        return A * np.sin(ax) + B * np.cos(ax) + P * up + N * down
+
+    def modal(self, roots, x, p: dict, normalize="mass", n_quad=200):
+        """
+        计算归一化振型及模态参数。
+        Args:
+            roots: 特征根（无量纲 r = aL）
+            x: 输出振型的坐标数组 (0 ≤ x ≤ L)
+            p (dict): 含 E, I, m, M, L（可选 J）的参数字典，即 BeamModel.params
+            normalize (str): "mass" 使模态质量为 1；"max" 使 |φ| 最大值为 1
+            n_quad (int): 积分点数
+        Returns:
+            dict: shapes (阶数 × 点数)、modal_mass、participation、effective_mass、total_mass
+        """
+        L, m, M = p["L"], p["m"], p["M"]
+        J = p.get("J", 0.0) if self.has_J else 0.0
+        nodes, weights = np.polynomial.legendre.leggauss(n_quad)
+        xq = (nodes + 1) * L / 2
+        wq = weights * L / 2
+        phi_q = self.evaluate(roots, xq, p)
+        phi_L = self.evaluate(roots, [L], p)[:, 0]
+        dphi_L = self.evaluate(roots, [L], p, derivative=True)[:, 0]
+        # 符号约定：|φ| 最大处为正
+        sign = np.sign(phi_q[np.arange(phi_q.shape[0]), np.argmax(np.abs(phi_q), axis=1)])
+        if normalize == "mass":
+            scale = np.sqrt(m * (phi_q**2) @ wq + M * phi_L**2 + J * dphi_L**2)
+        elif normalize == "max":
+            scale = np.maximum(np.max(np.abs(phi_q), axis=1), np.abs(phi_L))
+        else:
+            raise ValueError(f"未知归一化方式 {normalize!r}")
+        scale = scale * sign
+        phi_q = phi_q / scale[:, None]
+        phi_L = phi_L / scale
+        dphi_L = dphi_L / scale
+        modal_mass = m * (phi_q**2) @ wq + M * phi_L**2 + J * dphi_L**2
+        participation = (m * phi_q @ wq + M * phi_L) / modal_mass
+        return {
+            "shapes": self.evaluate(roots, x, p) / scale[:, None],
+            "modal_mass": modal_mass,
+            "participation": participation,
+            "effective_mass": participation**2 * modal_mass,
+            "total_mass": m * L + M,
+        }
@@ -0,0 +1,70 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from formula import EulerBeam
+from cache import DerivationCache
+import boundary
+
+"""
+多进程批量推导不同边界条件组合的 EulerBeam。
+每个组合的符号推导都是 CPU 密集的 SymPy 运算，用进程池并行；
+_solve 抛出的 ValueError 只记录在对应结果里，不影响其余组合。
+"""
+
+# 常用组合：名称 -> (bc_fixed_func, bc_free_func)
+VARIANTS = {
+    "cantilever_tip_mass": (boundary.clamped_base, boundary.tip_mass),
+    "cantilever_tip_mass_J": (boundary.clamped_base, boundary.tip_mass_inertia),
+    "cantilever_free": (boundary.clamped_base, boundary.free_tip),
+    "clamped_pinned": (boundary.clamped_base, boundary.pinned_tip),
+    "clamped_sliding": (boundary.clamped_base, boundary.sliding_tip),
+    "pinned_tip_mass": (boundary.pinned_base, boundary.tip_mass),
+    "sliding_tip_mass": (boundary.sliding_base, boundary.tip_mass),
+}
+
+
+def _derive(name, bc_fixed_func, bc_free_func, cache_dir, simplify_mode="full"):
+    """子进程中执行一次推导，返回可 pickle 的结果字典"""
+    t0 = time.perf_counter()
+    result = {name_: None for name_ in EulerBeam.DERIVED}
+    result.update(name=name, error=None)
+    try:
+        cache = DerivationCache(cache_dir) if cache_dir else None
+        beam = EulerBeam(bc_fixed_func, bc_free_func, cache=cache, simplify_mode=simplify_mode)
+        # 派生量是惰性的，这里逐个取出以触发推导
+        result.update({name_: getattr(beam, name_) for name_ in EulerBeam.DERIVED})
+    except ValueError as e:
+        result["error"] = str(e)
+    result["elapsed"] = time.perf_counter() - t0
+    return result
+
+
+def derive_many(variants=None, processes=None, cache_dir=None, simplify_mode="full"):
+    """
+    并行推导一批边界条件组合。
+    Args:
+        variants (dict): {名称: (bc_fixed_func, bc_free_func)}，函数须为模块级函数（可 pickle）；
+                         缺省为 VARIANTS
+        processes (int, optional): 进程数，缺省为 CPU 核数
+        cache_dir (str, optional): 给出时各进程共用该目录下的 DerivationCache
+        simplify_mode (str): 传给 EulerBeam，"fast" 可避免个别组合 simplify 耗时数分钟
+    Returns:
+        dict: {名称: 结果字典}，按输入顺序排列；结果字典含 sol、M_c、det、det_simple、det_scaled、
+              error（失败时为错误信息，其余表达式为 None）和 elapsed（秒）
+    """
+    variants = VARIANTS if variants is None else variants
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = {
+            name: pool.submit(_derive, name, fixed, free, cache_dir, simplify_mode)
+            for name, (fixed, free) in variants.items()
+        }
+        return {name: fut.result() for name, fut in futures.items()}
+
+
+# ------------------ 主程序 ------------------
+if __name__ == "__main__":
+    t0 = time.perf_counter()
+    results = derive_many()
+    print(f"共 {len(results)} 个组合，总耗时 {time.perf_counter() - t0:.2f} s\n")
+    for name, r in results.items():
+        status = f"失败：{r['error']}" if r["error"] else f"det_simple = {r['det_simple']}"
+        print(f"  {name:<24}{r['elapsed']:>8.2f} s  {status}")
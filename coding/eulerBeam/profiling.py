@@ -0,0 +1,141 @@
+import functools
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+"""
+可选的分阶段计时与计数。默认不开启，没有注册回调时各钩子只多一次列表判断。
+
+    with Profiler() as prof:
+        model = BeamModel(params)
+        model.find_roots(n=3)
+    prof.print_report()
+
+也可以用 register(callback) 注册自己的回调，callback(event) 收到的 event 为字典：
+    {"kind": "stage", "name": ..., "elapsed": 秒, "ops": count_ops 或 None}
+    {"kind": "eval", "name": ..., "points": 本次求值的点数}
+"""
+
+_callbacks = []
+
+
+def register(callback):
+    _callbacks.append(callback)
+    return callback
+
+
+def unregister(callback):
+    _callbacks.remove(callback)
+
+
+def enabled():
+    return bool(_callbacks)
+
+
+def _emit(event):
+    for cb in list(_callbacks):
+        cb(event)
+
+
+def _count_ops(obj):
+    # 只有在统计表达式规模时才需要 SymPy
+    from sympy import count_ops
+    if isinstance(obj, dict):
+        return sum(count_ops(v) for v in obj.values())
+    return count_ops(obj)
+
+
+def stage(ops=None):
+    """
+    方法装饰器：记录耗时和调用次数，阶段名为 "类名.方法名"。
+    ops 为属性名时，在方法返回后统计 self.<ops> 的 count_ops。
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not _callbacks:
+                return func(self, *args, **kwargs)
+            t0 = time.perf_counter()
+            result = func(self, *args, **kwargs)
+            elapsed = time.perf_counter() - t0
+            size = None
+            if ops is not None and any(getattr(cb, "count_ops", False) for cb in _callbacks):
+                size = _count_ops(getattr(self, ops))
+            _emit({"kind": "stage", "name": f"{type(self).__name__}.{func.__name__}", "elapsed": elapsed, "ops": size})
+            return result
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def timed(name):
+    """方法内部的子步骤计时，例如 _replace 中的 simplify"""
+    if not _callbacks:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _emit({"kind": "stage", "name": name, "elapsed": time.perf_counter() - t0, "ops": None})
+
+
+def counted(name, f):
+    """包装函数求值，记录调用次数和求值点数；未开启时原样返回"""
+    if not _callbacks:
+        return f
+
+    @functools.wraps(f)
+    def wrapper(x, *args):
+        _emit({"kind": "eval", "name": name, "points": int(np.size(x))})
+        return f(x, *args)
+    return wrapper
+
+
+class Profiler:
+    def __init__(self, count_ops=True):
+        """count_ops 为 True 时统计各阶段结果表达式的 count_ops（大表达式本身也有开销）"""
+        self.count_ops = count_ops
+        self.stages = {}
+        self.evals = {}
+
+    def __call__(self, event):
+        if event["kind"] == "stage":
+            s = self.stages.setdefault(event["name"], {"calls": 0, "total": 0.0, "max": 0.0, "ops": None})
+            s["calls"] += 1
+            s["total"] += event["elapsed"]
+            s["max"] = max(s["max"], event["elapsed"])
+            if event["ops"] is not None:
+                s["ops"] = event["ops"]
+        else:
+            e = self.evals.setdefault(event["name"], {"calls": 0, "points": 0})
+            e["calls"] += 1
+            e["points"] += event["points"]
+
+    def __enter__(self):
+        register(self)
+        return self
+
+    def __exit__(self, *exc):
+        unregister(self)
+        return False
+
+    def report(self):
+        """结构化结果：{"stages": {名称: {calls, total, mean, max, ops}}, "evals": {名称: {calls, points}}}"""
+        stages = {
+            name: dict(s, mean=s["total"] / s["calls"])
+            for name, s in sorted(self.stages.items(), key=lambda kv: -kv[1]["total"])
+        }
+        return {"stages": stages, "evals": dict(self.evals)}
+
+    def print_report(self):
+        r = self.report()
+        print(f"\n  {'stage':<36}{'calls':>7}{'total (ms)':>13}{'max (ms)':>11}{'count_ops':>11}")
+        for name, s in r["stages"].items():
+            ops = "" if s["ops"] is None else s["ops"]
+            print(f"  {name:<36}{s['calls']:>7}{s['total'] * 1e3:>13.3f}{s['max'] * 1e3:>11.3f}{ops:>11}")
+        if r["evals"]:
+            print(f"\n  {'function':<36}{'calls':>7}{'points':>13}")
+            for name, e in r["evals"].items():
+                print(f"  {name:<36}{e['calls']:>7}{e['points']:>13}")
@@ -0,0 +1,306 @@
+import hashlib
+import os
+import re
+import time
+
+import sympy
+from sympy import Add, Eq, MatrixBase, Mul, fraction, latex, srepr
+from kernels import DEFAULT_CACHE_DIR
+
+"""
+增量生成 LaTeX 推导报告。
+和 EulerBeam.write_latex 的区别：
+  1. 渲染结果按表达式内容（srepr 的哈希）缓存在磁盘上，不同边界条件的报告里相同的表达式只渲染一次；
+  2. 每节写成单独的 <报告名>/secNN.tex，由主文件 \\input，首行记录本节的指纹，
+     输入没变的节不渲染也不重写（文件时间不变，latexmk 不会重复编译）；
+  3. 各节按顺序边算边写，表达式可以是无参函数（如 lambda: beam.det），前面的节写完才开始推导后面的；
+  4. 过长的和式按项拆到多行（multline），分式、带公共因子的和式拆括号内的部分，
+     宽矩阵按元素逐个给出，不再用 adjustbox 整体缩小。
+
+    builder = ReportBuilder()
+    builder.write("latex/cantilever.tex", [("特征方程", lambda: beam.det, True)], title="悬臂梁推导")
+"""
+
+# 渲染方式改动时递增，使旧的渲染缓存失效
+RENDER_VERSION = 2
+
+PREAMBLE = [
+    r"\documentclass[12pt,a4paper]{article}",
+    r"\usepackage[UTF8]{ctex}",
+    r"\usepackage{amsmath,amssymb,amsfonts}",
+    r"\usepackage{geometry}",
+    r"\geometry{a4paper, left=1.5cm, right=1.5cm, top=2cm, bottom=2cm}",
+    r"\usepackage{hyperref}",
+]
+
+
+def visible_width(tex):
+    """
+    粗略估计公式排版后的宽度（字符数）：去掉定界符命令、花括号和上下标记号，
+    函数名按字母数计，其余命令按一个字符计，二元运算符连同两侧间距按三个字符计
+    """
+    tex = re.sub(r"\\(left|right|begin\{\w+\}|end\{\w+\}|frac)\b|[{}^_ ]", "", tex)
+    tex = re.sub(r"\\(sinh|cosh|tanh|sin|cos|tan|exp|log|sec|csc|cot)", r"\1", tex)
+    tex = re.sub(r"\\[A-Za-z]+", "x", tex)
+    return len(tex) + 2 * len(re.findall(r"[-+=]", tex))
+
+
+def _term(term, first):
+    """和式中的一项，带上连接符号"""
+    if term.could_extract_minus_sign():
+        return f"- {latex(-term)}"
+    return latex(term) if first else f"+ {latex(term)}"
+
+
+def split_lines(expr, width):
+    """
+    把表达式拆成若干行 LaTeX（不含换行符），单行放得下时返回一行。
+    和式按项装行；乘积或分式取其中最长的和式因子在括号内拆分，其余因子作为前缀。
+    """
+    tex = latex(expr)
+    if visible_width(tex) <= width:
+        return [tex]
+    if isinstance(expr, Add):
+        prefix, terms, close = "", Add.make_args(expr), ""
+    elif isinstance(expr, Mul):
+        num, den = fraction(expr)
+        sums = [f for f in Mul.make_args(num) if isinstance(f, Add)]
+        if not sums:
+            return [tex]
+        inner = max(sums, key=lambda f: len(f.args))
+        rest = expr / inner
+        # 其余因子本身是和式时要加括号，否则 "x + 1 \left(...\right)" 读作 x + (...)
+        head = "-" if rest == -1 else (rf"\left({latex(rest)}\right)" if isinstance(rest, Add) else latex(rest))
+        prefix = "" if rest == 1 else head + r" \left("
+        terms, close = Add.make_args(inner), r" \right)" if rest != 1 else ""
+    else:
+        return [tex]
+    lines, line = [], prefix
+    for i, term in enumerate(terms):
+        piece = _term(term, i == 0)
+        if line.strip() and visible_width(line + piece) > width:
+            lines.append(line)
+            line = ""
+        line = f"{line} {piece}" if line else piece
+    lines.append(line)
+    if close:
+        # \left( 和 \right) 不能跨行，中间各行用 \right. / \left. 补齐
+        if len(lines) > 1:
+            lines = [lines[0] + r" \right."] + [r"\left. " + l + r" \right." for l in lines[1:-1]] + [r"\left. " + lines[-1]]
+        lines[-1] += close
+    return lines
+
+
+def render(expr, numbered=True, width=70, symbol="A"):
+    """渲染一条表达式为 LaTeX 片段（单行用 equation / \\[ \\]，多行用 multline，宽矩阵逐元素给出）"""
+    if isinstance(expr, MatrixBase):
+        tex = latex(expr)
+        if max(visible_width(latex(expr.row(i))) for i in range(expr.rows)) <= width:
+            return _block([tex], numbered)
+        blocks = [f"% {symbol}: {expr.rows}x{expr.cols}"]
+        for i in range(expr.rows):
+            for j in range(expr.cols):
+                if expr[i, j] != 0:
+                    lines = split_lines(expr[i, j], width)
+                    lines[0] = f"{symbol}_{{{i + 1}{j + 1}}} = {lines[0]}"
+                    blocks.append(_block(lines, False))
+        return "\n".join(blocks)
+    if isinstance(expr, Eq):
+        lhs = latex(expr.lhs)
+        lines = split_lines(expr.rhs, width - visible_width(lhs))
+        lines[0] = f"{lhs} = {lines[0]}"
+        return _block(lines, numbered)
+    return _block(split_lines(expr, width), numbered)
+
+
+def _block(lines, numbered):
+    if len(lines) == 1:
+        if numbered:
+            return f"\\begin{{equation}}\n{lines[0]}\n\\end{{equation}}\n"
+        return f"\\[\n{lines[0]}\n\\]\n"
+    env = "multline" if numbered else "multline*"
+    return f"\\begin{{{env}}}\n" + " \\\\\n".join(lines) + f"\n\\end{{{env}}}\n"
+
+
+class LatexCache:
+    def __init__(self, cache_dir=None):
+        """渲染结果缓存，默认放在推导缓存目录下的 latex 子目录；同一进程内另有内存缓存"""
+        self.cache_dir = os.path.abspath(cache_dir or os.path.join(DEFAULT_CACHE_DIR, "latex"))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.memory = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(*parts):
+        h = hashlib.sha256()
+        h.update(f"v{RENDER_VERSION}|sympy-{sympy.__version__}".encode("utf-8"))
+        for part in parts:
+            h.update(b"\0")
+            h.update(str(part).encode("utf-8"))
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.tex")
+
+    def get(self, key):
+        if key in self.memory:
+            self.hits += 1
+            return self.memory[key]
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.memory[key] = text
+        self.hits += 1
+        return text
+
+    def put(self, key, text):
+        self.memory[key] = text
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def invalidate(self):
+        self.memory.clear()
+        names = [name for name in os.listdir(self.cache_dir) if name.endswith(".tex")]
+        for name in names:
+            os.remove(os.path.join(self.cache_dir, name))
+        return len(names)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "dir": self.cache_dir}
+
+
+class ReportBuilder:
+    def __init__(self, cache=None, width=70):
+        """
+        Args:
+            cache (LatexCache): 渲染缓存，默认 LatexCache()；传 False 不使用缓存
+            width (int): 单行公式的最大估计宽度（字符数），超过时拆行
+        """
+        self.cache = LatexCache() if cache is None else (cache or None)
+        self.width = width
+
+    def section_keys(self, desc, expr, numbered=True, symbol="A"):
+        """(渲染缓存键, 本节指纹)；只需要 srepr，比 latex 快得多"""
+        key = LatexCache.make_key(srepr(expr), numbered, self.width, symbol)
+        return key, LatexCache.make_key(key, desc)
+
+    def render_section(self, desc, expr, numbered=True, symbol="A", key=None):
+        """返回本节 LaTeX；渲染结果查缓存"""
+        key = key or self.section_keys(desc, expr, numbered, symbol)[0]
+        body = self.cache.get(key) if self.cache else None
+        if body is None:
+            body = render(expr, numbered, self.width, symbol)
+            if self.cache:
+                self.cache.put(key, body)
+        head = f"\\subsection*{{{desc}}}\n" if desc else ""
+        return head + body
+
+    @staticmethod
+    def _fingerprint(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                first = f.readline()
+        except FileNotFoundError:
+            return None
+        return first[len("% fingerprint: "):].strip() if first.startswith("% fingerprint: ") else None
+
+    def write(self, filename, sections, title=None):
+        """
+        写出报告。
+        Args:
+            filename (str): 主文件路径，各节写在同名目录下
+            sections (iterable): [(描述, 表达式或返回表达式的函数, 是否编号[, 矩阵元素符号]), ...]
+            title (str, optional): 文档标题
+        Returns:
+            dict: sections（节数）、written（重写的节数）、elapsed（秒）
+        """
+        t0 = time.perf_counter()
+        folder, base = os.path.split(os.path.abspath(filename))
+        stem = os.path.splitext(base)[0]
+        section_dir = os.path.join(folder, stem)
+        lines = PREAMBLE + [
+            "",
+            rf"\title{{{title or '自动生成的LaTeX文档'}}}",
+            r"\author{EulerBeam 自动生成}",
+            r"\date{\today}",
+            "",
+            r"\begin{document}",
+            r"\maketitle",
+            "",
+        ]
+        if title:
+            lines.append(f"\\section*{{{title}}}\n")
+        count = written = 0
+        for count, (desc, expr, numbered, *symbol) in enumerate(sections, 1):
+            if callable(expr):
+                expr = expr()
+            # 指纹只依赖输入，先比对，没变就跳过渲染和写盘
+            render_key, key = self.section_keys(desc, expr, numbered, *symbol)
+            name = f"sec{count:02d}"
+            path = os.path.join(section_dir, f"{name}.tex")
+            if self._fingerprint(path) != key:
+                os.makedirs(section_dir, exist_ok=True)
+                text = self.render_section(desc, expr, numbered, *symbol, key=render_key)
+                tmp = f"{path}.{os.getpid()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(f"% fingerprint: {key}\n% {desc}\n{text}")
+                os.replace(tmp, path)
+                written += 1
+            lines.append(f"\\input{{{stem}/{name}}}")
+        lines.append(r"\end{document}")
+        # 上次多出来的节
+        for name in os.listdir(section_dir) if os.path.isdir(section_dir) else []:
+            m = re.fullmatch(r"sec(\d+)\.tex", name)
+            if m and int(m.group(1)) > count:
+                os.remove(os.path.join(section_dir, name))
+        text = "\n".join(lines)
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                unchanged = f.read() == text
+        except FileNotFoundError:
+            unchanged = False
+        if not unchanged:
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write(text)
+        return {"sections": count, "written": written, "elapsed": time.perf_counter() - t0}
+
+
+def beam_sections(beam):
+    """EulerBeam 报告的标准各节；表达式延迟到写到该节时才推导"""
+    return [
+        ("边界条件 bc1", lambda: beam.bc1, True),
+        ("边界条件 bc2", lambda: beam.bc2, True),
+        ("边界条件 bc3", lambda: beam.bc3, True),
+        ("边界条件 bc4", lambda: beam.bc4, True),
+        ("系数矩阵 M\\_c", lambda: beam.M_c, False, "M"),
+        ("最终结果 det", lambda: beam.det, True),
+        ("简化结果 det\\_simple", lambda: beam.det_simple, True),
+    ]
+
+
+# ------------------ 主程序 ------------------
+if __name__ == "__main__":
+    from formula import EulerBeam
+    from cache import DerivationCache
+    from parallel import VARIANTS
+
+    builder = ReportBuilder()
+    variants = {"cantilever": (None, None), **VARIANTS}
+    for run in (1, 2):
+        t0 = time.perf_counter()
+        written = 0
+        for name, (fixed, free) in variants.items():
+            beam = EulerBeam(fixed, free, cache=DerivationCache(), simplify_mode="fast")
+            try:
+                written += builder.write(f"latex/{name}.tex", beam_sections(beam), title=name)["written"]
+            except ValueError as e:
+                print(f"  {name} 跳过：{e}")
+        print(f"第 {run} 次：{len(variants)} 份报告，重写 {written} 节，用时 {time.perf_counter() - t0:.2f} s，"
+              f"渲染缓存 {builder.cache.stats()}")
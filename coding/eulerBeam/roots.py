@@ -0,0 +1,171 @@
+import numpy as np
+
+"""
+向量化的有界求根：用 np.signbit / np.nonzero 找变号区间，再对所有区间同时迭代加密。
+可选后端：bisect（二分）、illinois（改进的试位法）、newton（带区间保护的牛顿法，需要导数）。
+"""
+
+METHODS = ("bisect", "illinois", "newton")
+
+
+def sign_changes(vals):
+    """沿最后一维找变号位置，返回 np.nonzero 的结果（区间为 [i, i+1]）"""
+    s = np.signbit(vals)
+    return np.nonzero(s[..., :-1] != s[..., 1:])
+
+
+def _bisect(f, lo, hi, args, tol, max_iter):
+    flo = f(lo, *args)
+    for _ in range(max_iter):
+        mid = (lo + hi) / 2
+        fm = f(mid, *args)
+        left = np.signbit(flo) != np.signbit(fm)
+        hi = np.where(left, mid, hi)
+        lo = np.where(left, lo, mid)
+        flo = np.where(left, flo, fm)
+        if np.all((hi - lo) / 2 < tol):
+            break
+    return (lo + hi) / 2
+
+
+def _illinois(f, lo, hi, args, tol, max_iter):
+    a, b = lo, hi
+    fa, fb = f(a, *args), f(b, *args)
+    for _ in range(max_iter):
+        denom = fb - fa
+        c = np.where(denom != 0, b - fb * (b - a) / np.where(denom != 0, denom, 1), (a + b) / 2)
+        fc = f(c, *args)
+        flip = np.signbit(fc) != np.signbit(fb)
+        # c 与 b 异号：旧 b 成为新的另一端；否则保留 a 并把 fa 减半（Illinois 修正）
+        a, fa = np.where(flip, b, a), np.where(flip, fb, fa / 2)
+        done = (np.abs(c - b) < tol) | (fc == 0)
+        b, fb = c, fc
+        if np.all(done):
+            break
+    return b
+
+
+def _newton(f, df, lo, hi, args, tol, max_iter):
+    flo = f(lo, *args)
+    x = (lo + hi) / 2
+    for _ in range(max_iter):
+        fx = f(x, *args)
+        left = np.signbit(flo) != np.signbit(fx)
+        hi = np.where(left, x, hi)
+        lo = np.where(left, lo, x)
+        flo = np.where(left, flo, fx)
+        xn = x - fx / df(x, *args)
+        # 牛顿步跳出区间或导数为零时退回二分（收敛时 x 本身就是刚更新的端点，落在端点上不算跳出）
+        bad = ~np.isfinite(xn) | (xn < lo) | (xn > hi)
+        xn = np.where(bad, (lo + hi) / 2, xn)
+        done = (np.abs(xn - x) < tol) | (fx == 0)
+        x = np.where(fx == 0, x, xn)
+        if np.all(done):
+            break
+    return x
+
+
+def refine(f, lo, hi, args=(), method="illinois", df=None, tol=1e-12, max_iter=200):
+    """
+    对一组变号区间同时求根。
+    Args:
+        f: 向量化函数 f(x, *args)
+        lo, hi: 区间端点数组
+        args: 与 lo/hi 同形（或可广播）的附加参数
+        method: "bisect" / "illinois" / "newton"
+        df: 导数 df(x, *args)，method="newton" 时必需
+    """
+    lo = np.asarray(lo)
+    hi = np.asarray(hi)
+    if not np.issubdtype(lo.dtype, np.floating):
+        lo, hi = lo.astype(float), hi.astype(float)
+    if lo.size == 0:
+        return lo.copy()
+    # 单精度时 tol 不能小于机器精度量级，否则迭代永远达不到收敛条件
+    tol = max(tol, 4 * np.finfo(lo.dtype).eps * float(np.max(np.abs(hi))))
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        if method == "bisect":
+            return _bisect(f, lo, hi, args, tol, max_iter)
+        if method == "illinois":
+            return _illinois(f, lo, hi, args, tol, max_iter)
+        if method == "newton":
+            if df is None:
+                raise ValueError("newton 方法需要导数 df")
+            return _newton(f, df, lo, hi, args, tol, max_iter)
+    raise ValueError(f"未知求根方法 {method!r}，可选 {METHODS}")
+
+
+def asymptotic_guess(k):
+    """悬臂梁类特征方程第 k 阶根的渐近位置 (2k-1)π/2"""
+    return (2 * k - 1) * np.pi / 2
+
+
+def _scan(f, lo, hi, args, points, max_depth):
+    """
+    在 [lo, hi] 上均匀取 points 个点，返回第一个变号区间，没有则返回 None。
+    第一个变号之前 |f| 的局部极小处（同号的凹陷）可能藏着一对相距很近的根，
+    在凹陷两侧的子区间内加密重扫（最多 max_depth 级），找到变号就取它。
+    """
+    xs = np.linspace(lo, hi, points)
+    vals = f(xs, *args)
+    idx = sign_changes(vals)[0]
+    end = idx[0] if idx.size else xs.size - 1
+    a = np.abs(vals[:end + 1])
+    dips = np.nonzero((a[1:-1] < a[:-2]) & (a[1:-1] <= a[2:]))[0] + 1
+    if max_depth > 0:
+        for i in dips:
+            bracket = _scan(f, xs[i - 1], xs[i + 1], args, points, max_depth - 1)
+            if bracket is not None:
+                return bracket
+    if idx.size:
+        return xs[idx[0]], xs[idx[0] + 1]
+    return None
+
+
+def adaptive_brackets(f, n, args=(), x_min=1e-6, x_max=None, points=16, max_depth=6, predict=None):
+    """
+    由粗到细地寻找前 n 个根的变号区间，计算量随阶数增长，而与 x_max/step 无关。
+    每阶从上一阶区间的右端一直扫描到预测位置之后，步长为已找到的根的平均间距的 1/points，
+    不会跳过两者之间的根；扫描中 |f| 同号的凹陷处再加密，找出相距很近的一对根（见 _scan）。
+    到预测位置仍没有变号时，按平均间距逐段向后扫描（相邻两段重叠一个步长）。
+    Args:
+        predict: predict(k, centers) -> 第 k 阶根的预测位置，centers 为已找到区间的中点；
+                 缺省时前两阶用 asymptotic_guess，之后按最近两阶的间距外推
+        points: 每个平均间距内的取点数
+        max_depth: 凹陷处加密的最大级数
+    Returns:
+        (lo, hi) 两个数组，长度可能小于 n（到达 x_max 仍未找到）
+    """
+    los, his, centers = [], [], []
+    lo = x_min
+    for k in range(1, n + 1):
+        if predict is not None:
+            pred = predict(k, centers)
+        elif len(centers) >= 2:
+            pred = 2 * centers[-1] - centers[-2]
+        else:
+            pred = asymptotic_guess(k)
+        # 平均间距比最近两阶的间距稳健（多段梁的谱不规则，可能有相距很近的一对根）
+        spacing = (centers[-1] - centers[0]) / (len(centers) - 1) if len(centers) >= 2 else np.pi
+        hi = max(pred, lo) + spacing / 4
+        bracket = None
+        while bracket is None:
+            if x_max is not None and lo >= x_max:
+                break
+            if x_max is not None:
+                hi = min(hi, x_max)
+            count = max(points, int(np.ceil((hi - lo) / spacing * points)) + 1)
+            bracket = _scan(f, lo, hi, args, count, max_depth)
+            if bracket is None:
+                if x_max is not None and hi >= x_max:
+                    break
+                # 下一段往回重叠一个步长：上一段末点处的凹陷在下一段里成为内点，才能被检测到
+                lo, hi = hi - (hi - lo) / (count - 1), hi + spacing
+        if bracket is None:
+            break
+        los.append(bracket[0])
+        his.append(bracket[1])
+        centers.append((bracket[0] + bracket[1]) / 2)
+        # 下一阶从本区间右端之后开始
+        lo = bracket[1]
+    return np.array(los), np.array(his)
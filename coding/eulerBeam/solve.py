@@ -1,33 +1,74 @@
 import numpy as np
 from math import sqrt, pi
-from sympy import lambdify
-from formula import EulerBeam
+from roots import sign_changes, refine, adaptive_brackets
+from kernels import load_kernel, get_kernel
+from profiling import stage, counted
 
 
 class BeamModel:
-    def __init__(self, params: dict):
-        """初始化并计算派生参数"""
+    def __init__(self, params: dict, cache=None, kernel="auto", scaled=True):
+        """
+        初始化并计算派生参数。
+        kernel: "auto" 加载缓存目录中已生成的默认数值核（没有时推导一次并导出），运行时不导入 SymPy；
+                也可以给出 EulerBeam.export_kernel 生成的模块或 .py 路径；
+                None 表示走符号推导 + lambdify（scaled=False 时总是如此）
+        cache: 符号推导时使用的推导缓存，默认使用磁盘缓存，热启动时跳过符号推导
+        scaled: 使用指数缩放后的 det_scaled（高阶时不溢出），False 时使用原始 det_simple
+        """
         self.params = params.copy()
+        self.scaled = scaled
         self._compute_derived_params()
-        self._build_det_function()
-        self.beam = EulerBeam()
-        
+        self.beam = None
+        self.kernel = None
+        if kernel == "auto":
+            kernel = get_kernel() if scaled and cache is None else None
+        if kernel is not None:
+            self.kernel = load_kernel(kernel)
+            self._bind_kernel()
+        else:
+            # SymPy 较重，只在需要推导时才导入
+            from formula import EulerBeam
+            from cache import DerivationCache
+            # 数值计算只需要 det_scaled，用 fast 化简跳过昂贵的 simplify
+            self.beam = EulerBeam(cache=cache if cache is not None else DerivationCache(), simplify_mode="fast")
+            self._build_det_function()
 
+    @stage()
     def _compute_derived_params(self):
         """根据输入参数计算派生参数"""
         p = self.params
         p["I"] = pi / 64 * (p["D"]**4 - p["d"]**4)
         p["m"] = p["rho"] * pi / 4 * (p["D"]**2 - p["d"]**2)
 
+    @stage()
+    def _bind_kernel(self):
+        """把 m, M, L 绑定到数值核上，得到 f(a)、f'(a)"""
+        p = self.params
+        k = self.kernel
+        args = (p["m"], p["M"], p["L"])
+        self.f = lambda a: k.f(a, *args)
+        self.df = lambda a: k.df(a, *args)
+
+    @stage()
     def _build_det_function(self):
         """构建特征方程 f(a)"""
+        from sympy import lambdify
         p = self.params
-        det_expr = self.beam.det_simple.subs({
+        expr = self.beam.det_scaled if self.scaled else self.beam.det_simple
+        self.det_expr = expr.subs({
             self.beam.m: p["m"],
             self.beam.M: p["M"],
             self.beam.L: p["L"],
         })
-        self.f = lambdify(self.beam.a, det_expr, "numpy")
+        self.f = lambdify(self.beam.a, self.det_expr, "numpy")
+        self.df = None
+
+    def _build_derivative(self):
+        """构建 f'(a)，仅牛顿法需要，按需生成"""
+        if self.df is None:
+            from sympy import lambdify, diff
+            self.df = lambdify(self.beam.a, diff(self.det_expr, self.beam.a), "numpy")
+        return self.df
 
     # ------------------ 数值方法 ------------------
     @staticmethod
@@ -47,19 +88,56 @@ class BeamModel:
                 a, fa = m, fm
         return m
 
-    def find_roots(self, n=3, x_max=50, step=1e-3):
-        """扫描区间并自动用二分法求前n个正根"""
+    @stage()
+    def find_roots(self, n=3, x_max=50, step=1e-3, method="illinois", scan="grid"):
+        """
+        扫描区间并求前n个正根。
+        method: "scalar" 为逐个区间调用 bisection 的原始实现（两种 scan 都适用）；
+                "bisect" / "illinois" / "newton" 为 roots.refine 的向量化后端。
+        scan: "grid" 在 [1e-6, x_max] 上按 step 均匀扫描；
+              "adaptive" 从上一个根向预测位置逐阶扫描（见 roots.adaptive_brackets），
+              此时 x_max 只是上限，传 None 表示不限。
+        """
+        df = self._build_derivative() if method == "newton" else None
+        # 未开启 profiling 时 counted 原样返回函数
+        scan_f = counted("BeamModel.find_roots.scan", self.f)
+        refine_f = counted("BeamModel.find_roots.refine", self.f)
+        if df is not None:
+            df = counted("BeamModel.find_roots.refine_df", df)
+        bisect_f = counted("BeamModel.bisection", self.f)
+        if scan == "adaptive":
+            lo, hi = adaptive_brackets(scan_f, n, x_max=x_max)
+            if method == "scalar":
+                return [self.bisection(bisect_f, a, b) for a, b in zip(lo, hi)]
+            return list(refine(refine_f, lo, hi, method=method, df=df))
         xs = np.arange(1e-6, x_max, step)
-        vals = self.f(xs)
+        vals = scan_f(xs)
+        if method != "scalar":
+            idx = sign_changes(vals)[0][:n]
+            return list(refine(refine_f, xs[idx], xs[idx + 1], method=method, df=df))
         roots = []
         for i in range(len(xs) - 1):
             if vals[i] * vals[i + 1] < 0:
-                root = self.bisection(self.f, xs[i], xs[i + 1])
+                root = self.bisection(bisect_f, xs[i], xs[i + 1])
                 roots.append(root)
                 if len(roots) >= n:
                     break
         return roots
 
+    def mode_shapes(self, roots, x, normalize="mass", n_quad=200):
+        """
+        在坐标数组 x 上计算各阶归一化振型 (阶数 × 点数) 及模态质量、参与系数，见 modes.ModeShapes.modal。
+        使用数值核构造时会在这里补建 EulerBeam（振型只用到边界条件，不做行列式推导）。
+        """
+        if self.beam is None:
+            from formula import EulerBeam
+            from cache import DerivationCache
+            self.beam = EulerBeam(cache=DerivationCache(), simplify_mode="fast")
+        if getattr(self, "_modes", None) is None:
+            from modes import ModeShapes
+            self._modes = ModeShapes(self.beam)
+        return self._modes.modal(roots, x, self.params, normalize=normalize, n_quad=n_quad)
+
     def natural_frequency(self, r):
         """根据特征根计算固有频率"""
         p = self.params
@@ -0,0 +1,306 @@
+import json
+import os
+
+import numpy as np
+
+"""
+参数扫描结果的列式存储（只依赖 NumPy）。
+每列按 chunk_rows 行分块保存为 <列名>/<块号>.npy，写入和查询都通过内存映射进行，不需要把整列读进内存。
+meta.json 记录已提交的行数和每块各列的最小 / 最大值：
+  - 追加时先写数据、flush 内存映射，最后原子替换 meta.json，进程中途崩溃时最多丢掉未提交的那一批，
+    重新打开后从已提交的行数继续写；
+  - 读者只看 meta.json 中已提交的行，可以和写入进程同时运行（refresh 重新读取）；
+  - 范围查询先用每块的最小 / 最大值跳过不可能命中的块，再在块内做向量化比较。
+
+    store = ResultStore("results", n_modes=3)
+    store.append(p, roots, freqs)                # p 为 BeamSweep.derived_params 的结果
+    rows = store.where(f1=(2.0, 3.0), L=(None, 4.0))
+    data = store.read(rows, ["D", "L", "f1"])
+"""
+
+PARAM_COLUMNS = ("E", "D", "d", "L", "M", "rho", "I", "m")
+STORE_VERSION = 1
+
+
+class ResultStore:
+    def __init__(self, path, n_modes=None, chunk_rows=1 << 16, dtype=np.float64):
+        """
+        打开已有的存储，不存在时新建（此时需要 n_modes）。
+        Args:
+            path (str): 存储目录
+            n_modes (int): 每个设计保存的阶数，列 r1..rn（特征根）、f1..fn（频率 Hz）
+            chunk_rows (int): 每块行数
+            dtype: 新建时各列的数据类型
+        """
+        self.path = os.path.abspath(path)
+        self.meta_path = os.path.join(self.path, "meta.json")
+        self._open = {}     # (列名, 块号) -> 可写的内存映射，只保留正在写的最后一块
+        if os.path.exists(self.meta_path):
+            self.refresh()
+            if n_modes is not None and n_modes != self.meta["n_modes"]:
+                raise ValueError(f"存储中为 {self.meta['n_modes']} 阶，与 n_modes={n_modes} 不符")
+            return
+        if n_modes is None:
+            raise ValueError(f"{self.path} 中没有结果存储，新建时需要给出 n_modes")
+        columns = list(PARAM_COLUMNS) + [f"r{i}" for i in range(1, n_modes + 1)] + [f"f{i}" for i in range(1, n_modes + 1)]
+        self.meta = {
+            "version": STORE_VERSION,
+            "n_modes": n_modes,
+            "chunk_rows": int(chunk_rows),
+            "dtype": np.dtype(dtype).str,
+            "columns": columns,
+            "rows": 0,
+            "stats": [],    # 每块 {列名: [min, max]}
+        }
+        os.makedirs(self.path, exist_ok=True)
+        self._save_meta()
+
+    # ------------------ 元数据 ------------------
+    @property
+    def columns(self):
+        return self.meta["columns"]
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def refresh(self):
+        """重新读取 meta.json（读者用来看到写入进程新提交的行）"""
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        return len(self)
+
+    def _save_meta(self):
+        tmp = f"{self.meta_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.meta_path)
+
+    def _chunk_path(self, column, chunk):
+        return os.path.join(self.path, column, f"{chunk:06d}.npy")
+
+    def _chunk_rows(self, chunk):
+        """第 chunk 块中已提交的行数"""
+        size = self.meta["chunk_rows"]
+        return max(0, min(size, len(self) - chunk * size))
+
+    # ------------------ 写入 ------------------
+    def _writable(self, column, chunk):
+        key = (column, chunk)
+        if key not in self._open:
+            path = self._chunk_path(column, chunk)
+            if os.path.exists(path):
+                # 续写：之前的进程可能已经写了一部分（已提交部分之后的内容会被覆盖）
+                self._open[key] = np.load(path, mmap_mode="r+")
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                self._open[key] = np.lib.format.open_memmap(
+                    path, mode="w+", dtype=np.dtype(self.meta["dtype"]), shape=(self.meta["chunk_rows"],))
+        return self._open[key]
+
+    def append_columns(self, data, commit=True):
+        """
+        追加若干行。data 为 {列名: 一维数组}，须包含全部列且长度相同。
+        commit=False 时只写数据不提交，之后调用 flush 一并提交。
+        """
+        missing = set(self.columns) - set(data)
+        if missing:
+            raise KeyError(f"缺少列：{', '.join(sorted(missing))}")
+        arrays = {c: np.ravel(np.asarray(data[c])) for c in self.columns}
+        n = len(arrays[self.columns[0]])
+        if any(len(a) != n for a in arrays.values()):
+            raise ValueError("各列长度不一致")
+        size = self.meta["chunk_rows"]
+        start = self.meta.get("pending", len(self))
+        done = 0
+        while done < n:
+            chunk, offset = divmod(start + done, size)
+            take = min(n - done, size - offset)
+            for c in self.columns:
+                self._writable(c, chunk)[offset:offset + take] = arrays[c][done:done + take]
+            done += take
+        self.meta["pending"] = start + n
+        if commit:
+            self.flush()
+        return start + n
+
+    def append(self, p, roots, freqs, commit=True):
+        """
+        追加一批扫描结果。
+        Args:
+            p (dict): BeamSweep.derived_params 的结果（含 E, D, d, L, M, rho, I, m）
+            roots, freqs: (设计数 × 阶数) 数组，阶数多于存储的阶数时截断
+        """
+        n_modes = self.meta["n_modes"]
+        roots = np.asarray(roots).reshape(len(np.atleast_1d(p["m"])), -1)
+        freqs = np.asarray(freqs).reshape(roots.shape)
+        if roots.shape[1] < n_modes:
+            raise ValueError(f"结果只有 {roots.shape[1]} 阶，存储需要 {n_modes} 阶")
+        data = {k: np.broadcast_to(p[k], roots.shape[:1]) for k in PARAM_COLUMNS}
+        for i in range(n_modes):
+            data[f"r{i + 1}"] = roots[:, i]
+            data[f"f{i + 1}"] = freqs[:, i]
+        return self.append_columns(data, commit=commit)
+
+    def flush(self):
+        """把已写入的数据落盘，更新涉及到的块的最小 / 最大值，再原子提交新的行数"""
+        pending = self.meta.pop("pending", len(self))
+        if pending == len(self):
+            return len(self)
+        size = self.meta["chunk_rows"]
+        first, last = len(self) // size, (pending - 1) // size
+        for (c, chunk), mm in list(self._open.items()):
+            mm.flush()
+        stats = self.meta["stats"]
+        for chunk in range(first, last + 1):
+            rows = min(size, pending - chunk * size)
+            entry = {}
+            for c in self.columns:
+                block = self._writable(c, chunk)[:rows]
+                if np.isnan(block).all():
+                    entry[c] = [None, None]
+                else:
+                    entry[c] = [float(np.nanmin(block)), float(np.nanmax(block))]
+            if chunk < len(stats):
+                stats[chunk] = entry
+            else:
+                stats.append(entry)
+        self.meta["rows"] = pending
+        self._save_meta()
+        # 写满的块不会再改，释放映射
+        for key in [k for k in self._open if k[1] < pending // size]:
+            del self._open[key]
+        return pending
+
+    def close(self):
+        self.flush()
+        self._open.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------ 查询 ------------------
+    def chunk(self, column, chunk):
+        """第 chunk 块中已提交部分的只读内存映射"""
+        rows = self._chunk_rows(chunk)
+        return np.load(self._chunk_path(column, chunk), mmap_mode="r")[:rows]
+
+    def n_chunks(self):
+        size = self.meta["chunk_rows"]
+        return -(-len(self) // size)
+
+    def column(self, name):
+        """逐块迭代某列（每次一个内存映射块）"""
+        for chunk in range(self.n_chunks()):
+            yield self.chunk(name, chunk)
+
+    def where(self, **ranges):
+        """
+        范围过滤：where(f1=(2, 3), L=(None, 4.0)) 返回同时满足 2 <= f1 <= 3、L <= 4 的全局行号（升序）。
+        某端为 None 表示不限；NaN 不满足任何条件。
+        """
+        unknown = set(ranges) - set(self.columns)
+        if unknown:
+            raise KeyError(f"没有列：{', '.join(sorted(unknown))}")
+        size = self.meta["chunk_rows"]
+        hits = []
+        for chunk in range(self.n_chunks()):
+            if not self._may_match(chunk, ranges):
+                continue
+            mask = None
+            for name, (lo, hi) in ranges.items():
+                block = self.chunk(name, chunk)
+                cond = np.ones(block.shape, dtype=bool) if lo is None else block >= lo
+                if hi is not None:
+                    cond &= block <= hi
+                if lo is None and hi is None:
+                    cond &= ~np.isnan(block)
+                mask = cond if mask is None else mask & cond
+                if not mask.any():
+                    break
+            if mask is not None:
+                hits.append(np.flatnonzero(mask) + chunk * size)
+            else:
+                hits.append(np.arange(self._chunk_rows(chunk)) + chunk * size)
+        return np.concatenate(hits) if hits else np.empty(0, dtype=np.int64)
+
+    def _may_match(self, chunk, ranges):
+        stats = self.meta["stats"][chunk]
+        for name, (lo, hi) in ranges.items():
+            cmin, cmax = stats[name]
+            if cmin is None:
+                return False
+            if (lo is not None and cmax < lo) or (hi is not None and cmin > hi):
+                return False
+        return True
+
+    def read(self, rows=None, columns=None):
+        """读取给定行（全局行号，升序）的若干列，返回 {列名: 数组}；rows 为 None 时读全部"""
+        columns = columns or self.columns
+        if rows is None:
+            return {c: np.concatenate(list(self.column(c))) if len(self) else np.empty(0) for c in columns}
+        rows = np.asarray(rows, dtype=np.int64)
+        size = self.meta["chunk_rows"]
+        chunks = rows // size
+        out = {c: np.empty(rows.size, dtype=np.dtype(self.meta["dtype"])) for c in columns}
+        # 行号有序时同一块的行是连续的一段
+        bounds = np.flatnonzero(np.diff(chunks)) + 1
+        for seg in np.split(np.arange(rows.size), bounds):
+            if seg.size == 0:
+                continue
+            chunk = int(chunks[seg[0]])
+            local = rows[seg] - chunk * size
+            for c in columns:
+                out[c][seg] = self.chunk(c, chunk)[local]
+        return out
+
+
+# ------------------ 主程序 ------------------
+if __name__ == "__main__":
+    import shutil
+    import tempfile
+    import time
+    from sweep import BeamSweep
+
+    folder = os.path.join(tempfile.mkdtemp(), "results")
+    n_designs, batch = 1_000_000, 100_000
+    rng = np.random.default_rng(0)
+    sweep = BeamSweep()
+    t0 = time.perf_counter()
+    with ResultStore(folder, n_modes=3) as store:
+        for start in range(0, n_designs, batch):
+            D = rng.uniform(0.06, 0.2, batch)
+            params = {"E": 2.06e11, "D": D, "d": D - rng.uniform(0.003, 0.01, batch),
+                      "L": rng.uniform(2.0, 6.0, batch), "M": rng.uniform(0.0, 50.0, batch), "rho": 7850}
+            p = BeamSweep.derived_params(params)
+            # 写入用的结果用渐近公式代替求根，只测存储本身
+            roots = np.array([1.875, 4.694, 7.855])[None, :] * (1 + 0.1 * rng.random((batch, 1)))
+            store.append(p, roots, BeamSweep.natural_frequency(p, roots))
+    print(f"写入 {n_designs} 行：{time.perf_counter() - t0:.2f} s")
+
+    reader = ResultStore(folder)
+    t0 = time.perf_counter()
+    rows = reader.where(f1=(2.0, 3.0))
+    t_query = time.perf_counter() - t0
+    data = reader.read(rows, ["D", "L", "f1"])
+    assert ((data["f1"] >= 2.0) & (data["f1"] <= 3.0)).all()
+    full = reader.read(columns=["f1"])["f1"]
+    assert np.array_equal(rows, np.flatnonzero((full >= 2.0) & (full <= 3.0)))
+    print(f"f1 ∈ [2, 3] Hz：{rows.size} 行，查询 {t_query * 1e3:.1f} ms")
+
+    t0 = time.perf_counter()
+    rows = reader.where(L=(5.9, None), f1=(None, 3.0))
+    print(f"L >= 5.9 且 f1 <= 3 Hz：{rows.size} 行，查询 {(time.perf_counter() - t0) * 1e3:.1f} ms")
+
+    # 真实的扫描结果：续写到同一个存储
+    D = np.linspace(0.089, 0.168, 20)
+    params = {"E": 2.06e11, "D": D, "d": D - 0.005, "L": 3.3, "M": 15.4, "rho": 7850}
+    with ResultStore(folder) as store:
+        freqs, roots = sweep.run(params, n=3, return_roots=True)
+        store.append(BeamSweep.derived_params(params), roots, freqs)
+    print(f"续写后共 {len(reader)} 行（刷新前），{reader.refresh()} 行（刷新后）")
+    shutil.rmtree(os.path.dirname(folder))
@@ -0,0 +1,132 @@
+import numpy as np
+from math import pi
+from roots import sign_changes, refine
+from kernels import load_kernel, get_kernel
+
+"""
+批量参数扫描：特征方程（默认为指数缩放后的 det_scaled）只 lambdify 一次（m, M, L 保留为符号参数），
+对 (设计数 × a 网格) 的二维数组一次性求值，返回 (设计数 × 阶数) 的固有频率数组。
+"""
+
+
+class BeamSweep:
+    def __init__(self, beam=None, cache=None, kernel="auto", scaled=True):
+        """
+        kernel: "auto" 使用缓存的默认数值核（不导入 SymPy）；也可给出 export_kernel 生成的模块或路径；
+                None 表示对 beam 做 lambdify
+        beam 缺省时按默认边界条件构造（走磁盘缓存）；给出 beam、cache 或 scaled=False 时不使用 "auto" 数值核
+        """
+        if kernel == "auto":
+            kernel = get_kernel() if beam is None and cache is None and scaled else None
+        if kernel is not None:
+            self.beam = None
+            self.kernel = load_kernel(kernel)
+            self.f, self.df = self.kernel.f, self.kernel.df
+            return
+        from sympy import lambdify
+        from formula import EulerBeam
+        from cache import DerivationCache
+        self.beam = beam or EulerBeam(cache=cache if cache is not None else DerivationCache(), simplify_mode="fast")
+        self.kernel = None
+        b = self.beam
+        self.expr = b.det_scaled if scaled else b.det_simple
+        self.f = lambdify((b.a, b.m, b.M, b.L), self.expr, "numpy")
+        self.df = None
+
+    def _derivative(self, method):
+        """牛顿法才需要 f'(a)，按需生成"""
+        if method != "newton":
+            return None
+        if self.df is None:
+            from sympy import lambdify, diff
+            b = self.beam
+            self.df = lambdify((b.a, b.m, b.M, b.L), diff(self.expr, b.a), "numpy")
+        return self.df
+
+    @staticmethod
+    def derived_params(params: dict, dtype=np.float64):
+        """把参数广播成一维数组，并计算 I、m"""
+        keys = ("E", "D", "d", "L", "M", "rho")
+        arrays = np.broadcast_arrays(*(np.asarray(params[k], dtype=dtype) for k in keys))
+        p = {k: np.ravel(v) for k, v in zip(keys, arrays)}
+        p["I"] = pi / 64 * (p["D"]**4 - p["d"]**4)
+        p["m"] = p["rho"] * pi / 4 * (p["D"]**2 - p["d"]**2)
+        return p
+
+    def find_roots(self, p: dict, n=3, x_max=50, step=1e-3, chunk=None, method="illinois"):
+        """对每个设计求前 n 个正根，找不到的位置为 NaN；method 见 roots.refine"""
+        dtype = p["m"].dtype
+        xs = np.arange(1e-6, x_max, step, dtype=dtype)
+        N = p["m"].size
+        roots = np.full((N, n), np.nan, dtype=dtype)
+        # 按设计分块，控制 (块大小 × 网格数) 数组的内存占用
+        chunk = chunk or max(1, int(8e6 // xs.size))
+        for start in range(0, N, chunk):
+            sl = slice(start, min(start + chunk, N))
+            m, M, L = (p[k][sl, None] for k in ("m", "M", "L"))
+            vals = self.f(xs[None, :], m, M, L)
+            rows, cols = sign_changes(vals)
+            if rows.size == 0:
+                continue
+            # 每个设计内的变号序号，只保留前 n 个
+            first = np.searchsorted(rows, rows, side="left")
+            rank = np.arange(rows.size) - first
+            keep = rank < n
+            rows, cols, rank = rows[keep], cols[keep], rank[keep]
+            args = (m[rows, 0], M[rows, 0], L[rows, 0])
+            roots[start + rows, rank] = refine(
+                self.f, xs[cols], xs[cols + 1], args, method=method, df=self._derivative(method)
+            )
+        return roots
+
+    @staticmethod
+    def natural_frequency(p: dict, roots):
+        """roots 形状 (设计数 × 阶数)，返回同形的固有频率 (Hz)"""
+        scale = np.sqrt(p["E"] * p["I"] / (p["m"] * p["L"]**4)) / (2 * pi)
+        return roots**2 * scale[:, None]
+
+    def run(self, params: dict, n=3, x_max=50, step=1e-3, method="illinois", return_roots=False, dtype=np.float64):
+        """
+        params 中各值可为标量或数组（按 NumPy 规则广播），返回 (设计数 × n) 的频率数组。
+        dtype=np.float32 时整个扫描以单精度进行（缩放后的特征方程不会溢出），吞吐量更高。
+        """
+        p = self.derived_params(params, dtype=dtype)
+        roots = self.find_roots(p, n=n, x_max=x_max, step=step, method=method)
+        freqs = self.natural_frequency(p, roots)
+        if return_roots:
+            return freqs, roots
+        return freqs
+
+    def run_to_store(self, params: dict, store, n=3, batch=100_000, x_max=50, step=1e-3, method="illinois"):
+        """
+        分批扫描并把每批结果追加到 store.ResultStore，每批提交一次；
+        store 中已有 k 行时跳过前 k 个设计，中断后用同样的 params 重新调用即可续算。
+        """
+        p = self.derived_params(params)
+        N = p["m"].size
+        for start in range(len(store), N, batch):
+            part = {k: v[start:start + batch] for k, v in p.items()}
+            roots = self.find_roots(part, n=n, x_max=x_max, step=step, method=method)
+            store.append(part, roots, self.natural_frequency(part, roots))
+        return len(store)
+
+
+# ------------------ 主程序 ------------------
+if __name__ == "__main__":
+    # 管径、壁厚、长度、顶端质量的组合
+    D = np.linspace(0.089, 0.168, 10)
+    L = np.linspace(2.5, 4.5, 10)
+    M = np.linspace(5.0, 30.0, 10)
+    DD, LL, MM = np.meshgrid(D, L, M, indexing="ij")
+    params = {
+        "E": 2.06e11,
+        "D": DD,
+        "d": DD - 0.005,
+        "L": LL,
+        "M": MM,
+        "rho": 7850,
+    }
+    freqs = BeamSweep().run(params, n=3)
+    print(f"设计数 {freqs.shape[0]}，阶数 {freqs.shape[1]}")
+    print("前5个设计的固有频率 f (Hz):")
+    print(freqs[:5])
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+from sympy import lambdify
+import boundary
+from formula import EulerBeam
+from roots import adaptive_brackets, refine
+
+"""
+boundary 中各固定端条件的推导结果与解析解对比（M = 0 时）
+"""
+
+# 铰支-自由：tan r = tanh r；滑动-自由：tan r = -tanh r；固支-自由：cos r cosh r = -1
+EXPECTED = {
+    "clamped_base": [1.87510407, 4.69409113, 7.85475744],
+    "pinned_base": [3.92660231, 7.06858275, 10.21017612],
+    "sliding_base": [2.36502037, 5.49780392, 8.63937983],
+}
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_base_conditions_tip_mass(name):
+    beam = EulerBeam(getattr(boundary, name), boundary.tip_mass, simplify_mode="fast")
+    f = lambdify((beam.a, beam.m, beam.M, beam.L), beam.det_scaled, "numpy")
+    args = (10.0, 0.0, 3.3)
+    lo, hi = adaptive_brackets(f, 3, args=args)
+    np.testing.assert_allclose(refine(f, lo, hi, args), EXPECTED[name], rtol=1e-8)
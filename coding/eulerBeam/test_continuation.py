@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+import continuation
+from continuation import ContinuationSweep, serpentine_order
+from sweep import BeamSweep
+
+"""
+ContinuationSweep：二维 / 三维网格上与逐个网格扫描的 BeamSweep 一致，丢根、交叉、奇偶校验失败时退回完整扫描
+"""
+
+BASE = {"E": 2.06e11, "D": 0.114, "d": 0.109, "rho": 7850}
+
+
+@pytest.fixture(scope="module")
+def sweep():
+    return ContinuationSweep()
+
+
+def reference(sweep, params, n):
+    return BeamSweep(kernel=sweep.kernel).run(params, n=n, x_max=25)
+
+
+def single(sweep, **params):
+    p = sweep.derived_params(dict(BASE, **params))
+    return tuple(np.atleast_1d(p[k]).astype(float) for k in ("m", "M", "L"))
+
+
+def test_serpentine_order():
+    shape = (3, 4, 2)
+    order = serpentine_order(shape)
+    assert sorted(order) == list(range(24))
+    steps = np.abs(np.diff(np.array(np.unravel_index(order, shape)), axis=1)).sum(axis=0)
+    assert np.all(steps == 1)
+
+
+def test_grid_matches_beam_sweep(sweep):
+    params = dict(BASE, M=np.linspace(0.0, 40.0, 6)[:, None], L=np.linspace(2.0, 5.0, 25)[None, :])
+    freqs, roots = sweep.run(params, n=4, return_roots=True)
+    assert freqs.shape == (6, 25, 4)
+    np.testing.assert_allclose(freqs.reshape(-1, 4), reference(sweep, params, 4), rtol=1e-10)
+    # 绝大多数设计靠外推跟踪，只有少数完整扫描
+    assert sweep.stats["designs"] == 150
+    assert sweep.stats["tracked"] + sweep.stats["full_scans"] >= 150
+    assert sweep.stats["full_scans"] < 15
+
+
+def test_three_dimensional_grid(sweep):
+    D = np.array([0.09, 0.114])[:, None, None]
+    params = dict(BASE, D=D, d=D - 0.005, M=np.array([0.0, 10.0, 30.0])[None, :, None],
+                  L=np.linspace(2.5, 4.0, 8)[None, None, :])
+    freqs = sweep.run(params, n=3)
+    assert freqs.shape == (2, 3, 8, 3)
+    np.testing.assert_allclose(freqs.reshape(-1, 3), reference(sweep, params, 3), rtol=1e-10)
+
+
+def test_lost_roots_fall_back(sweep):
+    # 相邻设计相差很大：窄区间里找不到变号，整行退回完整扫描，结果仍然正确
+    params = dict(BASE, M=np.array([0.0, 500.0, 0.0, 2000.0]), L=np.array([1.0, 6.0, 1.0, 8.0]))
+    freqs = sweep.run(params, n=4)
+    assert sweep.stats["lost"] > 0 and sweep.stats["full_scans"] == 4
+    np.testing.assert_allclose(freqs.reshape(-1, 4), reference(sweep, params, 4), rtol=1e-10)
+
+
+def test_parity_detects_skipped_mode(sweep):
+    m, M, L = single(sweep, L=3.3, M=15.4)
+    exact = sweep.full_scan(m[0], M[0], L[0], 5)
+    sweep._reset_stats()
+    # 跟踪的“上一步”漏了第 3 阶：r2 与 r4 的中点、r4 与 r5 的中点之间夹着两个根，符号不交替
+    roots, ok = sweep.step(exact[[0, 1, 3]][None, :], None, m, M, L)
+    assert not ok[0] and sweep.stats["parity"] == 1
+    roots, ok = sweep.step(exact[:3][None, :], None, m, M, L)
+    assert ok[0]
+    np.testing.assert_allclose(roots[0], exact[:3], rtol=1e-12)
+
+
+def test_crossing_falls_back(sweep, monkeypatch):
+    # 让加密把第 2 阶收敛到第 1 阶上：判为交叉，退回完整扫描（完整扫描用的是 illinois）
+    refine = continuation.refine
+
+    def collapse(f, lo, hi, args=(), method="illinois", **kwargs):
+        out = refine(f, lo, hi, args, method=method, **kwargs)
+        if method == "newton":
+            out = out.copy()
+            out[1::3] = out[0::3]
+        return out
+
+    monkeypatch.setattr(continuation, "refine", collapse)
+    params = dict(BASE, M=15.4, L=np.linspace(3.0, 3.5, 6))
+    freqs = sweep.run(params, n=3)
+    assert sweep.stats["crossings"] == 5 and sweep.stats["tracked"] == 0
+    np.testing.assert_allclose(freqs.reshape(-1, 3), reference(sweep, params, 3), rtol=1e-10)
@@ -0,0 +1,30 @@
+import os
+import numpy as np
+import kernels
+from kernels import get_kernel, kernel_key, kernel_path
+
+"""
+数值核文件按推导指纹命名：源码改动后不再加载旧的数值核
+"""
+
+
+def test_key_follows_sources(tmp_path, monkeypatch):
+    extra = tmp_path / "extra.py"
+    extra.write_text("A = 1\n")
+    monkeypatch.setattr(kernels, "KEY_SOURCES", kernels.KEY_SOURCES + (str(extra),))
+    key = kernel_key()
+    assert kernel_key() == key
+    assert kernel_key("cantilever_free") != key
+    extra.write_text("A = 2\n")
+    assert kernel_key() != key
+
+
+def test_stale_kernel_not_loaded(tmp_path):
+    stale = tmp_path / "default_0000000000000000.py"
+    stale.write_text("def f(a, m, M, L):\n    return a * 0 + 1.0\n\ndef df(a, m, M, L):\n    return a * 0\n")
+    kernel = get_kernel(kernel_dir=str(tmp_path))
+    assert os.path.exists(kernel_path(kernel_dir=str(tmp_path)))
+    # 固支-自由、M = 0 的第一个根 1.8751
+    r = np.array([1.8, 1.9])
+    vals = kernel.f(r, 10.0, 0.0, 1.0)
+    assert np.signbit(vals[0]) != np.signbit(vals[1])
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+import boundary
+from formula import EulerBeam
+from modes import ModeShapes
+from solve import BeamModel
+from transfer import TransferBeam
+
+"""
+ModeShapes：高阶振型与 TransferBeam 一致（不溢出、无抵消误差），顶端转动惯量计入模态质量
+"""
+
+PARAMS = {"E": 2.06e11, "D": 0.114, "d": 0.109, "L": 3.3, "M": 15.4, "rho": 7850}
+
+
+def uniform(params):
+    return TransferBeam(params, [{"L": params["L"], "D": params["D"], "d": params["d"]}])
+
+
+def test_high_modes_match_transfer():
+    model = BeamModel(PARAMS)
+    roots = np.array(model.find_roots(n=30, scan="adaptive", x_max=None))
+    x = np.linspace(0, PARAMS["L"], 301)
+    ours, ref = model.mode_shapes(roots, x), uniform(PARAMS).mode_shapes(roots, x)
+    np.testing.assert_allclose(ours["shapes"], ref["shapes"], atol=1e-12)
+    np.testing.assert_allclose(ours["participation"], ref["participation"], atol=1e-12)
+    np.testing.assert_allclose(ours["modal_mass"], 1.0, rtol=1e-12)
+    # 顶端位移不为零，与 TransferBeam 同号
+    tip, ref_tip = ours["shapes"][:, -1], ref["shapes"][:, -1]
+    assert np.all(np.abs(tip) > 1e-3)
+    np.testing.assert_allclose(tip, ref_tip, rtol=1e-9)
+
+
+def test_max_normalization():
+    model = BeamModel(PARAMS)
+    roots = np.array(model.find_roots(n=20, scan="adaptive", x_max=None))
+    out = model.mode_shapes(roots, np.linspace(0, PARAMS["L"], 2001), normalize="max")
+    # 按积分点上的最大值归一，细网格上的峰值略大于 1
+    peaks = np.max(np.abs(out["shapes"]), axis=1)
+    assert np.all(peaks >= 1 - 1e-12) and np.all(peaks < 1.01)
+    with pytest.raises(ValueError):
+        model.mode_shapes(roots, [0.0], normalize="norm")
+
+
+def test_tip_inertia_in_modal_mass():
+    params = dict(PARAMS, J=0.8)
+    ref = uniform(params)
+    roots = np.array(ref.find_roots(n=12))
+    modes = ModeShapes(EulerBeam(boundary.clamped_base, boundary.tip_mass_inertia))
+    assert modes.has_J
+    x = np.linspace(0, params["L"], 101)
+    ours, expected = modes.modal(roots, x, ref.params), ref.mode_shapes(roots, x)
+    np.testing.assert_allclose(ours["shapes"], expected["shapes"], atol=1e-12)
+    np.testing.assert_allclose(ours["participation"], expected["participation"], atol=1e-12)
+    # 边界条件里没有 J 时，参数中的 J 不计入
+    assert not ModeShapes(EulerBeam()).has_J
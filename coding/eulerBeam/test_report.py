@@ -0,0 +1,139 @@
+import os
+import re
+
+import pytest
+from sympy import Eq, Matrix, cosh, exp, sin, sinh, symbols
+
+from report import LatexCache, ReportBuilder, render, split_lines, visible_width
+
+"""
+report：拆行后每行的定界符配平、按节指纹只重写变化的节、渲染缓存
+"""
+
+a, L, x, M = symbols("a L x M")
+LONG = sum(sin(k * a) * cosh(k * L) / (k + 1) for k in range(1, 12))
+
+
+def balanced(line):
+    """单行内 \\left 与 \\right 成对、花括号配平（multline 各行分别排版，不能跨行配对）"""
+    depth = 0
+    for token in re.findall(r"\\left\b|\\right\b", line):
+        depth += 1 if token == r"\left" else -1
+        if depth < 0:
+            return False
+    braces = 0
+    for ch in re.sub(r"\\[{}]", "", line):
+        braces += {"{": 1, "}": -1}.get(ch, 0)
+        if braces < 0:
+            return False
+    return depth == 0 and braces == 0
+
+
+def joined(lines):
+    """去掉补齐用的 \\right. / \\left. 后拼回一行"""
+    text = " ".join(lines).replace(r" \right.", "").replace(r"\left. ", "")
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def test_short_expression_single_line():
+    assert split_lines(a + L, 70) == ["L + a"]
+
+
+@pytest.mark.parametrize("width", [40, 70, 120])
+def test_sum_split(width):
+    lines = split_lines(LONG, width)
+    assert len(lines) > 1
+    assert all(balanced(line) for line in lines)
+    # 每行不超宽（单项本身超宽时独占一行）
+    assert all(visible_width(line) <= width or line.count(r"\frac") == 1 for line in lines)
+    assert joined(lines) == re.sub(r"\s+", " ", split_lines(LONG, 10**6)[0])
+
+
+@pytest.mark.parametrize("expr, prefix", [
+    (-3 * a**2 * LONG, r"- 3 a^{2} \left("),
+    (x / (a + L) * LONG, r"\frac{x}{L + a} \left("),
+    # 其余因子是和式：要带括号
+    (-LONG * (x + 1), r"\left(x + 1\right) \left("),
+])
+def test_product_split_keeps_delimiters(expr, prefix):
+    lines = split_lines(expr, 70)
+    assert len(lines) > 2
+    assert all(balanced(line) for line in lines)
+    assert lines[0].startswith(prefix) and lines[-1].endswith(r"\right)")
+    assert all(line.startswith(r"\left. ") and line.endswith(r" \right.") for line in lines[1:-1])
+
+
+def test_render_environments():
+    single = render(a + L, numbered=True)
+    assert single.startswith("\\begin{equation}") and single.rstrip().endswith("\\end{equation}")
+    many = render(Eq(M, LONG), numbered=False, width=60)
+    assert many.startswith("\\begin{multline*}") and many.rstrip().endswith("\\end{multline*}")
+    body = many.split("\n")[1:-2]
+    assert body[0].startswith("M = ")
+    assert all(balanced(line.rstrip(" \\")) for line in body)
+
+
+def test_render_wide_matrix_per_element():
+    wide = Matrix([[LONG, 0], [sinh(a) * exp(-a), cosh(a)]])
+    tex = render(wide, numbered=False, width=60, symbol="M")
+    assert tex.startswith("% M: 2x2")
+    assert "M_{11} = " in tex and "M_{21} = " in tex and "M_{12}" not in tex
+    assert tex.count("\\begin{multline*}") == tex.count("\\end{multline*}") == 1
+    assert tex.count("\\[") == tex.count("\\]") == 2
+    for line in tex.splitlines():
+        if not line.startswith(("%", "\\begin", "\\end", "\\[", "\\]")):
+            assert balanced(line.rstrip(" \\"))
+
+
+@pytest.fixture
+def builder(tmp_path):
+    return ReportBuilder(cache=LatexCache(tmp_path / "cache"), width=60)
+
+
+def sections(third=LONG):
+    return [("短", a + L, True), ("长", lambda: LONG, True), ("可变", lambda: third, False)]
+
+
+def section_files(folder):
+    return {name: os.stat(folder / name).st_mtime_ns for name in sorted(os.listdir(folder))}
+
+
+def test_sections_rewritten_only_when_changed(tmp_path, builder):
+    main = tmp_path / "latex" / "report.tex"
+    assert builder.write(str(main), sections(), title="测试")["written"] == 3
+    folder = tmp_path / "latex" / "report"
+    first = section_files(folder)
+    assert list(first) == ["sec01.tex", "sec02.tex", "sec03.tex"]
+    assert "\\input{report/sec02}" in main.read_text(encoding="utf-8")
+    # 输入不变：不渲染、不重写
+    assert builder.write(str(main), sections(), title="测试")["written"] == 0
+    assert section_files(folder) == first
+    # 只改第三节
+    assert builder.write(str(main), sections(third=x**2), title="测试")["written"] == 1
+    after = section_files(folder)
+    assert after["sec01.tex"] == first["sec01.tex"] and after["sec02.tex"] == first["sec02.tex"]
+    assert after["sec03.tex"] != first["sec03.tex"]
+    assert "x^{2}" in (folder / "sec03.tex").read_text(encoding="utf-8")
+
+
+def test_description_change_and_removed_sections(tmp_path, builder):
+    main = tmp_path / "report.tex"
+    builder.write(str(main), sections())
+    renamed = [("新名字", a + L, True)] + sections()[1:2]
+    assert builder.write(str(main), renamed)["written"] == 1
+    folder = tmp_path / "report"
+    # 多出来的第三节被删掉
+    assert sorted(os.listdir(folder)) == ["sec01.tex", "sec02.tex"]
+    assert "新名字" in (folder / "sec01.tex").read_text(encoding="utf-8")
+
+
+def test_render_cache_shared(tmp_path, builder):
+    builder.write(str(tmp_path / "one.tex"), sections())
+    misses = builder.cache.misses
+    # 另一份报告里相同的表达式直接取渲染缓存；新的 builder 从磁盘读
+    other = ReportBuilder(cache=LatexCache(tmp_path / "cache"), width=60)
+    assert other.write(str(tmp_path / "two.tex"), sections())["written"] == 3
+    assert other.cache.misses == 0 and other.cache.hits == 3
+    assert builder.cache.misses == misses
+    assert (tmp_path / "one" / "sec02.tex").read_text(encoding="utf-8").split("\n", 1)[1] == \
+        (tmp_path / "two" / "sec02.tex").read_text(encoding="utf-8").split("\n", 1)[1]
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from roots import adaptive_brackets, refine
+from solve import BeamModel
+from transfer import TransferBeam
+
+"""
+roots.adaptive_brackets 与整段网格扫描的一致性（运行：python -m pytest coding/eulerBeam）
+"""
+
+PARAMS = {"E": 2.06e11, "D": 0.114, "d": 0.109, "L": 3.3, "M": 15.4, "rho": 7850}
+
+
+def adaptive_roots(f, n):
+    lo, hi = adaptive_brackets(f, n)
+    return refine(f, lo, hi)
+
+
+@pytest.mark.parametrize("M", [0.0, 15.4, 1e4])
+def test_uniform_beam_matches_grid(M):
+    model = BeamModel(dict(PARAMS, M=M))
+    grid = model.find_roots(n=15, x_max=60)
+    np.testing.assert_allclose(adaptive_roots(model.f, 15), grid, rtol=1e-10)
+
+
+def test_close_pairs_not_skipped():
+    # 中间一段很细的三段梁：谱里有相距很近的根对（16.42 / 16.84、22.97 / 23.21）
+    segments = [{"L": 2, "D": 0.3, "d": 0.28}, {"L": 0.2, "D": 0.05, "d": 0.04}, {"L": 2, "D": 0.3, "d": 0.28}]
+    beam = TransferBeam(dict(PARAMS, M=0.0), segments)
+    grid = beam.find_roots(n=10, scan="grid", x_max=35)
+    assert len(grid) == 10
+    np.testing.assert_allclose(adaptive_roots(beam.f, 10), grid, rtol=1e-10)
+
+
+def test_close_pair_at_scan_boundary():
+    # 第一阶扫描到 3π/4 为止，根对紧跟在这个末点之后（不到一个步长）：
+    # 采样点上 |f| 的极小值恰好是两段扫描交界处的端点
+    c = np.pi / 2 + np.pi / 4 + 0.05
+
+    def f(x):
+        return (x - c) ** 2 - 1e-4
+
+    lo, hi = adaptive_brackets(f, 2, x_max=10.0)
+    assert lo.size == 2
+    np.testing.assert_allclose(refine(f, lo, hi), [c - 0.01, c + 0.01], rtol=1e-12)
+
+
+def test_x_max_limits_search():
+    model = BeamModel(PARAMS)
+    lo, hi = adaptive_brackets(model.f, 20, x_max=20.0)
+    assert lo.size == hi.size < 20
+    assert np.all(hi <= 20.0)
+
+
+def test_scalar_method_with_adaptive_scan(monkeypatch):
+    # method="scalar" 在自适应扫描下也逐个区间调用 bisection，而不是换成 illinois
+    calls = []
+    bisection = BeamModel.bisection
+    counting = staticmethod(lambda f, a, b, **kw: calls.append(a) or bisection(f, a, b, **kw))
+    monkeypatch.setattr(BeamModel, "bisection", counting)
+    model = BeamModel(PARAMS)
+    roots = model.find_roots(n=6, scan="adaptive", x_max=None, method="scalar")
+    assert len(calls) == 6
+    np.testing.assert_allclose(roots, model.find_roots(n=6, scan="adaptive", x_max=None), rtol=1e-10)
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from solve import BeamModel
+
+"""
+det_scaled 只是 det_simple 除以恒正的 cosh(a)^p，两者的根应一致
+"""
+
+PARAMS = {"E": 2.06e11, "D": 0.114, "d": 0.109, "L": 3.3, "M": 15.4, "rho": 7850}
+N_MODES = 8
+
+
+@pytest.mark.parametrize("M", [0.0, 15.4, 500.0])
+def test_scaled_roots_match_plain(M):
+    params = dict(PARAMS, M=M)
+    plain = BeamModel(params, kernel=None, scaled=False).find_roots(n=N_MODES, x_max=30)
+    scaled = BeamModel(params, kernel=None).find_roots(n=N_MODES, x_max=30)
+    assert len(plain) == len(scaled) == N_MODES
+    np.testing.assert_allclose(scaled, plain, rtol=1e-10)
+
+
+def test_scaled_sign_matches_plain():
+    plain = BeamModel(PARAMS, kernel=None, scaled=False)
+    scaled = BeamModel(PARAMS, kernel=None)
+    # 避开根附近（符号由舍入决定）
+    roots = np.array(scaled.find_roots(n=N_MODES, x_max=30))
+    xs = np.linspace(0.5, 28.0, 400)
+    xs = xs[np.min(np.abs(xs[:, None] - roots[None, :]), axis=1) > 1e-3]
+    assert np.array_equal(np.signbit(scaled.f(xs)), np.signbit(plain.f(xs)))
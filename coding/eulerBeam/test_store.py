@@ -0,0 +1,139 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from store import PARAM_COLUMNS, ResultStore
+
+"""
+ResultStore：跨块追加、重新打开后读取、按块最小 / 最大值跳块的范围查询、meta.json 的提交
+"""
+
+CHUNK = 100
+
+
+def batch(rng, n, start=0):
+    """n 行合成数据；L 随行号单调增加，便于检查跳块"""
+    data = {c: rng.uniform(0.0, 1.0, n) for c in PARAM_COLUMNS}
+    data["L"] = np.arange(start, start + n) / 10.0
+    for i in (1, 2):
+        data[f"r{i}"] = rng.uniform(0.0, 10.0, n)
+        data[f"f{i}"] = rng.uniform(0.0, 10.0, n)
+    return data
+
+
+def concat(batches):
+    return {c: np.concatenate([b[c] for b in batches]) for c in batches[0]}
+
+
+@pytest.fixture
+def filled(tmp_path):
+    """分三批写入 250 行（第二批跨越块边界），关闭后返回重新打开的存储和写入的数据"""
+    rng = np.random.default_rng(0)
+    batches = [batch(rng, 70), batch(rng, 90, 70), batch(rng, 90, 160)]
+    with ResultStore(tmp_path / "results", n_modes=2, chunk_rows=CHUNK) as store:
+        for b in batches:
+            store.append_columns(b)
+    return ResultStore(tmp_path / "results"), concat(batches)
+
+
+def test_round_trip_after_reopen(filled):
+    store, data = filled
+    assert len(store) == 250 and store.n_chunks() == 3
+    assert store.columns == list(PARAM_COLUMNS) + ["r1", "r2", "f1", "f2"]
+    out = store.read()
+    for c in store.columns:
+        np.testing.assert_array_equal(out[c], data[c])
+    rows = np.array([0, 99, 100, 101, 199, 200, 249])
+    np.testing.assert_array_equal(store.read(rows, ["f1"])["f1"], data["f1"][rows])
+    # 每块的最小 / 最大值
+    stats = store.meta["stats"]
+    assert len(stats) == 3
+    assert stats[1]["L"] == [10.0, 19.9] and stats[2]["L"] == [20.0, 24.9]
+
+
+def test_where_spans_chunks(filled):
+    store, data = filled
+    rows = store.where(f1=(2.0, 7.0), L=(8.0, 21.0))
+    expected = np.flatnonzero((data["f1"] >= 2.0) & (data["f1"] <= 7.0) & (data["L"] >= 8.0) & (data["L"] <= 21.0))
+    np.testing.assert_array_equal(rows, expected)
+    assert rows.min() < CHUNK and rows.max() >= 2 * CHUNK
+    np.testing.assert_array_equal(store.read(rows, ["r2"])["r2"], data["r2"][rows])
+    np.testing.assert_array_equal(store.where(L=(None, 0.45)), np.arange(5))
+    np.testing.assert_array_equal(store.where(), np.arange(250))
+    assert store.where(f1=(20.0, None)).size == 0
+    with pytest.raises(KeyError):
+        store.where(f3=(0, 1))
+
+
+def test_where_skips_chunks(filled, monkeypatch):
+    store, data = filled
+    touched = []
+    load = store.chunk
+    monkeypatch.setattr(store, "chunk", lambda c, k: touched.append(k) or load(c, k))
+    rows = store.where(L=(12.0, 13.0), f1=(None, None))
+    np.testing.assert_array_equal(rows, np.arange(120, 131))
+    # 只有第 1 块的 L 范围与 [12, 13] 相交
+    assert set(touched) == {1}
+
+
+def test_uncommitted_rows_invisible(tmp_path):
+    rng = np.random.default_rng(1)
+    first, second = batch(rng, 60), batch(rng, 80, 60)
+    writer = ResultStore(tmp_path / "results", n_modes=2, chunk_rows=CHUNK)
+    writer.append_columns(first)
+    meta = (tmp_path / "results" / "meta.json").read_text(encoding="utf-8")
+    assert writer.append_columns(second, commit=False) == 140
+    reader = ResultStore(tmp_path / "results")
+    assert len(reader) == 60
+    assert (tmp_path / "results" / "meta.json").read_text(encoding="utf-8") == meta
+    # 提交后读者 refresh 才能看到
+    writer.flush()
+    assert len(reader) == 60 and reader.refresh() == 140
+    np.testing.assert_array_equal(reader.read(columns=["L"])["L"], np.arange(140) / 10.0)
+    assert not [f for f in os.listdir(tmp_path / "results") if f.endswith(".tmp")]
+
+
+def test_resume_after_crash(tmp_path):
+    # 写了数据但没提交就“崩溃”：重新打开后从已提交的行数继续写，覆盖未提交的部分
+    rng = np.random.default_rng(2)
+    first, lost, again = batch(rng, 90), batch(rng, 50, 90), batch(rng, 30, 90)
+    writer = ResultStore(tmp_path / "results", n_modes=2, chunk_rows=CHUNK)
+    writer.append_columns(first)
+    writer.append_columns(lost, commit=False)
+    for mm in writer._open.values():
+        mm.flush()
+    del writer
+    with ResultStore(tmp_path / "results") as store:
+        assert len(store) == 90
+        store.append_columns(again)
+    store = ResultStore(tmp_path / "results")
+    assert len(store) == 120
+    np.testing.assert_array_equal(store.read(columns=["f2"])["f2"], np.concatenate([first["f2"], again["f2"]]))
+    meta = json.loads((tmp_path / "results" / "meta.json").read_text(encoding="utf-8"))
+    assert meta["rows"] == 120 and "pending" not in meta
+
+
+def test_nan_chunk_and_append(tmp_path):
+    store = ResultStore(tmp_path / "results", n_modes=2, chunk_rows=4)
+    p = {k: 1.0 for k in PARAM_COLUMNS}
+    p["m"] = np.ones(4)
+    # 求根失败的设计为 NaN：整块都是 NaN 时该块统计为 None，任何条件都跳过它
+    store.append(p, np.full((4, 3), np.nan), np.full((4, 3), np.nan))
+    store.append(p, np.arange(12.0).reshape(4, 3), np.arange(12.0).reshape(4, 3))
+    assert store.meta["stats"][0]["f1"] == [None, None]
+    np.testing.assert_array_equal(store.where(f1=(None, None)), np.arange(4, 8))
+    np.testing.assert_array_equal(store.read([4, 7], ["r2"])["r2"], [1.0, 10.0])
+    with pytest.raises(ValueError):
+        store.append(p, np.ones((4, 1)), np.ones((4, 1)))
+    with pytest.raises(KeyError):
+        store.append_columns({"E": [1.0]})
+
+
+def test_open_errors(tmp_path):
+    with pytest.raises(ValueError):
+        ResultStore(tmp_path / "missing")
+    ResultStore(tmp_path / "results", n_modes=2)
+    with pytest.raises(ValueError):
+        ResultStore(tmp_path / "results", n_modes=3)
@@ -0,0 +1,72 @@
+import numpy as np
+from solve import BeamModel
+from transfer import TransferBeam
+
+"""
+TransferBeam：与 BeamModel 对比、默认扫描不漏根、振型的正交性
+"""
+
+PARAMS = {"E": 2.06e11, "D": 0.114, "d": 0.109, "L": 3.3, "M": 15.4, "rho": 7850}
+
+
+def mast():
+    segments = []
+    for k in range(8):
+        D = 0.168 - 0.008 * k
+        segments.append({"L": 0.5, "D": D, "d": D - 0.006})
+    segments[2]["M"] = 4.0
+    segments[5]["M"] = 3.0
+    return TransferBeam(PARAMS, segments)
+
+
+def quadrature(beam, n=60):
+    """各段 Gauss 点 x 与权 m dx"""
+    xs, ws, x0 = [], [], 0.0
+    nodes, weights = np.polynomial.legendre.leggauss(n)
+    for s in beam.segments:
+        xs.append(x0 + (nodes + 1) / 2 * s["L"])
+        ws.append(weights / 2 * s["L"] * s["m"])
+        x0 += s["L"]
+    return np.concatenate(xs), np.concatenate(ws)
+
+
+def test_single_span_matches_beam_model():
+    beam = TransferBeam(PARAMS, [{"L": 1.1, "D": 0.114, "d": 0.109}] * 3)
+    model = BeamModel(PARAMS)
+    roots = np.array(model.find_roots(n=6))
+    np.testing.assert_allclose(beam.find_roots(n=6), roots, rtol=1e-10)
+    x = np.linspace(0, 3.3, 12)
+    ours, ref = beam.mode_shapes(roots, x), model.mode_shapes(roots, x)
+    np.testing.assert_allclose(ours["shapes"], ref["shapes"], atol=1e-10)
+    np.testing.assert_allclose(ours["participation"], ref["participation"], atol=1e-10)
+    assert ours["total_mass"] == ref["total_mass"]
+
+
+def test_default_scan_keeps_close_pairs():
+    segments = [{"L": 2, "D": 0.3, "d": 0.28}, {"L": 0.2, "D": 0.05, "d": 0.04}, {"L": 2, "D": 0.3, "d": 0.28}]
+    roots = TransferBeam(dict(PARAMS, M=0.0), segments).find_roots(n=10)
+    np.testing.assert_allclose(roots[5:9], [16.423, 16.837, 22.966, 23.208], atol=1e-3)
+
+
+def test_sparse_orthonormalization():
+    # 求特征函数时累计 βl 到 max_step 才正交化：与很小的 max_step（几乎每段都正交化）求得的根一致
+    beam = mast()
+    fine = TransferBeam(PARAMS, beam.segments, max_step=0.2)
+    np.testing.assert_allclose(beam.find_roots(n=20), fine.find_roots(n=20), rtol=1e-12)
+
+
+def test_mode_shapes_mass_orthonormal():
+    beam = mast()
+    roots = np.array(beam.find_roots(n=6))
+    x, w = quadrature(beam)
+    tops = np.cumsum([s["L"] for s in beam.segments])
+    masses = np.array([s.get("M", 0.0) for s in beam.segments])
+    masses[-1] += PARAMS["M"]
+    out = beam.mode_shapes(roots, np.concatenate([x, tops]))
+    phi, phi_t = out["shapes"][:, :x.size], out["shapes"][:, x.size:]
+    gram = (phi * w) @ phi.T + (phi_t * masses) @ phi_t.T
+    np.testing.assert_allclose(gram, np.eye(roots.size), atol=1e-10)
+    np.testing.assert_allclose(out["modal_mass"], 1.0, rtol=1e-12)
+    # 固定端位移为零
+    np.testing.assert_allclose(beam.mode_shapes(roots, [0.0])["shapes"], 0.0, atol=1e-12)
+    assert out["effective_mass"].sum() < out["total_mass"]
@@ -0,0 +1,292 @@
+import time
+import numpy as np
+from math import pi
+from solve import BeamModel
+from roots import adaptive_brackets
+from profiling import stage
+
+"""
+多段（变截面）梁的数值传递矩阵求解。
+每段仍是 EulerBeam._Qx 中的 sin/cos/sinh/cosh 解，改写成 Krylov 函数 S、T、U、V 组成的 4×4 传递矩阵，
+状态量为 [w, w', EI w'', (EI w'')']（按总长 L 和底段 EI、m 无量纲化）。
+对整条频率网格一次性用 NumPy 批量连乘各段矩阵，不做 4N×4N 的符号行列式。
+
+直接连乘时 sinh/cosh 的增长项会淹没另一组解（βl 超过 30 左右行列式就只剩舍入误差），
+这里只传递底端两个未知量对应的 4×2 列块，累计 βl 达到 max_step 前做一次 Gram-Schmidt 正交化（系数恒为正，
+不改变特征函数的符号；求振型时每个子步都做），长段按 max_step 细分，因此高阶根也不会溢出或失真。
+特征根 r = β₁·L，β₁ 为底段的波数，单段时与 BeamModel 的 r = aL 相同。
+振型：正交化 Y = Q R 时记下 R，在顶端取零空间系数 c 后用 c ← R⁻¹ c 逐步倒推回每个子步起点，
+子步内再用 K(t) 从起点状态直接求值（t 不超过 max_step，不会放大误差）。
+"""
+
+# 底端支承：未知的两个状态分量（其余两个为零）
+BASE_UNKNOWNS = {"clamped": (2, 3), "pinned": (1, 3), "sliding": (0, 2), "free": (0, 1)}
+# 顶端支承：应为零的两个状态分量
+TIP_ROWS = {"free": (2, 3), "pinned": (0, 2), "sliding": (1, 3), "clamped": (0, 1)}
+
+
+def krylov(t):
+    """Krylov 函数组成的传递矩阵 K(t)，K[i, j] = [S, T, U, V][(j - i) mod 4]，结果形状 t.shape + (4, 4)"""
+    ch, c = np.cosh(t), np.cos(t)
+    sh, s = np.sinh(t), np.sin(t)
+    f = np.stack([(ch + c) / 2, (sh + s) / 2, (ch - c) / 2, (sh - s) / 2], axis=-1)
+    idx = (np.arange(4)[None, :] - np.arange(4)[:, None]) % 4
+    return f[..., idx]
+
+
+def _orthonormalize(Y, return_r=False):
+    """
+    对 (..., 4, 2) 的两列做 Gram-Schmidt，相当于右乘对角为正的上三角阵，行列式符号不变。
+    return_r 为 True 时同时返回 Y = Q R 中的 R 的三个元素 (r00, r01, r11)。
+    """
+    y1, y2 = Y[..., 0:1], Y[..., 1:2]
+    n1 = np.sqrt(np.sum(y1 * y1, axis=-2, keepdims=True))
+    q1 = y1 / n1
+    r01 = np.sum(q1 * y2, axis=-2, keepdims=True)
+    y2 = y2 - r01 * q1
+    n2 = np.sqrt(np.sum(y2 * y2, axis=-2, keepdims=True))
+    Q = np.concatenate([q1, y2 / n2], axis=-1)
+    if return_r:
+        return Q, (n1[..., 0, 0], r01[..., 0, 0], n2[..., 0, 0])
+    return Q
+
+
+class TransferBeam(BeamModel):
+    def __init__(self, params: dict, segments: list, base="clamped", tip="free", max_step=2.0):
+        """
+        Args:
+            params (dict): 公共参数 E、rho，顶端集中质量 M，可选顶端转动惯量 J
+            segments (list): 自下而上各段的参数字典，含 L、D、d，可覆盖 E、rho；
+                             可选 M、J 为该段上端的集中质量 / 转动惯量（如法兰）
+            base, tip (str): 两端支承，"clamped" / "pinned" / "sliding" / "free"
+            max_step (float): 子步的最大 βl，超过时把该段细分后再正交化
+        """
+        if base not in BASE_UNKNOWNS:
+            raise ValueError(f"未知底端支承 {base!r}，可选 {tuple(BASE_UNKNOWNS)}")
+        if tip not in TIP_ROWS:
+            raise ValueError(f"未知顶端支承 {tip!r}，可选 {tuple(TIP_ROWS)}")
+        if not segments:
+            raise ValueError("至少需要一段")
+        self.base = base
+        self.tip = tip
+        self.max_step = max_step
+        self.segments = [dict({"E": params["E"], "rho": params["rho"]}, **s) for s in segments]
+        self.params = params.copy()
+        self._compute_derived_params()
+        self.beam = None
+        self.kernel = None
+        self.f = self.characteristic
+        self.df = None
+
+    @stage()
+    def _compute_derived_params(self):
+        """各段的 I、m 及无量纲系数；params 中的 E、I、m 取底段，L 为总长，供 natural_frequency 使用"""
+        for s in self.segments:
+            s["I"] = pi / 64 * (s["D"]**4 - s["d"]**4)
+            s["m"] = s["rho"] * pi / 4 * (s["D"]**2 - s["d"]**2)
+        s0 = self.segments[0]
+        L = sum(s["L"] for s in self.segments)
+        p = self.params
+        p.update(E=s0["E"], I=s0["I"], m=s0["m"], L=L)
+        EI0, m0 = s0["E"] * s0["I"], s0["m"]
+        EI = np.array([s["E"] * s["I"] for s in self.segments])
+        m = np.array([s["m"] for s in self.segments])
+        M = np.array([s.get("M", 0.0) for s in self.segments])
+        J = np.array([s.get("J", 0.0) for s in self.segments])
+        M[-1] += p.get("M", 0.0)
+        J[-1] += p.get("J", 0.0)
+        self._lam = np.array([s["L"] for s in self.segments]) / L   # 段长 / 总长
+        self._e = EI / EI0                                           # EI / EI₁
+        self._c = (m / m0 / self._e) ** 0.25                         # β / β₁
+        self._mu = M / (m0 * L)                                      # 段上端集中质量
+        self._iota = J / (m0 * L**3)                                 # 段上端转动惯量
+
+    def _propagate(self, r, record=None):
+        """
+        自底向上传递 4×2 列块，返回顶端正交化后的 Y，形状 (点数, 4, 2)。
+        record 为 {"steps": [], "R": []} 时记下每个子步的 (段号, 起点 ξ, 起点处的段内尺度 Y, 系数版本号)
+        和每次正交化的 R，供 _states 倒推系数。
+        """
+        r4 = (r**4)[:, None]
+        # 所有段的 K、尺度矩阵一次算好，形状 (段数, 点数, ...)
+        b = np.outer(self._c, r)
+        b_max = np.max(b, axis=1, initial=0.0)
+        n_sub = np.ceil(b_max * self._lam / self.max_step).astype(int)
+        n_sub = np.maximum(n_sub, 1)
+        K = krylov(b * (self._lam / n_sub)[:, None])
+        # 段内用局部尺度 [w, w'/b, M/(e b²), V/(e b³)]，传递矩阵就是 K(βl)
+        e = self._e[:, None]
+        D = np.stack([np.ones_like(b), b, e * b**2, e * b**3], axis=-1)[..., None]
+        Y = np.zeros((r.size, 4, 2))
+        Y[:, BASE_UNKNOWNS[self.base], [0, 1]] = 1.0
+        xi = np.concatenate([[0.0], np.cumsum(self._lam)])
+        # 只求特征函数时，累计的 βl 将要超过 max_step 才正交化（与细分子步的界相同），短段连乘几段才做一次
+        grow = 0.0
+        for k in range(len(self._lam)):
+            Y = Y / D[k]
+            h = self._lam[k] / n_sub[k]
+            for j in range(n_sub[k]):
+                if record is None:
+                    if grow + b_max[k] * h > self.max_step:
+                        Y = _orthonormalize(Y)
+                        grow = 0.0
+                    Y = K[k] @ Y
+                    grow += b_max[k] * h
+                    continue
+                record["steps"].append((k, xi[k] + j * h, Y, len(record["R"])))
+                Y, R = _orthonormalize(K[k] @ Y, return_r=True)
+                record["R"].append(R)
+            Y = Y * D[k]
+            # 段上端的集中质量：剪力跳变 μ r⁴ w，弯矩跳变 -ι r⁴ w'
+            if self._mu[k]:
+                Y[:, 3] += self._mu[k] * r4 * Y[:, 0]
+            if self._iota[k]:
+                Y[:, 2] -= self._iota[k] * r4 * Y[:, 1]
+        if record is None:
+            return _orthonormalize(Y)
+        Y, R = _orthonormalize(Y, return_r=True)
+        record["R"].append(R)
+        return Y
+
+    def characteristic(self, r):
+        """特征函数：传递到顶端后，顶端应为零的两个分量组成的 2×2 行列式（r 可为任意形状数组）"""
+        r = np.asarray(r, dtype=float)
+        shape = r.shape
+        Y = self._propagate(r.ravel())
+        i, j = TIP_ROWS[self.tip]
+        val = Y[:, i, 0] * Y[:, j, 1] - Y[:, i, 1] * Y[:, j, 0]
+        return val.reshape(shape)
+
+    def _build_derivative(self):
+        """牛顿法所需的 f'(r)，用中心差分近似"""
+        if self.df is None:
+            def df(r):
+                h = 1e-6 * np.maximum(1.0, np.abs(r))
+                return (self.f(r + h) - self.f(r - h)) / (2 * h)
+            self.df = df
+        return self.df
+
+    def find_roots(self, n=3, x_max=None, step=1e-3, method="illinois", scan="adaptive"):
+        """
+        同 BeamModel.find_roots，默认自适应扫描：计算量只随阶数增长，与 step 无关。
+        多段梁的谱不规则，相距比扫描步长还近的根对靠 |f| 的凹陷检测找出（见 roots._scan）。
+        scan="grid" 按 step 做网格扫描作为对照，x_max 为 None 时先用 adaptive_brackets 估计第 n 阶根的位置，
+        网格只扫到那里；20 段、前 5 阶时自适应约 20 ms，step=1e-3 的网格约 200 ms。
+        """
+        if scan == "grid" and x_max is None:
+            hi = adaptive_brackets(self.f, n)[1]
+            x_max = hi[-1] + 2 * step if hi.size else 50
+        return super().find_roots(n=n, x_max=x_max, step=step, method=method, scan=scan)
+
+    def _states(self, roots):
+        """
+        各阶振型在每个子步起点处的段内尺度状态。
+        Returns:
+            (starts, segs, states)：子步起点 ξ、所在段号，states 形状 (子步数, 阶数, 4)
+        """
+        r = np.asarray(roots, dtype=float)
+        record = {"steps": [], "R": []}
+        Y = self._propagate(r, record)
+        # 顶端两行组成的 2×2 矩阵取范数较大的一行 (t0, t1)，零空间系数为 (-t1, t0)
+        rows = Y[:, TIP_ROWS[self.tip], :]
+        pick = np.argmax(np.hypot(rows[:, :, 0], rows[:, :, 1]), axis=1)
+        t = rows[np.arange(r.size), pick]
+        c = np.stack([-t[:, 1], t[:, 0]], axis=-1)
+        # 正交化前后 Y c 不变：c_旧 = R⁻¹ c_新，从顶端倒推回去
+        coeffs = [c]
+        for r00, r01, r11 in reversed(record["R"]):
+            c1 = c[:, 1] / r11
+            c = np.stack([(c[:, 0] - r01 * c1) / r00, c1], axis=-1)
+            coeffs.append(c)
+        coeffs.reverse()
+        states = np.array([Ys @ coeffs[v][:, :, None] for _, _, Ys, v in record["steps"]])[..., 0]
+        segs = np.array([k for k, _, _, _ in record["steps"]])
+        starts = np.array([x0 for _, x0, _, _ in record["steps"]])
+        return starts, segs, states
+
+    def _evaluate(self, roots, states, xi):
+        """ξ = x/L 处的 w 与 dw/dξ，形状 (阶数 × 点数)"""
+        starts, segs, states = states
+        r = np.asarray(roots, dtype=float)
+        xi = np.asarray(xi, dtype=float)
+        j = np.clip(np.searchsorted(starts, xi, side="right") - 1, 0, starts.size - 1)
+        b = self._c[segs[j]][None, :] * r[:, None]
+        K = krylov(b * (xi - starts[j])[None, :])
+        y = states[j].transpose(1, 0, 2)
+        # 段内尺度下第二个分量是 w'/b
+        return np.sum(K[..., 0, :] * y, axis=-1), np.sum(K[..., 1, :] * y, axis=-1) * b
+
+    def mode_shapes(self, roots, x, normalize="mass", n_quad=200):
+        """
+        同 BeamModel.mode_shapes：在坐标数组 x (0 ≤ x ≤ L) 上计算各阶归一化振型 (阶数 × 点数) 及模态参数。
+        模态质量含各段分布质量、段上端集中质量和转动惯量；n_quad 为积分点总数，按段长分配到各段。
+        """
+        L, m0 = self.params["L"], self.params["m"]
+        states = self._states(roots)
+        xq, wq = [], []
+        bounds = np.concatenate([[0.0], np.cumsum(self._lam)])
+        for k, s in enumerate(self.segments):
+            nodes, weights = np.polynomial.legendre.leggauss(max(16, int(np.ceil(n_quad * self._lam[k]))))
+            xq.append(bounds[k] + (nodes + 1) / 2 * self._lam[k])
+            wq.append(weights / 2 * self._lam[k] * L * s["m"])
+        xq, wq = np.concatenate(xq), np.concatenate(wq)
+        M, J = self._mu * m0 * L, self._iota * m0 * L**3
+        phi_q = self._evaluate(roots, states, xq)[0]
+        phi_t, dphi_t = self._evaluate(roots, states, bounds[1:])
+        dphi_t = dphi_t / L
+        # 符号约定：|φ| 最大处为正
+        sign = np.sign(phi_q[np.arange(phi_q.shape[0]), np.argmax(np.abs(phi_q), axis=1)])
+        if normalize == "mass":
+            scale = np.sqrt(phi_q**2 @ wq + phi_t**2 @ M + dphi_t**2 @ J)
+        elif normalize == "max":
+            scale = np.maximum(np.max(np.abs(phi_q), axis=1), np.max(np.abs(phi_t), axis=1))
+        else:
+            raise ValueError(f"未知归一化方式 {normalize!r}")
+        scale = scale * sign
+        phi_q, phi_t, dphi_t = phi_q / scale[:, None], phi_t / scale[:, None], dphi_t / scale[:, None]
+        modal_mass = phi_q**2 @ wq + phi_t**2 @ M + dphi_t**2 @ J
+        participation = (phi_q @ wq + phi_t @ M) / modal_mass
+        x = np.asarray(x, dtype=float)
+        return {
+            "shapes": self._evaluate(roots, states, x / L)[0] / scale[:, None],
+            "modal_mass": modal_mass,
+            "participation": participation,
+            "effective_mass": participation**2 * modal_mass,
+            "total_mass": float(np.sum(wq) + np.sum(M)),
+        }
+
+
+# ------------------ 主程序 ------------------
+if __name__ == "__main__":
+    params = {
+        "E": 2.06e11,
+        "D": 0.114,
+        "d": 0.109,
+        "L": 3.3,
+        "M": 15.4,
+        "rho": 7850,
+    }
+
+    # 单段与 BeamModel 对比
+    uniform = TransferBeam(params, [{"L": 3.3, "D": 0.114, "d": 0.109}])
+    ref = BeamModel(params).find_roots(n=5, scan="adaptive")
+    roots = uniform.find_roots(n=5)
+    print(f"单段与 BeamModel 前5阶根最大差值: {np.max(np.abs(np.array(roots) - ref)):.3e}")
+
+    # 20 段逐级变细的桅杆，中间带两个法兰
+    segments = []
+    for k in range(20):
+        D = 0.168 - 0.003 * k
+        segments.append({"L": 0.5, "D": D, "d": D - 0.006})
+    segments[6]["M"] = 4.0
+    segments[13]["M"] = 3.0
+    mast = TransferBeam(params, segments)
+    t0 = time.perf_counter()
+    roots = mast.find_roots(n=5)
+    elapsed = time.perf_counter() - t0
+    print(f"\n20 段桅杆（用时 {elapsed * 1e3:.1f} ms）:")
+    mast.summary(roots)
+    modal = mast.mode_shapes(np.array(roots), np.linspace(0, 10, 11))
+    print("\n有效质量占比:", np.round(modal["effective_mass"] / modal["total_mass"], 4))
+    print("振型（质量归一化，x = 0, 1, ..., 10 m）:")
+    print(np.round(modal["shapes"], 4))
@@ -0,0 +1,32 @@
+import os
+import sys
+
+# --offscreen 时不需要显示器（CI、远程机器上做冒烟测试），必须在创建 QApplication 之前设置
+if "--offscreen" in sys.argv:
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication
+from mainwindow import MainWindow
+from solver import FrequencySolver
+
+app = QApplication(sys.argv)
+# 先加载数值核（第一次运行时会推导并生成），窗口出现后拖动滑块不再有卡顿
+window = MainWindow(app, FrequencySolver())
+window.show()
+
+if "--offscreen" in sys.argv:
+    # 冒烟测试：连续拖动长度滑块，只应计算最后一个值
+    slider = window.sliders["L"][0]
+    for value in range(slider.value(), slider.value() + 50):
+        slider.setValue(value)
+
+    def finish():
+        window.pool.waitForDone()
+        app.processEvents()
+        print(f"请求 {window.request_id} 次，显示第 {window.shown_id} 次的结果："
+              f"{window.table.item(0, 0).text()} Hz")
+        app.exit(0 if window.shown_id == window.request_id else 1)
+    QTimer.singleShot(500, finish)
+
+sys.exit(app.exec())
@@ -0,0 +1,149 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Qt, Signal
+from PySide6.QtWidgets import (QGridLayout, QLabel, QMainWindow, QSlider, QTableWidget,
+                               QTableWidgetItem, QVBoxLayout, QWidget)
+
+from solver import SLIDERS
+"""
+拖动滑块时实时计算固有频率。
+滑块变化先经过 DEBOUNCE_MS 的防抖定时器合并，再把计算交给 QThreadPool 中的工作线程，界面线程只负责刷新。
+每次请求带一个递增的编号：还没开始的旧任务直接从线程池队列中清掉，
+已经在算的旧任务在开始 / 结束时检查编号并放弃，晚到的旧结果也不会覆盖新结果。
+"""
+
+DEBOUNCE_MS = 16    # 约一帧
+
+
+class WorkerSignals(QObject):
+    # 信号必须定义在 QObject 上，QRunnable 不是 QObject
+    finished = Signal(int, list, float)
+    failed = Signal(int, str)
+
+
+class FrequencyTask(QRunnable):
+    def __init__(self, solver, params, request_id, latest):
+        """latest() 返回最新的请求编号，用来判断本任务是否已经过时"""
+        super().__init__()
+        self.solver = solver
+        self.params = params
+        self.request_id = request_id
+        self.latest = latest
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.solver.solve(self.params, cancelled=lambda: self.latest() != self.request_id)
+        except Exception as e:
+            self.signals.failed.emit(self.request_id, str(e))
+            return
+        if result is not None:
+            freqs, elapsed = result
+            self.signals.finished.emit(self.request_id, freqs, elapsed)
+
+
+class MainWindow(QMainWindow):
+    def __init__(self, app, solver):
+        super().__init__()
+        self.app = app
+        self.solver = solver
+        self.setWindowTitle("固有频率")
+        self.request_id = 0
+        self.shown_id = 0
+        # 单线程的专用线程池：请求之间天然串行，排队中的旧任务可以整体清掉
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(1)
+
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(DEBOUNCE_MS)
+        self.debounce.timeout.connect(self.submit)
+
+        # 菜单栏
+        menu_bar = self.menuBar()
+        menu_bar.setNativeMenuBar(False)
+        file_menu = menu_bar.addMenu("文件")
+        quit_action = file_menu.addAction("Quit")
+        quit_action.triggered.connect(self.quit_app)
+
+        grid = QGridLayout()
+        self.sliders = {}
+        self.value_labels = {}
+        for row, (name, label, lo, hi, step, default, unit) in enumerate(SLIDERS):
+            slider = QSlider(Qt.Horizontal)
+            slider.setMinimum(0)
+            slider.setMaximum(round((hi - lo) / step))
+            slider.setValue(round((default - lo) / step))
+            slider.valueChanged.connect(self.schedule)
+            value_label = QLabel()
+            value_label.setMinimumWidth(90)
+            grid.addWidget(QLabel(label), row, 0)
+            grid.addWidget(slider, row, 1)
+            grid.addWidget(value_label, row, 2)
+            self.sliders[name] = (slider, lo, step, unit)
+            self.value_labels[name] = value_label
+
+        self.table = QTableWidget(solver.n, 1)
+        self.table.setHorizontalHeaderLabels(["f (Hz)"])
+        self.table.setVerticalHeaderLabels([f"{i}阶" for i in range(1, solver.n + 1)])
+        for i in range(solver.n):
+            self.table.setItem(i, 0, QTableWidgetItem("-"))
+
+        layout = QVBoxLayout()
+        layout.addLayout(grid)
+        layout.addWidget(self.table)
+        central = QWidget()
+        central.setLayout(layout)
+        self.setCentralWidget(central)
+
+        self.update_labels()
+        self.submit()
+
+    def params(self):
+        return {name: lo + slider.value() * step for name, (slider, lo, step, _) in self.sliders.items()}
+
+    def update_labels(self):
+        params = self.params()
+        for name, (_, _, step, unit) in self.sliders.items():
+            digits = max(0, -int(f"{step:e}".split("e")[1]))
+            self.value_labels[name].setText(f"{params[name]:.{digits}f} {unit}")
+
+    def schedule(self):
+        """滑块每次变化只更新标签并重启防抖定时器，拖动过程中不会堆积计算"""
+        self.update_labels()
+        self.debounce.start()
+
+    def latest(self):
+        return self.request_id
+
+    def submit(self):
+        params = self.params()
+        self.request_id += 1
+        error = self.solver.check(params)
+        if error:
+            self.statusBar().showMessage(error)
+            return
+        # 还没开始的旧任务不再需要
+        self.pool.clear()
+        task = FrequencyTask(self.solver, params, self.request_id, self.latest)
+        task.signals.finished.connect(self.show_result)
+        task.signals.failed.connect(self.show_error)
+        self.pool.start(task)
+
+    def show_result(self, request_id, freqs, elapsed):
+        # 信号经队列连接回到界面线程；比当前显示还旧的结果丢弃
+        if request_id < self.shown_id:
+            return
+        self.shown_id = request_id
+        for i in range(self.table.rowCount()):
+            text = f"{freqs[i]:.4f}" if i < len(freqs) else "-"
+            self.table.item(i, 0).setText(text)
+        stale = "" if request_id == self.request_id else "（计算中）"
+        self.statusBar().showMessage(f"计算用时 {elapsed * 1e3:.2f} ms{stale}")
+
+    def show_error(self, request_id, message):
+        if request_id == self.request_id:
+            self.statusBar().showMessage(f"计算失败：{message}")
+
+    def quit_app(self):
+        self.pool.clear()
+        self.pool.waitForDone()
+        self.app.quit()
@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+
+# eulerBeam 是同级的脚本目录，不是安装的包
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "eulerBeam"))
+
+from kernels import get_kernel
+from solve import BeamModel
+"""
+频率计算（不依赖 Qt，可单独运行）。
+数值核只在构造时加载一次，之后每次参数变化只新建一个轻量的 BeamModel（计算 I、m 并绑定 m、M、L），
+不再重建 EulerBeam，也不导入 SymPy；单次求前 5 阶约 0.3 ms。
+"""
+
+# 滑块参数：(名称, 标签, 最小值, 最大值, 步长, 默认值, 单位)
+SLIDERS = [
+    ("D", "外径 D", 0.02, 0.40, 0.001, 0.114, "m"),
+    ("d", "内径 d", 0.00, 0.39, 0.001, 0.109, "m"),
+    ("L", "长度 L", 0.5, 10.0, 0.01, 3.3, "m"),
+    ("M", "端部质量 M", 0.0, 200.0, 0.1, 15.4, "kg"),
+]
+
+BASE_PARAMS = {"E": 2.06e11, "rho": 7850}
+
+
+class FrequencySolver:
+    def __init__(self, base_params=None, n=5, kernel="auto"):
+        """
+        Args:
+            base_params (dict): 不随滑块变化的参数（E、rho）
+            n (int): 计算的阶数
+            kernel: 同 BeamModel；"auto" 时加载（必要时生成一次）默认数值核
+        """
+        self.base_params = dict(BASE_PARAMS, **(base_params or {}))
+        self.n = n
+        self.kernel = get_kernel() if kernel == "auto" else kernel
+
+    def check(self, params):
+        """参数不合理时返回说明，否则返回 None"""
+        if params["d"] >= params["D"]:
+            return "内径必须小于外径"
+        if params["L"] <= 0:
+            return "长度必须为正"
+        return None
+
+    def solve(self, params, cancelled=None):
+        """
+        返回 (各阶频率 Hz 列表, 耗时 s)；cancelled() 为真时放弃计算并返回 None。
+        """
+        if cancelled is not None and cancelled():
+            return None
+        t0 = time.perf_counter()
+        model = BeamModel(dict(self.base_params, **params), kernel=self.kernel)
+        roots = model.find_roots(n=self.n, scan="adaptive", x_max=None)
+        if cancelled is not None and cancelled():
+            return None
+        return [float(model.natural_frequency(r)) for r in roots], time.perf_counter() - t0
+
+
+# ------------------ 主程序 ------------------
+if __name__ == "__main__":
+    solver = FrequencySolver()
+    params = {name: default for name, _, _, _, _, default, _ in SLIDERS}
+    t0 = time.perf_counter()
+    for i in range(200):
+        freqs, elapsed = solver.solve(dict(params, L=params["L"] + i * 0.01))
+    print(f"每次计算平均 {(time.perf_counter() - t0) / 200 * 1e3:.2f} ms")
+    freqs, _ = solver.solve(params)
+    for i, f in enumerate(freqs, 1):
+        print(f"  f{i} = {f:.4f} Hz")
@@ -0,0 +1,72 @@
+import math
+import sys
+
+import numpy as np
+import pytest
+
+from solver import SLIDERS, FrequencySolver
+
+"""
+FrequencySolver：不依赖 Qt，与悬臂梁解析解对比、参数检查、取消
+"""
+
+DEFAULTS = {name: default for name, _, _, _, _, default, _ in SLIDERS}
+# 悬臂梁 βL 的前 5 个根
+CANTILEVER = [1.8751040687, 4.6940911330, 7.8547574382, 10.9955407349, 14.1371683910]
+
+
+@pytest.fixture(scope="module")
+def solver():
+    return FrequencySolver()
+
+
+def analytic(params, E=2.06e11, rho=7850):
+    D, d, L = params["D"], params["d"], params["L"]
+    EI = E * math.pi / 64 * (D**4 - d**4)
+    m = rho * math.pi / 4 * (D**2 - d**2)
+    return [(b / L) ** 2 / (2 * math.pi) * math.sqrt(EI / m) for b in CANTILEVER]
+
+
+def test_no_tip_mass_matches_cantilever(solver):
+    params = dict(DEFAULTS, M=0.0)
+    freqs, elapsed = solver.solve(params)
+    np.testing.assert_allclose(freqs, analytic(params), rtol=1e-8)
+    assert elapsed > 0
+
+
+def test_tip_mass_lowers_frequencies(solver):
+    free, _ = solver.solve(dict(DEFAULTS, M=0.0))
+    loaded, _ = solver.solve(DEFAULTS)
+    assert len(loaded) == solver.n
+    assert all(a < b for a, b in zip(loaded, free))
+    assert loaded == sorted(loaded)
+
+
+@pytest.mark.parametrize("name", ["D", "d", "L", "M"])
+def test_slider_extremes(solver, name):
+    # 滑块两端（外径取大于内径）都能给出 n 阶正频率
+    spec = next(s for s in SLIDERS if s[0] == name)
+    for value in spec[2:4]:
+        params = dict(DEFAULTS, **{name: value})
+        if solver.check(params) is not None:
+            continue
+        freqs, _ = solver.solve(params)
+        assert len(freqs) == solver.n and min(freqs) > 0 and np.all(np.diff(freqs) > 0)
+
+
+def test_check(solver):
+    assert solver.check(DEFAULTS) is None
+    assert solver.check(dict(DEFAULTS, d=0.2, D=0.1))
+    assert solver.check(dict(DEFAULTS, L=0.0))
+
+
+def test_cancelled(solver):
+    assert solver.solve(DEFAULTS, cancelled=lambda: True) is None
+    calls = []
+    # 求根之后才取消：同样丢弃结果
+    assert solver.solve(DEFAULTS, cancelled=lambda: calls.append(1) or len(calls) > 1) is None
+
+
+def test_solve_without_qt(solver):
+    solver.solve(DEFAULTS)
+    assert "PySide6" not in sys.modules
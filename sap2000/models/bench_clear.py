@@ -0,0 +1,95 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from clear import clean, format_bytes, scan
+"""
+clear.py 的基准：在临时目录里生成合成的结果目录树（默认 100 万个文件，每个子目录 1000 个），
+比较旧写法（listdir + isfile + abspath + getsize）和 scandir 的扫描耗时，
+再把树分成两半，分别用单线程和线程池删除。keep 规则保留约 1/4 的文件。
+
+    python bench_clear.py --files 1000000
+    python bench_clear.py --files 20000 --dir D:\\tmp
+"""
+
+EXTENSIONS = [".sdb", ".$2k", ".log", ".OUT", ".msh", ".K~0", ".Y~1", ".ico"]
+KEEP = ["*.sdb", "*.$2k"]
+
+
+def make_tree(root, n_files, per_dir=1000):
+    """两个子树 a、b 各一半文件，每个子目录 per_dir 个；返回总字节数"""
+    total = 0
+    payload = [b"x" * (i % 7 * 100) for i in range(len(EXTENSIONS))]
+    for i in range(n_files):
+        if i % per_dir == 0:
+            folder = os.path.join(root, "ab"[i * 2 // n_files], f"run{i // per_dir:05d}")
+            os.makedirs(folder)
+        k = i % len(EXTENSIONS)
+        with open(os.path.join(folder, f"model{i:07d}{EXTENSIONS[k]}"), "wb") as f:
+            f.write(payload[k])
+        total += len(payload[k])
+    return total
+
+
+def legacy_scan(root, allowed_extensions):
+    """旧 safe_clean_files 的做法（逐个 isfile / abspath / getsize），用 os.walk 补上递归"""
+    found = total = 0
+    for folder, _, _ in os.walk(root):
+        folder = os.path.abspath(folder)
+        for filename in os.listdir(folder):
+            file_path = os.path.join(folder, filename)
+            if not os.path.isfile(file_path):
+                continue
+            if not os.path.abspath(file_path).startswith(folder):
+                continue
+            if os.path.splitext(filename)[1].lower() not in allowed_extensions:
+                found += 1
+                total += os.path.getsize(file_path)
+    return found, total
+
+
+def timed(func, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+# ------------------ 主程序 ------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="clear.py 基准")
+    parser.add_argument("--files", type=int, default=1_000_000)
+    parser.add_argument("--per-dir", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--dir", help="生成目录树的位置，默认系统临时目录")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="bench_clear_", dir=args.dir)
+    try:
+        print(f"生成 {args.files} 个文件：{root}")
+        _, t_make = timed(make_tree, root, args.files, args.per_dir)
+        print(f"  生成用时 {t_make:.1f} s")
+
+        (n_old, b_old), t_old = timed(legacy_scan, root, [e.lower() for e in (".sdb", ".$2k")])
+        n_new = b_new = 0
+        t0 = time.perf_counter()
+        for _, size in scan(root, keep=KEEP):
+            n_new += 1
+            b_new += size
+        t_new = time.perf_counter() - t0
+        assert (n_old, b_old) == (n_new, b_new), ((n_old, b_old), (n_new, b_new))
+        print(f"  扫描 {n_new} 个待删文件（{format_bytes(b_new)}）：listdir {t_old:.2f} s，scandir {t_new:.2f} s，"
+              f"加速 {t_old / t_new:.1f}x")
+
+        serial = clean(os.path.join(root, "a"), keep=KEEP, workers=1)
+        pooled = clean(os.path.join(root, "b"), keep=KEEP, workers=args.workers)
+        for name, s in (("单线程", serial), (f"{args.workers} 线程", pooled)):
+            print(f"  删除（{name}）：{s['files']} 个文件，失败 {s['failed']}，用时 {s['elapsed']:.2f} s，"
+                  f"{s['files'] / s['elapsed']:.0f} 个/s")
+        assert serial["files"] + pooled["files"] == n_new
+        left = sum(len(files) for _, _, files in os.walk(root))
+        assert left == args.files - n_new, left
+        print(f"  保留 {left} 个文件")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
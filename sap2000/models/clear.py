@@ -1,32 +1,172 @@
+import argparse
+import fnmatch
 import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 """
 删除绝对路径下，后缀不符合的文件。相对目录是程序当前命令行所在的目录。所以要用绝对目录，避免出现问题。
 
+基于 os.scandir 遍历（DirEntry 自带文件类型，Windows 上连 stat 都是缓存的），可递归，
+按 glob 规则保留文件，可按修改时间、大小筛选，删除用线程池并发执行，--dry-run 只统计不删除。
+不跟随符号链接 / 目录联接，只删除普通文件，不删除目录。
 
+    python clear.py D:\\runs -r --keep "*.sdb" "*.py" "*.txt" --dry-run
+    python clear.py D:\\runs -r --keep "*.sdb" --older-than 7 --min-size 1M
 """
+
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+def parse_size(text):
+    """'512'、'10K'、'1.5M'、'2G' -> 字节数"""
+    m = re.fullmatch(r"\s*([\d.]+)\s*([KMG]?)B?\s*", str(text), re.IGNORECASE)
+    if not m:
+        raise argparse.ArgumentTypeError(f"无法识别的大小：{text}")
+    return int(float(m.group(1)) * SIZE_UNITS[m.group(2).upper()])
+
+
+def compile_patterns(patterns):
+    """把多条 glob 规则合成一个忽略大小写的正则；没有规则时返回 None"""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns), re.IGNORECASE)
+
+
+def scan(root, keep=(), keep_dirs=(), recursive=True, older_than=None, min_size=None, max_size=None):
+    """
+    生成要删除的文件 (路径, 字节数)。
+    Args:
+        root (str): 目标目录
+        keep (list): 保留文件的 glob 规则，匹配文件名或相对 root 的路径（如 "*.sdb"、"results/*.odb"）
+        keep_dirs (list): 整个跳过的子目录 glob 规则（匹配目录名）
+        recursive (bool): 是否进入子目录
+        older_than (float): 只删除修改时间早于该秒数之前的文件
+        min_size, max_size (int): 只删除大小在此范围内的文件（字节）
+    """
+    root = os.path.abspath(root)
+    keep_re = compile_patterns(keep)
+    skip_re = compile_patterns(keep_dirs)
+    cutoff = time.time() - older_than if older_than is not None else None
+    prefix = len(root) + 1
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        try:
+            it = os.scandir(folder)
+        except OSError as e:
+            print(f"无法读取目录 {folder}，原因：{e}", file=sys.stderr)
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and not (skip_re and skip_re.match(entry.name)):
+                        stack.append(entry.path)
+                    continue
+                # 跳过符号链接、设备文件等
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                if keep_re and (keep_re.match(entry.name) or keep_re.match(entry.path[prefix:].replace(os.sep, "/"))):
+                    continue
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if cutoff is not None and st.st_mtime > cutoff:
+                    continue
+                if min_size is not None and st.st_size < min_size:
+                    continue
+                if max_size is not None and st.st_size > max_size:
+                    continue
+                yield entry.path, st.st_size
+
+
+def _remove_batch(items):
+    """删除一组 (路径, 字节数)，返回失败的 (路径, 字节数, 异常)"""
+    failed = []
+    for path, size in items:
+        try:
+            os.remove(path)
+        except OSError as e:
+            failed.append((path, size, e))
+    return failed
+
+
+def clean(root, dry_run=False, workers=8, batch=256, verbose=False, **filters):
+    """
+    扫描并删除文件，返回统计字典 {files, bytes, failed, elapsed}；dry_run 时只统计。
+    files / bytes 只计实际删掉的文件，删除失败的计入 failed。
+    filters 见 scan；删除按 batch 个一组提交到线程池（unlink 基本是 I/O 等待，线程可以并发）。
+    """
+    t0 = time.perf_counter()
+    files = total = 0
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures, pending = [], []
+        for path, size in scan(root, **filters):
+            files += 1
+            total += size
+            if verbose:
+                print(f"{'将删除' if dry_run else '删除'}：{path}")
+            if dry_run:
+                continue
+            pending.append((path, size))
+            if len(pending) >= batch:
+                futures.append(pool.submit(_remove_batch, pending))
+                pending = []
+        if pending:
+            futures.append(pool.submit(_remove_batch, pending))
+        for future in futures:
+            failed.extend(future.result())
+    for path, size, e in failed:
+        total -= size
+        print(f"删除失败 {path}，原因：{e}", file=sys.stderr)
+    return {"files": files - len(failed), "bytes": total, "failed": len(failed), "elapsed": time.perf_counter() - t0}
+
+
 def safe_clean_files(target_dir, allowed_extensions):
-    """严格限定仅删除 target_dir 目录内的文件（不含子目录）"""
+    """严格限定仅删除 target_dir 目录内的文件（不含子目录），保留后缀在 allowed_extensions 中的文件"""
     target_dir = os.path.abspath(target_dir)
     print(f"安全模式清理目录：{target_dir}")
+    keep = [f"*{ext}" for ext in allowed_extensions]
+    stats = clean(target_dir, keep=keep, recursive=False, verbose=True)
+    return stats
 
-    for filename in os.listdir(target_dir):
-        filepath = os.path.join(target_dir, filename)
-        
-        # 双重保险：确认文件在目标目录内且是普通文件
-        if not os.path.isfile(filepath):
-            continue  # 跳过目录/链接等
-        if not os.path.abspath(filepath).startswith(target_dir):
-            print(f"安全拦截：外部文件 {filepath}")
-            continue
 
-        ext = os.path.splitext(filename)[1].lower()
-        if ext not in allowed_extensions:
-            try:
-                os.remove(filepath)
-                print(f'已删除：{filepath}')
-            except Exception as e:
-                print(f"删除失败 {filename}，原因：{e}")
-
-# 使用示例
-target_folder = "C:\\Users\\Administrator\\Desktop\\workspace\\sap2000\\models"  # 必须修改为你的目标目录绝对路径！
-safe_clean_files(target_folder, ['.sdb', '.py', '.txt'])
\ No newline at end of file
+def format_bytes(n):
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if n < 1024 or unit == "GiB":
+            return f"{n:.1f} {unit}" if unit != "B" else f"{n} B"
+        n /= 1024
+
+
+# ------------------ 主程序 ------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="清理结果目录中的临时文件")
+    parser.add_argument("target", nargs="?", default=os.path.dirname(os.path.abspath(__file__)),
+                        help="目标目录（默认为本脚本所在目录）")
+    # nargs="+"：单写 --keep 不给规则时报错，而不是得到空列表把所有文件都删掉
+    parser.add_argument("--keep", nargs="+", default=["*.sdb", "*.py", "*.txt"], help="保留文件的 glob 规则")
+    parser.add_argument("--keep-dir", nargs="*", default=[], help="跳过的子目录 glob 规则")
+    parser.add_argument("-r", "--recursive", action="store_true", help="递归进入子目录")
+    parser.add_argument("--dry-run", action="store_true", help="只统计，不删除")
+    parser.add_argument("--older-than", type=float, metavar="DAYS", help="只删除修改时间早于 DAYS 天前的文件")
+    parser.add_argument("--min-size", type=parse_size, help="只删除不小于该大小的文件，如 10K、1M")
+    parser.add_argument("--max-size", type=parse_size, help="只删除不大于该大小的文件")
+    parser.add_argument("--workers", type=int, default=8, help="删除线程数")
+    parser.add_argument("-v", "--verbose", action="store_true", help="逐个列出文件")
+    args = parser.parse_args()
+
+    target = os.path.abspath(args.target)
+    if not os.path.isdir(target):
+        parser.error(f"目录不存在：{target}")
+    stats = clean(
+        target, dry_run=args.dry_run, workers=args.workers, verbose=args.verbose,
+        keep=args.keep, keep_dirs=args.keep_dir, recursive=args.recursive,
+        older_than=args.older_than * 86400 if args.older_than is not None else None,
+        min_size=args.min_size, max_size=args.max_size,
+    )
+    action = "可删除" if args.dry_run else "已删除"
+    print(f"{target}：{action} {stats['files']} 个文件，共 {format_bytes(stats['bytes'])}，"
+          f"失败 {stats['failed']} 个，用时 {stats['elapsed']:.2f} s")
@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import clear
+from clear import clean, parse_size
+
+"""
+clear：保留规则、统计只计实际删掉的文件、--keep 不能为空
+"""
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for name, size in [("a.sdb", 10), ("a.log", 100), ("b.out", 1000), ("sub/c.log", 7), ("sub/d.txt", 3)]:
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(b"x" * size)
+    return tmp_path
+
+
+def test_parse_size():
+    assert parse_size("512") == 512
+    assert parse_size("1.5K") == 1536
+    assert parse_size("2mb") == 2 * 1024**2
+
+
+def test_keep_and_recursive(tree):
+    stats = clean(str(tree), keep=["*.sdb", "*.txt"], recursive=True)
+    assert (stats["files"], stats["bytes"], stats["failed"]) == (3, 1107, 0)
+    assert sorted(os.listdir(tree)) == ["a.sdb", "sub"]
+    assert os.listdir(tree / "sub") == ["d.txt"]
+
+
+def test_dry_run_keeps_files(tree):
+    stats = clean(str(tree), keep=["*.sdb"], recursive=False, dry_run=True)
+    assert (stats["files"], stats["bytes"]) == (2, 1100)
+    assert (tree / "a.log").exists() and (tree / "b.out").exists()
+
+
+def test_failed_deletions_not_counted(tree, monkeypatch):
+    remove = os.remove
+
+    def flaky(path):
+        if path.endswith("b.out"):
+            raise PermissionError("locked")
+        remove(path)
+
+    monkeypatch.setattr(clear.os, "remove", flaky)
+    stats = clean(str(tree), keep=["*.sdb"], recursive=False, batch=1)
+    assert (stats["files"], stats["bytes"], stats["failed"]) == (1, 100, 1)
+    assert (tree / "b.out").exists()
+
+
+def test_empty_keep_rejected(tree):
+    # 单写 --keep 不给规则：命令行报错退出，不删除任何文件
+    cmd = [sys.executable, clear.__file__, str(tree), "--keep"]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    assert proc.returncode == 2 and "--keep" in proc.stderr
+    assert len(os.listdir(tree)) == 4